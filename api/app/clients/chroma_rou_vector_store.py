@@ -0,0 +1,202 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+import chromadb
+from chromadb.api import AsyncClientAPI
+from chromadb.api.models.AsyncCollection import AsyncCollection
+from chromadb.api.models.Collection import Collection
+from chromadb.api.types import Where
+
+from app.clients.chromadb_client import (
+    compact_rou_collection,
+    delete_rou_collection,
+    get_rou_collection,
+    get_rou_collection_name,
+)
+from app.clients.embedding_provider import EmbeddingProvider
+from app.clients.rou_vector_store import (
+    RouIndexingError,
+    RouMetadata,
+    RouVectorStore,
+    RouVectorStoreError,
+    VectorHit,
+    normalize_jurisdiction,
+)
+from app.config.models.chroma_config import ChromaConfig
+from app.config.models.rou_index_config import RouIndexConfig
+
+T = TypeVar("T")
+
+
+def rou_where(
+    jurisdictions: Optional[List[str]] = None, regulation_ids: Optional[List[int]] = None
+) -> Optional[Where]:
+    """
+    Chroma `where` clause restricting a search to some jurisdictions and regulations.
+
+    Returns:
+        Optional[Where]: None when there is nothing to filter on.
+    """
+    conditions: List[Dict[str, Any]] = []
+    if jurisdictions:
+        conditions.append(
+            {"jurisdiction": {"$in": sorted({normalize_jurisdiction(j) for j in jurisdictions})}}
+        )
+    if regulation_ids:
+        conditions.append({"source_id": {"$in": sorted(set(regulation_ids))}})
+
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$and": conditions}  # type: ignore[return-value]
+
+
+class ChromaRouVectorStore(RouVectorStore):
+    """
+    ROU vectors in the ChromaDB collection of the store's embedding model.
+
+    With a chroma server, collection calls go through chroma's async client;
+    the embedded index has no async API, so its calls run on a small dedicated
+    thread pool. Either way the event loop is free to serve other work while a
+    search or write is in flight.
+    """
+
+    def __init__(
+        self,
+        config: ChromaConfig,
+        index_config: RouIndexConfig,
+        embedding_provider: EmbeddingProvider,
+    ):
+        super().__init__(index_config, embedding_provider)
+        self.config = config
+        self._executor = (
+            ThreadPoolExecutor(max_workers=config.query_threads, thread_name_prefix="chroma-query")
+            if config.mode == "persistent"
+            else None
+        )
+        self._async_client: AsyncClientAPI | None = None
+        self._async_collection: AsyncCollection | None = None
+        self._lock = asyncio.Lock()
+
+    async def _get_async_collection(self) -> AsyncCollection:
+        # the async client binds to the running event loop, so it is created lazily
+        async with self._lock:
+            if self._async_collection is None:
+                self._async_client = await chromadb.AsyncHttpClient(
+                    host=self.config.host, port=self.config.port
+                )
+                # vectors are always passed in precomputed
+                self._async_collection = await self._async_client.get_or_create_collection(
+                    get_rou_collection_name(self.embedding_provider.model), embedding_function=None
+                )
+            return self._async_collection
+
+    async def _call(self, method: Callable[[Collection | AsyncCollection], T]) -> T:
+        """Run a collection method without blocking the event loop."""
+        if self._executor is None:
+            return await method(await self._get_async_collection())  # type: ignore[misc]
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: method(get_rou_collection(self.embedding_provider.model))
+        )
+
+    async def search(
+        self,
+        embedding: List[float],
+        n_results: int,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[VectorHit]:
+        where = rou_where(jurisdictions=jurisdictions, regulation_ids=regulation_ids)
+        results: Any = await self._call(
+            lambda collection: collection.query(
+                query_embeddings=[embedding],
+                n_results=n_results,
+                where=where,
+                include=["distances"],
+            )
+        )
+        return [
+            VectorHit(int(rou_id), distance)
+            for rou_id, distance in zip(results["ids"][0], results["distances"][0])
+        ]
+
+    async def upsert(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[RouMetadata]] = None,
+    ) -> None:
+        size = self.index_config.upsert_batch_size
+        failed: List[str] = []
+        error: BaseException | None = None
+        for start in range(0, len(ids), size):
+            batch = slice(start, start + size)
+            try:
+                await self._with_retries(
+                    lambda batch=batch: self._call(
+                        lambda collection: collection.upsert(
+                            ids=ids[batch],
+                            documents=documents[batch],
+                            embeddings=embeddings[batch],  # type: ignore[arg-type]
+                            metadatas=metadatas[batch] if metadatas else None,  # type: ignore[arg-type]
+                        )
+                    ),
+                    f"Upserting {len(ids[batch])} vectors",
+                )
+            except RouVectorStoreError as e:
+                failed.extend(ids[batch])
+                error = e
+
+        if error is not None:
+            raise RouIndexingError(failed, error)
+
+    async def update_metadata(self, ids: List[str], metadatas: List[RouMetadata]) -> None:
+        size = self.index_config.upsert_batch_size
+        for start in range(0, len(ids), size):
+            batch = slice(start, start + size)
+            await self._with_retries(
+                lambda batch=batch: self._call(
+                    lambda collection: collection.update(
+                        ids=ids[batch], metadatas=metadatas[batch]  # type: ignore[arg-type]
+                    )
+                ),
+                f"Updating metadata of {len(ids[batch])} vectors",
+            )
+
+    async def delete(self, ids: List[str]) -> None:
+        size = self.index_config.upsert_batch_size
+        for start in range(0, len(ids), size):
+            batch = ids[start : start + size]
+            await self._with_retries(
+                lambda batch=batch: self._call(lambda collection: collection.delete(ids=batch)),
+                f"Deleting {len(batch)} vectors",
+            )
+
+    async def list_ids(self) -> List[str]:
+        size = self.index_config.upsert_batch_size
+        ids: List[str] = []
+        while True:
+            offset = len(ids)
+            page: Any = await self._call(
+                lambda collection, offset=offset: collection.get(
+                    include=[], limit=size, offset=offset
+                )
+            )
+            ids.extend(page["ids"])
+            if len(page["ids"]) < size:
+                return ids
+
+    async def compact(self) -> None:
+        # see `compact_rou_collection`: the API and workers must be stopped
+        await asyncio.to_thread(
+            compact_rou_collection, self.embedding_provider.model, self.index_config.upsert_batch_size
+        )
+
+    async def drop(self) -> None:
+        await asyncio.to_thread(delete_rou_collection, self.embedding_provider.model)
+
+    def close(self) -> None:
+        super().close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,24 +1,162 @@
+from functools import lru_cache
+import re
 from typing import Annotated
 import chromadb
 from chromadb.api import ClientAPI
+from chromadb.api.models.Collection import Collection
 from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
 from fastapi import Depends
+import openai
 
-from app.config.app_config import OpenAIConfigDep
+from app.clients.openai_client import get_openai_http_client
+from app.config.app_config import get_app_config
 
 ROU_COLLECTION_NAME = "regulatory_obligation_unit"
+# model of the original ROU collection, which keeps ROU_COLLECTION_NAME
+ROU_EMBEDDING_MODEL = "text-embedding-3-small"
 
 
-def get_chromadb_client(openai_config: OpenAIConfigDep):
-    client = chromadb.PersistentClient()
+@lru_cache
+def get_rou_embedding_function(
+    api_key: str, base_url: str | None = None
+) -> OpenAIEmbeddingFunction:
+    """
+    Embedding function of the ROU collection.
 
-    embedding_function = OpenAIEmbeddingFunction(
-        api_key=openai_config.api_key.get_secret_value(), model_name="text-embedding-3-small"
+    Pass it to `get_collection` as well; otherwise chroma rebuilds the function
+    from the persisted collection config, bypassing the shared rate limiter.
+    """
+    embedding_function = OpenAIEmbeddingFunction(api_key=api_key, model_name=ROU_EMBEDDING_MODEL)
+    # chroma creates its own OpenAI client; route it through the rate-limited transport
+    embedding_function.client = openai.OpenAI(
+        api_key=api_key, base_url=base_url, http_client=get_openai_http_client()
     )
+    return embedding_function
 
-    client.get_or_create_collection(ROU_COLLECTION_NAME, embedding_function=embedding_function)
 
-    return client
+@lru_cache
+def get_chromadb_client() -> ClientAPI:
+    """ChromaDB client shared by all requests of the process."""
+    config = get_app_config().chroma
+    if config.mode == "http":
+        return chromadb.HttpClient(host=config.host, port=config.port)
+    return chromadb.PersistentClient(path=config.persist_path)
 
 
 ChromaDbClientDep = Annotated[ClientAPI, Depends(get_chromadb_client)]
+
+
+def get_rou_collection_name(model: str | None = None) -> str:
+    """
+    Name of the collection holding the ROU vectors of an embedding model.
+
+    Each model gets its own collection, as their vectors are not comparable.
+
+    Args:
+        model (str | None): Embedding model; the configured one if None.
+    """
+    model = model or get_app_config().embedding.model
+    if model == ROU_EMBEDDING_MODEL:
+        return ROU_COLLECTION_NAME
+    return f"{ROU_COLLECTION_NAME}__{re.sub(r'[^a-zA-Z0-9._-]', '-', model)}"
+
+
+def _get_collection_embedding_function(name: str) -> OpenAIEmbeddingFunction | None:
+    # the original collection was created with chroma's OpenAI embedding function
+    # and must be opened with it; vectors are always passed in precomputed
+    if name != ROU_COLLECTION_NAME:
+        return None
+    openai_config = get_app_config().openai
+    return get_rou_embedding_function(
+        openai_config.api_key.get_secret_value(), openai_config.base_url
+    )
+
+
+@lru_cache
+def get_rou_collection(model: str | None = None) -> Collection:
+    """
+    ROU collection of an embedding model, shared by all requests of the process.
+
+    Args:
+        model (str | None): Embedding model; the configured one if None.
+    """
+    name = get_rou_collection_name(model)
+    return get_chromadb_client().get_or_create_collection(
+        name, embedding_function=_get_collection_embedding_function(name)
+    )
+
+
+def delete_rou_collection(model: str) -> None:
+    """Delete the ROU collection of an embedding model, if it exists."""
+    client = get_chromadb_client()
+    name = get_rou_collection_name(model)
+    if name in {collection.name for collection in client.list_collections()}:
+        client.delete_collection(name)
+    get_rou_collection.cache_clear()
+
+
+def warm_up_rou_collection(model: str | None = None) -> None:
+    """
+    Load the ROU index into memory, so the first query does not pay for it.
+
+    Queries with a stored vector, which avoids an embedding request.
+    """
+    collection = get_rou_collection(model)
+    sample = collection.peek(limit=1)
+    if len(sample["ids"]) == 0:
+        return
+    collection.query(query_embeddings=sample["embeddings"], n_results=1, include=[])
+    print(f"Warmed up ROU collection ({collection.count()} ROUs)")
+
+
+def compact_rou_collection(model: str | None = None, page_size: int = 1000) -> int:
+    """
+    Rebuild the ROU collection from its live entries.
+
+    Deleted vectors stay in the HNSW index until it is rebuilt, so a collection
+    that saw many deletes keeps loading and searching dead entries. The entries
+    are copied with their vectors into a fresh collection, which then replaces
+    the old one; nothing is re-embedded.
+
+    Collection handles are bound to the old collection, so run it with the API
+    and workers stopped, like `chroma vacuum`.
+
+    Args:
+        model (str | None): Embedding model of the collection; the configured one if None.
+        page_size (int): Entries copied per call.
+
+    Returns:
+        int: Number of entries copied.
+    """
+    client = get_chromadb_client()
+    name = get_rou_collection_name(model)
+    embedding_function = _get_collection_embedding_function(name)
+    old = client.get_collection(name, embedding_function=embedding_function)
+
+    # a leftover from an interrupted run is incomplete
+    compacted_name = f"{name}_compacted"
+    if compacted_name in {collection.name for collection in client.list_collections()}:
+        client.delete_collection(compacted_name)
+    compacted = client.create_collection(
+        compacted_name, embedding_function=embedding_function, metadata=old.metadata
+    )
+
+    copied = 0
+    while True:
+        page = old.get(
+            include=["embeddings", "documents", "metadatas"], limit=page_size, offset=copied
+        )
+        if not page["ids"]:
+            break
+        compacted.add(
+            ids=page["ids"],
+            embeddings=page["embeddings"],
+            documents=page["documents"],
+            metadatas=page["metadatas"],
+        )
+        copied += len(page["ids"])
+
+    client.delete_collection(name)
+    compacted.modify(name=name)
+    get_rou_collection.cache_clear()
+    return copied
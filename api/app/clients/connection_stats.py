@@ -0,0 +1,86 @@
+import threading
+from typing import Any
+
+import httpx
+
+from app.dtos.connection_pool_stats_dto import ConnectionPoolStatsDTO
+
+
+class ConnectionStats:
+    """Counts how many requests opened a new connection instead of reusing a pooled one."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._http2_requests = 0
+
+    def record(self, response: httpx.Response, new_connection: bool) -> None:
+        with self._lock:
+            self._requests += 1
+            self._new_connections += new_connection
+            self._http2_requests += response.extensions.get("http_version") == b"HTTP/2"
+
+    def stats(self) -> ConnectionPoolStatsDTO:
+        with self._lock:
+            return ConnectionPoolStatsDTO(
+                requests=self._requests,
+                new_connections=self._new_connections,
+                http2_requests=self._http2_requests,
+            )
+
+
+# httpcore reports this trace event when a request opens a TCP connection
+_CONNECT_EVENT = "connection.connect_tcp.complete"
+
+
+class ConnectionStatsAsyncTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records connection reuse via the httpcore `trace` extension."""
+
+    def __init__(self, stats: ConnectionStats, transport: httpx.AsyncBaseTransport):
+        self.stats = stats
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        new_connection = False
+        inner_trace = request.extensions.get("trace")
+
+        async def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal new_connection
+            new_connection = new_connection or event == _CONNECT_EVENT
+            if inner_trace is not None:
+                await inner_trace(event, info)
+
+        request.extensions["trace"] = trace
+        response = await self.transport.handle_async_request(request)
+        self.stats.record(response, new_connection)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ConnectionStatsTransport(httpx.BaseTransport):
+    """Sync counterpart of `ConnectionStatsAsyncTransport`."""
+
+    def __init__(self, stats: ConnectionStats, transport: httpx.BaseTransport):
+        self.stats = stats
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        new_connection = False
+        inner_trace = request.extensions.get("trace")
+
+        def trace(event: str, info: dict[str, Any]) -> None:
+            nonlocal new_connection
+            new_connection = new_connection or event == _CONNECT_EVENT
+            if inner_trace is not None:
+                inner_trace(event, info)
+
+        request.extensions["trace"] = trace
+        response = self.transport.handle_request(request)
+        self.stats.record(response, new_connection)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+from openai import NOT_GIVEN, AsyncOpenAI
+
+from app.clients.openai_client import get_async_openai_client_cached
+from app.config.app_config import get_app_config
+from app.config.models.embedding_config import LOCAL_EMBEDDING_MODEL, EmbeddingConfig
+from app.services.usage.llm_usage_recorder import record_embedding_usage
+
+
+class EmbeddingProvider(ABC):
+    """Embeds ROUs and search queries with one model."""
+
+    # name of the vectors, see `EmbeddingConfig.model`; vectors of different models are not comparable
+    model: str
+
+    @abstractmethod
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        """Embed texts in one batch, in order, also returning the tokens billed."""
+
+    async def embed(self, texts: List[str], stage: str = "embedding") -> List[List[float]]:
+        """Embed texts in one batch, in order, recording the call's usage under `stage`."""
+        started = time.perf_counter()
+        try:
+            embeddings, prompt_tokens = await self._embed(texts)
+        except Exception as e:
+            record_embedding_usage(
+                stage,
+                self.model,
+                (time.perf_counter() - started) * 1000,
+                error=f"{type(e).__name__}: {e}",
+            )
+            raise
+        record_embedding_usage(
+            stage, self.model, (time.perf_counter() - started) * 1000, prompt_tokens=prompt_tokens
+        )
+        return embeddings
+
+    def close(self) -> None:
+        pass
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """The OpenAI embeddings API, called through the shared rate-limited client."""
+
+    def __init__(
+        self,
+        model: str,
+        openai_model: str,
+        openai_client: AsyncOpenAI,
+        dimensions: Optional[int] = None,
+    ):
+        self.model = model
+        self.openai_model = openai_model
+        self.openai_client = openai_client
+        self.dimensions = dimensions
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        response = await self.openai_client.embeddings.create(
+            model=self.openai_model, input=texts, dimensions=self.dimensions or NOT_GIVEN
+        )
+        embeddings = [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+        return embeddings, response.usage.prompt_tokens if response.usage else 0
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    all-MiniLM-L6-v2 through chroma's ONNX runtime wrapper, on CPU in-process.
+
+    The model files are downloaded once on first use. Texts are split into
+    `batch_size` inference calls that run on a dedicated thread pool, off the
+    event loop; ONNX Runtime releases the GIL while it computes.
+    """
+
+    model = LOCAL_EMBEDDING_MODEL
+
+    def __init__(self, batch_size: int, threads: int):
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="local-embed")
+        self._function: ONNXMiniLM_L6_V2 | None = None
+        self._load_lock = threading.Lock()
+
+    def _load(self) -> ONNXMiniLM_L6_V2:
+        # one thread downloads and loads the model; the others wait for it
+        with self._load_lock:
+            if self._function is None:
+                function = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+                function(["warm up"])
+                self._function = function
+            return self._function
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [embedding.tolist() for embedding in self._load()(texts)]
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._executor, self._embed_batch, texts[start : start + self.batch_size]
+                )
+                for start in range(0, len(texts), self.batch_size)
+            )
+        )
+        # nothing is billed for a local model
+        return [embedding for batch in batches for embedding in batch], 0
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def create_embedding_provider(config: EmbeddingConfig) -> EmbeddingProvider:
+    if config.provider == "local":
+        return LocalEmbeddingProvider(batch_size=config.local_batch_size, threads=config.local_threads)
+
+    openai_config = get_app_config().openai
+    return OpenAIEmbeddingProvider(
+        model=config.model,
+        openai_model=config.openai_model,
+        dimensions=config.openai_dimensions,
+        openai_client=get_async_openai_client_cached(
+            api_key=openai_config.api_key.get_secret_value(), base_url=openai_config.base_url
+        ),
+    )
+
+
+@lru_cache
+def get_embedding_provider() -> EmbeddingProvider:
+    """Embedding provider shared by all requests of the process, per `embedding.provider`."""
+    return create_embedding_provider(get_app_config().embedding)
@@ -1,19 +1,93 @@
 from contextlib import contextmanager
 from functools import lru_cache
+from importlib.util import find_spec
 from typing import Annotated
 from fastapi import Depends
+import httpx
 from openai import AsyncOpenAI
 
+from app.clients.connection_stats import (
+    ConnectionStats,
+    ConnectionStatsAsyncTransport,
+    ConnectionStatsTransport,
+)
+from app.clients.openai_rate_limiter import (
+    OpenAIRateLimiter,
+    RateLimitedAsyncTransport,
+    RateLimitedTransport,
+)
 from app.config.app_config import OpenAIConfigDep, get_app_config
 
 
 @lru_cache
-def get_async_openai_client_cached(api_key: str) -> AsyncOpenAI:
-    return AsyncOpenAI(api_key=api_key)
+def get_openai_rate_limiter() -> OpenAIRateLimiter:
+    """Rate limiter shared by every OpenAI client of the process."""
+    openai_config = get_app_config().openai
+    return OpenAIRateLimiter(
+        requests_per_minute=openai_config.requests_per_minute,
+        tokens_per_minute=openai_config.tokens_per_minute,
+        max_backoff_seconds=openai_config.max_backoff_seconds,
+    )
+
+
+@lru_cache
+def get_openai_connection_stats() -> ConnectionStats:
+    return ConnectionStats()
+
+
+def _get_pool_options() -> dict:
+    openai_config = get_app_config().openai
+    return {
+        "limits": httpx.Limits(
+            max_connections=openai_config.max_connections,
+            max_keepalive_connections=openai_config.max_keepalive_connections,
+            keepalive_expiry=openai_config.keepalive_expiry_seconds,
+        ),
+        "http2": openai_config.http2 and find_spec("h2") is not None,
+    }
+
+
+@lru_cache
+def get_openai_http_async_client() -> httpx.AsyncClient:
+    """
+    Async HTTP client for all OpenAI calls (ChatOpenAI, OpenAIEmbeddings, AsyncOpenAI).
+
+    One keep-alive connection pool is shared by every model and agent, so bulk
+    runs reuse connections instead of paying a TLS handshake per client.
+    Requests are admitted through the shared rate limiter.
+    """
+    transport = RateLimitedAsyncTransport(
+        get_openai_rate_limiter(),
+        ConnectionStatsAsyncTransport(
+            get_openai_connection_stats(), httpx.AsyncHTTPTransport(**_get_pool_options())
+        ),
+    )
+    return httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(600, connect=5))
+
+
+@lru_cache
+def get_openai_http_client() -> httpx.Client:
+    """Sync counterpart of `get_openai_http_async_client`, e.g. for chroma embeddings."""
+    transport = RateLimitedTransport(
+        get_openai_rate_limiter(),
+        ConnectionStatsTransport(
+            get_openai_connection_stats(), httpx.HTTPTransport(**_get_pool_options())
+        ),
+    )
+    return httpx.Client(transport=transport, timeout=httpx.Timeout(600, connect=5))
+
+
+@lru_cache
+def get_async_openai_client_cached(api_key: str, base_url: str | None = None) -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=api_key, base_url=base_url, http_client=get_openai_http_async_client()
+    )
 
 
 def get_async_openai_client(config: OpenAIConfigDep):
-    return get_async_openai_client_cached(api_key=config.api_key.get_secret_value())
+    return get_async_openai_client_cached(
+        api_key=config.api_key.get_secret_value(), base_url=config.base_url
+    )
 
 
 AsyncOpenAIClientDep = Annotated[AsyncOpenAI, Depends(get_async_openai_client)]
@@ -22,4 +96,6 @@ AsyncOpenAIClientDep = Annotated[AsyncOpenAI, Depends(get_async_openai_client)]
 @contextmanager
 def async_openai_client_context():
     openai_config = get_app_config().openai
-    yield get_async_openai_client_cached(api_key=openai_config.api_key.get_secret_value())
+    yield get_async_openai_client_cached(
+        api_key=openai_config.api_key.get_secret_value(), base_url=openai_config.base_url
+    )
@@ -0,0 +1,236 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+
+from app.dtos.rate_limiter_stats_dto import RateLimiterStatsDTO
+
+
+class OpenAIRateLimiter:
+    """
+    Process-wide token-bucket limiter for OpenAI requests.
+
+    Two buckets are kept: one for requests per minute and one for tokens per
+    minute. A request reserves capacity up front and waits until both buckets
+    have paid off the reservation, so concurrent callers are admitted at the
+    configured rate instead of in bursts.
+
+    The buckets adapt to what the API reports: `x-ratelimit-remaining-*`
+    headers lower the local estimate (other processes may share the same key),
+    and a 429 pauses all requests for `retry-after-ms`/`retry-after` or an
+    exponential backoff capped at `max_backoff_seconds`. The pause also holds
+    back requests already waiting on their reservation. The backoff is halved by
+    every other response rather than reset, so a key hovering at its limit backs
+    off longer.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        max_backoff_seconds: float = 60,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_backoff_seconds = max_backoff_seconds
+
+        # shared by the event loop and threads doing sync calls (e.g. chroma embeddings)
+        self._lock = threading.Lock()
+        self._available_requests = float(requests_per_minute)
+        self._available_tokens = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff_seconds = 1.0
+
+        self._queue_depth = 0
+        self._requests = 0
+        self._rate_limited = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        self._available_requests = min(
+            self.requests_per_minute,
+            self._available_requests + elapsed * self.requests_per_minute / 60,
+        )
+        self._available_tokens = min(
+            self.tokens_per_minute,
+            self._available_tokens + elapsed * self.tokens_per_minute / 60,
+        )
+
+    def _reserve(self, tokens: int) -> float:
+        """Take capacity for one request and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            # a request larger than the bucket would otherwise never be admitted
+            self._available_requests -= 1
+            self._available_tokens -= min(tokens, self.tokens_per_minute)
+
+            wait = max(
+                -self._available_requests * 60 / self.requests_per_minute,
+                -self._available_tokens * 60 / self.tokens_per_minute,
+                self._paused_until - now,
+                0.0,
+            )
+            self._requests += 1
+            self._total_wait_seconds += wait
+            self._max_wait_seconds = max(self._max_wait_seconds, wait)
+            if wait > 0:
+                self._queue_depth += 1
+            return wait
+
+    def _pause_remaining(self) -> float:
+        """Time left of a 429 pause that started while the caller was waiting."""
+        with self._lock:
+            wait = max(self._paused_until - time.monotonic(), 0.0)
+            self._total_wait_seconds += wait
+            return wait
+
+    def _leave_queue(self) -> None:
+        with self._lock:
+            self._queue_depth -= 1
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until a request of roughly `tokens` tokens may be sent."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = self._pause_remaining()
+            finally:
+                self._leave_queue()
+
+    def acquire_sync(self, tokens: int) -> None:
+        """Blocking variant of `acquire` for sync clients."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            try:
+                while wait > 0:
+                    time.sleep(wait)
+                    wait = self._pause_remaining()
+            finally:
+                self._leave_queue()
+
+    def observe(self, response: httpx.Response) -> None:
+        """Adapt the buckets to the rate-limit headers and status of a response."""
+        headers = response.headers
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if response.status_code == 429:
+                self._rate_limited += 1
+                pause = _retry_after_seconds(headers)
+                if pause is None:
+                    pause = self._backoff_seconds
+                self._paused_until = max(self._paused_until, now + pause)
+                self._backoff_seconds = min(self._backoff_seconds * 2, self.max_backoff_seconds)
+                return
+
+            self._backoff_seconds = max(self._backoff_seconds / 2, 1.0)
+            remaining_requests = _parse_float(headers.get("x-ratelimit-remaining-requests"))
+            if remaining_requests is not None:
+                self._available_requests = min(self._available_requests, remaining_requests)
+            remaining_tokens = _parse_float(headers.get("x-ratelimit-remaining-tokens"))
+            if remaining_tokens is not None:
+                self._available_tokens = min(self._available_tokens, remaining_tokens)
+
+    def stats(self) -> RateLimiterStatsDTO:
+        with self._lock:
+            self._refill(time.monotonic())
+            return RateLimiterStatsDTO(
+                queue_depth=self._queue_depth,
+                requests=self._requests,
+                rate_limited=self._rate_limited,
+                total_wait_seconds=self._total_wait_seconds,
+                max_wait_seconds=self._max_wait_seconds,
+                requests_available=self._available_requests,
+                tokens_available=self._available_tokens,
+            )
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def _estimate_request_tokens(request: httpx.Request) -> int:
+    """
+    Tokens OpenAI counts against the limit: the prompt plus the requested completion.
+
+    The API reserves `max_completion_tokens` (or the legacy `max_tokens`) for each
+    of the `n` choices up front, whatever the response turns out to use.
+    """
+    content = request.content
+    tokens = estimate_tokens(content.decode("utf-8", errors="ignore"))
+    # only chat requests set a completion budget; skip parsing large embedding batches
+    if b'"max_' not in content:
+        return tokens
+
+    try:
+        body = json.loads(content)
+    except ValueError:
+        return tokens
+    if not isinstance(body, dict):
+        return tokens
+    completion_tokens = body.get("max_completion_tokens") or body.get("max_tokens")
+    choices = body.get("n") or 1
+    if isinstance(completion_tokens, int) and isinstance(choices, int):
+        tokens += completion_tokens * max(choices, 1)
+    return tokens
+
+
+def _retry_after_seconds(headers: httpx.Headers) -> float | None:
+    """The pause a 429 asks for; OpenAI sends `retry-after-ms` next to the coarser `retry-after`."""
+    retry_after_ms = _parse_float(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return retry_after_ms / 1000
+    return _parse_float(headers.get("retry-after"))
+
+
+def _parse_float(value: str | None) -> float | None:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class RateLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """httpx transport that admits every request through an `OpenAIRateLimiter`."""
+
+    def __init__(self, limiter: OpenAIRateLimiter, transport: httpx.AsyncBaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.acquire(_estimate_request_tokens(request))
+        response = await self.transport.handle_async_request(request)
+        self.limiter.observe(response)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Sync counterpart of `RateLimitedAsyncTransport`."""
+
+    def __init__(self, limiter: OpenAIRateLimiter, transport: httpx.BaseTransport):
+        self.limiter = limiter
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.acquire_sync(_estimate_request_tokens(request))
+        response = self.transport.handle_request(request)
+        self.limiter.observe(response)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
@@ -0,0 +1,195 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.embedding_provider import EmbeddingProvider
+from app.clients.rou_vector_store import (
+    RouIndexingError,
+    RouMetadata,
+    RouVectorStore,
+    RouVectorStoreError,
+    VectorHit,
+    normalize_jurisdiction,
+)
+from app.config.models.rou_index_config import RouIndexConfig
+from app.database.repositories.session import async_db_session_context, engine
+from app.database.schemas.rou import ROU
+from app.database.schemas.rou_embedding import ROU_EMBEDDING_DIMENSIONS, RouEmbedding
+from app.dtos.rou_dto import RouDto
+
+def _version(version: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in re.findall(r"\d+", version))
+
+
+# SQL twin of `normalize_jurisdiction`
+_NORMALIZED_JURISDICTION = func.trim(
+    func.regexp_replace(func.lower(ROU.jurisdiction), r"\W+", " ", "g")
+)
+
+
+class PgVectorRouVectorStore(RouVectorStore):
+    """
+    ROU vectors in Postgres (`rou_embeddings`), searched through a pgvector HNSW index.
+
+    One query does the nearest-neighbour search, the jurisdiction and regulation
+    filters and the hydration of the hits, joined to the ROU rows. Embeddings
+    are deleted with their ROU by the foreign key and backed up with the rest
+    of the database.
+
+    A ROU has one embedding per model, and a store only sees those of its
+    provider's model, so indexes of several models share the table. Shorter vectors are zero-padded
+    to the column's dimensions, which leaves their cosine distances as they are.
+    """
+
+    def __init__(self, index_config: RouIndexConfig, embedding_provider: EmbeddingProvider):
+        super().__init__(index_config, embedding_provider)
+        # whether the server can do iterative index scans, checked on the first search
+        self._iterative_scan: bool | None = None
+
+    @staticmethod
+    def _pad(embedding: List[float]) -> List[float]:
+        if len(embedding) > ROU_EMBEDDING_DIMENSIONS:
+            raise ValueError(
+                f"Embedding has {len(embedding)} dimensions, "
+                f"rou_embeddings holds {ROU_EMBEDDING_DIMENSIONS}"
+            )
+        return embedding + [0.0] * (ROU_EMBEDDING_DIMENSIONS - len(embedding))
+
+    async def _supports_iterative_scan(self, session: AsyncSession) -> bool:
+        """Iterative scans need pgvector 0.8; older servers reject the setting."""
+        if self._iterative_scan is None:
+            version = await session.scalar(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            )
+            self._iterative_scan = version is not None and _version(version) >= (0, 8)
+            if not self._iterative_scan:
+                print(
+                    f"pgvector {version} has no iterative index scans; "
+                    "filtered ROU searches may return fewer hits than asked for"
+                )
+        return self._iterative_scan
+
+    async def search(
+        self,
+        embedding: List[float],
+        n_results: int,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[VectorHit]:
+        distance = RouEmbedding.embedding.cosine_distance(self._pad(embedding))
+        q = (
+            select(ROU, distance.label("distance"))
+            .join(RouEmbedding, RouEmbedding.rou_id == ROU.id)
+            .where(RouEmbedding.model == self.embedding_provider.model)
+            .order_by(distance)
+            .limit(n_results)
+        )
+        if jurisdictions:
+            q = q.where(
+                _NORMALIZED_JURISDICTION.in_({normalize_jurisdiction(j) for j in jurisdictions})
+            )
+        if regulation_ids:
+            q = q.where(ROU.source_id.in_(regulation_ids))
+
+        async with async_db_session_context() as session:
+            # candidates visited per search; filters apply after the index scan,
+            # so iterative scans keep looking until enough rows pass them
+            await session.execute(
+                text(f"SET LOCAL hnsw.ef_search = {int(self.index_config.pgvector_ef_search)}")
+            )
+            if self.index_config.pgvector_iterative_scan and await self._supports_iterative_scan(
+                session
+            ):
+                await session.execute(text("SET LOCAL hnsw.iterative_scan = strict_order"))
+            rows = await session.execute(q)
+            return [
+                VectorHit(rou.id, distance, RouDto.model_validate(rou))
+                for rou, distance in rows.all()
+            ]
+
+    async def upsert(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[RouMetadata]] = None,
+    ) -> None:
+        # documents and metadata are the ROU row's own columns
+        size = self.index_config.upsert_batch_size
+        failed: List[str] = []
+        error: BaseException | None = None
+        model = self.embedding_provider.model
+        for start in range(0, len(ids), size):
+            rows = [
+                {"rou_id": int(rou_id), "model": model, "embedding": self._pad(embedding)}
+                for rou_id, embedding in zip(ids[start : start + size], embeddings[start : start + size])
+            ]
+            statement = insert(RouEmbedding).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[RouEmbedding.rou_id, RouEmbedding.model],
+                set_={
+                    "embedding": statement.excluded.embedding,
+                    "updated_at": func.now(),
+                },
+            )
+
+            async def write(statement=statement) -> None:
+                async with async_db_session_context() as session:
+                    await session.execute(statement)
+                    await session.commit()
+
+            try:
+                await self._with_retries(write, f"Upserting {len(rows)} vectors")
+            except RouVectorStoreError as e:
+                failed.extend(ids[start : start + size])
+                error = e
+
+        if error is not None:
+            raise RouIndexingError(failed, error)
+
+    async def update_metadata(self, ids: List[str], metadatas: List[RouMetadata]) -> None:
+        # searches filter on the ROU row itself; there is nothing to update
+        return
+
+    async def delete(self, ids: List[str]) -> None:
+        size = self.index_config.upsert_batch_size
+        for start in range(0, len(ids), size):
+            batch = [int(rou_id) for rou_id in ids[start : start + size]]
+
+            async def remove(batch=batch) -> None:
+                async with async_db_session_context() as session:
+                    await session.execute(
+                        delete(RouEmbedding).where(
+                            RouEmbedding.model == self.embedding_provider.model,
+                            RouEmbedding.rou_id.in_(batch),
+                        )
+                    )
+                    await session.commit()
+
+            await self._with_retries(remove, f"Deleting {len(batch)} vectors")
+
+    async def list_ids(self) -> List[str]:
+        async with async_db_session_context() as session:
+            rows = await session.execute(
+                select(RouEmbedding.rou_id).where(RouEmbedding.model == self.embedding_provider.model)
+            )
+            return [str(rou_id) for rou_id in rows.scalars().all()]
+
+    async def compact(self) -> None:
+        # HNSW keeps deleted entries until rebuilt; CONCURRENTLY keeps searches and writes going
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            await connection.execute(
+                text("REINDEX INDEX CONCURRENTLY ix_rou_embeddings_embedding_hnsw")
+            )
+            await connection.execute(text("VACUUM ANALYZE rou_embeddings"))
+
+    async def drop(self) -> None:
+        async with async_db_session_context() as session:
+            await session.execute(
+                delete(RouEmbedding).where(RouEmbedding.model == self.embedding_provider.model)
+            )
+            await session.commit()
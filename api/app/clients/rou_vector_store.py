@@ -0,0 +1,346 @@
+from abc import ABC, abstractmethod
+import asyncio
+from functools import lru_cache
+import re
+import traceback
+from typing import Annotated, Awaitable, Callable, Dict, List, NamedTuple, Optional, TypeVar
+
+from fastapi import Depends
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.clients.embedding_provider import (
+    EmbeddingProvider,
+    create_embedding_provider,
+    get_embedding_provider,
+)
+from app.clients.openai_rate_limiter import estimate_tokens
+from app.config.app_config import get_app_config
+from app.config.models.embedding_config import EmbeddingConfig
+from app.config.models.rou_index_config import RouIndexConfig
+from app.database.repositories.rou_index_version_repository import (
+    rou_index_version_repository_context,
+)
+from app.database.schemas.rou import ROU
+from app.database.schemas.rou_index_version import RouIndexVersion
+from app.dtos.rou_dto import RouDto
+from app.services.cache.query_embedding_cache import get_query_embedding_cache
+
+T = TypeVar("T")
+
+# filterable fields stored with a ROU's vector, see `rou_metadata`
+RouMetadata = Dict[str, str | int]
+
+
+class RouVectorStoreError(Exception):
+    """Raised when a call to the vector store or the embedding API still failed after retries."""
+
+
+class RouIndexingError(Exception):
+    """Raised when some ROUs could not be indexed; indexing them again is safe."""
+
+    def __init__(self, failed_ids: List[str], cause: BaseException):
+        super().__init__(f"Failed to index {len(failed_ids)} ROUs: {cause}")
+        self.failed_ids = failed_ids
+
+
+class VectorHit(NamedTuple):
+    rou_id: int
+    # cosine or L2 distance to the query, per the store's metric; smaller is closer
+    distance: float
+    # the ROU itself, if the store loads it along with the hit
+    rou: RouDto | None = None
+
+
+def normalize_jurisdiction(jurisdiction: str) -> str:
+    """Jurisdiction as written to and filtered on in the vector metadata, ignoring case and punctuation."""
+    return re.sub(r"\W+", " ", jurisdiction.lower()).strip()
+
+
+def rou_metadata(rou: ROU) -> RouMetadata:
+    """Metadata stored with a ROU's vector, for filtering searches."""
+    return {
+        "jurisdiction": normalize_jurisdiction(rou.jurisdiction),
+        "source_id": rou.source_id,
+        "type": rou.type.value,
+    }
+
+
+def batch_by_tokens(texts: List[str], token_budget: int, max_inputs: int) -> List[range]:
+    """
+    Split texts into consecutive batches within a token budget and input count.
+
+    A single text larger than the budget gets a batch of its own.
+
+    Returns:
+        List[range]: Index ranges into `texts`.
+    """
+    batches: List[range] = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        text_tokens = estimate_tokens(text)
+        if i > start and (tokens + text_tokens > token_budget or i - start >= max_inputs):
+            batches.append(range(start, i))
+            start, tokens = i, 0
+        tokens += text_tokens
+    if start < len(texts):
+        batches.append(range(start, len(texts)))
+    return batches
+
+
+class RouVectorStore(ABC):
+    """
+    Async access to the ROU embeddings, whichever backend holds them.
+
+    Queries and documents are embedded here with the configured embedding
+    provider and vectors are written precomputed; backends only store and
+    search them, keeping the vectors of each embedding model apart. The
+    backend is picked with `rou_index.backend`.
+    """
+
+    def __init__(self, index_config: RouIndexConfig, embedding_provider: EmbeddingProvider):
+        self.index_config = index_config
+        self.embedding_provider = embedding_provider
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a search query, serving repeated queries from the query embedding cache."""
+        model = self.embedding_provider.model
+        cache = get_query_embedding_cache()
+        embedding = await cache.get(model, query) if cache else None
+        if embedding is not None:
+            return embedding
+
+        [embedding] = await self.embedding_provider.embed([query], stage="rou_query")
+        if cache:
+            await cache.set(model, query, embedding)
+        return embedding
+
+    async def _with_retries(self, action: Callable[[], Awaitable[T]], what: str) -> T:
+        attempt = 1
+        while True:
+            try:
+                return await action()
+            except Exception as e:
+                if attempt >= self.index_config.max_attempts:
+                    raise RouVectorStoreError(f"{what} failed: {e}") from e
+                delay = self.index_config.retry_backoff_seconds * 2 ** (attempt - 1)
+                print(f"{what} failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents in token-budgeted batches, several batches at a time.
+
+        OpenAI requests still pass the shared rate limiter; failed batches are
+        retried with exponential backoff.
+        """
+        semaphore = asyncio.Semaphore(self.index_config.embedding_concurrency)
+        batches = batch_by_tokens(
+            texts,
+            self.index_config.embedding_batch_token_budget,
+            self.index_config.embedding_batch_max_inputs,
+        )
+
+        async def embed(batch: range) -> List[List[float]]:
+            async with semaphore:
+                return await self._with_retries(
+                    lambda: self.embedding_provider.embed(
+                        [texts[i] for i in batch], stage="rou_index"
+                    ),
+                    f"Embedding {len(batch)} documents",
+                )
+
+        embedded = await asyncio.gather(*(embed(batch) for batch in batches))
+        return [embedding for batch in embedded for embedding in batch]
+
+    async def query(
+        self,
+        query: str,
+        n_results: int = 10,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[VectorHit]:
+        """
+        Find the ROUs most similar to a query.
+
+        Args:
+            query (str): Free-text query.
+            n_results (int): Maximum number of ROUs to return.
+            jurisdictions (Optional[List[str]]): Only ROUs of these jurisdictions.
+            regulation_ids (Optional[List[int]]): Only ROUs of these regulations.
+
+        Returns:
+            List[VectorHit]: The matching ROUs, most similar first.
+        """
+        embedding = await self.embed_query(query)
+        return await self.search(embedding, n_results, jurisdictions, regulation_ids)
+
+    @abstractmethod
+    async def search(
+        self,
+        embedding: List[float],
+        n_results: int,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[VectorHit]:
+        """Nearest stored vectors to an embedding; see `query`."""
+
+    @abstractmethod
+    async def upsert(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[RouMetadata]] = None,
+    ) -> None:
+        """
+        Write precomputed vectors in batches, replacing entries with the same ids.
+
+        Raises:
+            RouIndexingError: If some batches still failed after retries. The
+                other batches are written; upserting the failed ids again is safe.
+        """
+
+    @abstractmethod
+    async def update_metadata(self, ids: List[str], metadatas: List[RouMetadata]) -> None:
+        """Replace the metadata of stored vectors in batches, leaving the vectors as they are."""
+
+    @abstractmethod
+    async def delete(self, ids: List[str]) -> None:
+        """
+        Delete vectors in batches; ids without a vector are ignored.
+
+        Raises:
+            RouVectorStoreError: If a batch still failed after retries.
+        """
+
+    @abstractmethod
+    async def list_ids(self) -> List[str]:
+        """IDs of all stored vectors."""
+
+    @abstractmethod
+    async def compact(self) -> None:
+        """Rebuild the index without the entries of deleted vectors."""
+
+    @abstractmethod
+    async def drop(self) -> None:
+        """Delete all vectors of the store's embedding model."""
+
+    async def index(
+        self, ids: List[str], documents: List[str], metadatas: Optional[List[RouMetadata]] = None
+    ) -> None:
+        """
+        Embed and upsert documents.
+
+        Raises:
+            RouIndexingError: If embedding or writing failed after retries; indexing
+                the failed ids again is safe.
+        """
+        try:
+            embeddings = await self.embed_documents(documents)
+        except Exception as e:
+            raise RouIndexingError(ids, e) from e
+        await self.upsert(ids, documents, embeddings, metadatas)
+
+    def close(self) -> None:
+        self.embedding_provider.close()
+
+
+def rou_index_embedding_config(version: RouIndexVersion) -> EmbeddingConfig:
+    """Embedding settings of an index version, with this process's tuning of the provider."""
+    return get_app_config().embedding.model_copy(
+        update={
+            "provider": version.provider,
+            "openai_model": version.openai_model,
+            "openai_dimensions": version.openai_dimensions,
+        }
+    )
+
+
+def create_rou_vector_store(embedding_provider: EmbeddingProvider) -> RouVectorStore:
+    """ROU vector store of the configured backend, holding the vectors of one embedding model."""
+    # imported here, as both backends build on this module
+    from app.clients.chroma_rou_vector_store import ChromaRouVectorStore
+    from app.clients.pgvector_rou_vector_store import PgVectorRouVectorStore
+
+    app_config = get_app_config()
+    if app_config.rou_index.backend == "pgvector":
+        return PgVectorRouVectorStore(
+            index_config=app_config.rou_index, embedding_provider=embedding_provider
+        )
+    return ChromaRouVectorStore(
+        config=app_config.chroma,
+        index_config=app_config.rou_index,
+        embedding_provider=embedding_provider,
+    )
+
+
+class ActiveRouVectorStore:
+    """
+    Keeps the process on the ACTIVE version of the ROU index, see `RouIndexVersion`.
+
+    Until a version is activated, the store of the `embedding` config is used.
+    Every version gets a store of its own and `get_rou_vector_store` hands out
+    the active one, so a request or job keeps searching and writing one index
+    even if the version is switched meanwhile. Switches are picked up every
+    `active_refresh_interval_seconds`.
+    """
+
+    def __init__(self, index_config: RouIndexConfig):
+        self.index_config = index_config
+        self.store = create_rou_vector_store(get_embedding_provider())
+        self._stores: Dict[str, RouVectorStore] = {self.store.embedding_provider.model: self.store}
+        self._refresh: asyncio.Task[None] | None = None
+
+    def get_store(self, embedding_config: EmbeddingConfig) -> RouVectorStore:
+        """Store of an embedding model's index, whether active or not."""
+        store = self._stores.get(embedding_config.model)
+        if store is None:
+            store = create_rou_vector_store(create_embedding_provider(embedding_config))
+            self._stores[embedding_config.model] = store
+        return store
+
+    async def refresh(self) -> None:
+        async with rou_index_version_repository_context() as rou_index_version_repository:
+            version = await rou_index_version_repository.get_active(self.index_config.backend)
+        if version is None or version.model == self.store.embedding_provider.model:
+            return
+        self.store = self.get_store(rou_index_embedding_config(version))
+        print(f"Switched to ROU index version {version.id} ({version.model})")
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except (SQLAlchemyError, OSError):
+                print("Failed to look up the active ROU index version")
+                traceback.print_exc()
+            await asyncio.sleep(self.index_config.active_refresh_interval_seconds)
+
+    def start(self) -> None:
+        if self._refresh is None:
+            self._refresh = asyncio.create_task(self._refresh_periodically())
+
+    def close(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+        for store in self._stores.values():
+            store.close()
+
+
+@lru_cache
+def get_active_rou_vector_store() -> ActiveRouVectorStore:
+    """Tracker of the active ROU index, shared by all requests of the process."""
+    return ActiveRouVectorStore(get_app_config().rou_index)
+
+
+ActiveRouVectorStoreDep = Annotated[ActiveRouVectorStore, Depends(get_active_rou_vector_store)]
+
+
+def get_rou_vector_store() -> RouVectorStore:
+    """ROU vector store of the active index; take it once per request or job."""
+    return get_active_rou_vector_store().store
+
+
+RouVectorStoreDep = Annotated[RouVectorStore, Depends(get_rou_vector_store)]
@@ -9,8 +9,19 @@ from pydantic_settings import (
 )
 
 from app.config.models.learning_agent_config import LearningAgentConfig
+from app.config.models.llm_cache_config import LlmCacheConfig
+from app.config.models.llm_usage_config import LlmUsageConfig
+from app.config.models.chroma_config import ChromaConfig
+from app.config.models.embedding_config import EmbeddingConfig
+from app.config.models.fake_openai_config import FakeOpenAIConfig
 from app.config.models.feat_eval_config import FeatEvalConfig
+from app.config.models.job_queue_config import JobQueueConfig
 from app.config.models.openai_config import OpenAIConfig
+from app.config.models.pdf_reader_config import PdfReaderConfig
+from app.config.models.query_embedding_cache_config import QueryEmbeddingCacheConfig
+from app.config.models.rou_extraction_config import RouExtractionConfig
+from app.config.models.rou_index_config import RouIndexConfig
+from app.config.models.rou_retrieval_config import RouRetrievalConfig
 from app.config.models.supabase_config import SupabaseConfig
 from app.config.env_config import EnvConfig
 from app.config.models.core_config import CoreConfig
@@ -22,6 +33,17 @@ class AppConfig(BaseSettings):
     openai: OpenAIConfig
     feat_eval: FeatEvalConfig
     learning_agent: LearningAgentConfig
+    pdf_reader: PdfReaderConfig = PdfReaderConfig()
+    rou_extraction: RouExtractionConfig = RouExtractionConfig()
+    job_queue: JobQueueConfig = JobQueueConfig()
+    llm_cache: LlmCacheConfig = LlmCacheConfig()
+    fake_openai: FakeOpenAIConfig = FakeOpenAIConfig()
+    llm_usage: LlmUsageConfig = LlmUsageConfig()
+    chroma: ChromaConfig = ChromaConfig()
+    query_embedding_cache: QueryEmbeddingCacheConfig = QueryEmbeddingCacheConfig()
+    rou_index: RouIndexConfig = RouIndexConfig()
+    rou_retrieval: RouRetrievalConfig = RouRetrievalConfig()
+    embedding: EmbeddingConfig = EmbeddingConfig()
 
     model_config = SettingsConfigDict(
         yaml_file=[f"config/{EnvConfig().env}.yaml"],  # type: ignore
@@ -51,14 +73,55 @@ def get_app_config() -> AppConfig:
     return AppConfig()  # type: ignore
 
 
-CoreConfigDep = Annotated[CoreConfig, Depends(lambda config=Depends(get_app_config): config.core)]
+CoreConfigDep = Annotated[CoreConfig, Depends(lambda: get_app_config().core)]
 SupabaseConfigDep = Annotated[
-    SupabaseConfig, Depends(lambda config=Depends(get_app_config): config.supabase)
+    SupabaseConfig, Depends(lambda: get_app_config().supabase)
 ]
-OpenAIConfigDep = Annotated[OpenAIConfig, Depends(lambda config=Depends(get_app_config): config.openai)]
+OpenAIConfigDep = Annotated[OpenAIConfig, Depends(lambda: get_app_config().openai)]
 FeatEvalConfigDep = Annotated[
-    FeatEvalConfig, Depends(lambda config=Depends(get_app_config): config.feat_eval)
+    FeatEvalConfig, Depends(lambda: get_app_config().feat_eval)
 ]
 LearningAgentConfigDep = Annotated[
-    LearningAgentConfig, Depends(lambda config=Depends(get_app_config): config.learning_agent)
+    LearningAgentConfig, Depends(lambda: get_app_config().learning_agent)
+]
+PdfReaderConfigDep = Annotated[
+    PdfReaderConfig, Depends(lambda: get_app_config().pdf_reader)
+]
+RouExtractionConfigDep = Annotated[
+    RouExtractionConfig, Depends(lambda: get_app_config().rou_extraction)
+]
+JobQueueConfigDep = Annotated[
+    JobQueueConfig, Depends(lambda: get_app_config().job_queue)
+]
+LlmCacheConfigDep = Annotated[
+    LlmCacheConfig, Depends(lambda: get_app_config().llm_cache)
+]
+
+FakeOpenAIConfigDep = Annotated[
+    FakeOpenAIConfig, Depends(lambda: get_app_config().fake_openai)
+]
+
+LlmUsageConfigDep = Annotated[
+    LlmUsageConfig, Depends(lambda: get_app_config().llm_usage)
+]
+
+ChromaConfigDep = Annotated[
+    ChromaConfig, Depends(lambda: get_app_config().chroma)
+]
+
+QueryEmbeddingCacheConfigDep = Annotated[
+    QueryEmbeddingCacheConfig,
+    Depends(lambda: get_app_config().query_embedding_cache),
+]
+
+RouIndexConfigDep = Annotated[
+    RouIndexConfig, Depends(lambda: get_app_config().rou_index)
+]
+
+RouRetrievalConfigDep = Annotated[
+    RouRetrievalConfig, Depends(lambda: get_app_config().rou_retrieval)
+]
+
+EmbeddingConfigDep = Annotated[
+    EmbeddingConfig, Depends(lambda: get_app_config().embedding)
 ]
@@ -0,0 +1,20 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class ChromaConfig(BaseModel):
+    # persistent: embedded index on local disk, for a single process (the API
+    # alone); http: a chroma server (`chroma run`), required once workers run
+    mode: Literal["persistent", "http"] = "persistent"
+
+    # directory of the persistent ChromaDB index
+    persist_path: str = "./chroma"
+    # chroma server, in http mode
+    host: str = "localhost"
+    port: int = 8000
+
+    # load the ROU index into memory at startup instead of on the first query
+    warm_up: bool = True
+    # threads running blocking queries against the embedded index, so the event
+    # loop keeps serving other evaluations meanwhile
+    query_threads: int = 4
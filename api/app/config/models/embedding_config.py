@@ -0,0 +1,31 @@
+from typing import Literal, Optional
+from pydantic import BaseModel
+
+# the local provider runs chroma's ONNX export of this model
+LOCAL_EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+
+class EmbeddingConfig(BaseModel):
+    # openai: the embeddings API; local: a small model on CPU in-process, with no
+    # network calls once its files are cached (~/.cache/chroma/onnx_models).
+    # Vectors of different models are not comparable; switch with
+    # `python -m app.rou_index migrate`, which builds the new index alongside.
+    # An index version activated that way overrides provider, openai_model
+    # and openai_dimensions.
+    provider: Literal["openai", "local"] = "openai"
+    openai_model: str = "text-embedding-3-small"
+    # text-embedding-3 models can return shorter vectors; None for the full size
+    openai_dimensions: Optional[int] = None
+
+    # local: texts per inference call, and inference calls running at once
+    local_batch_size: int = 32
+    local_threads: int = 2
+
+    @property
+    def model(self) -> str:
+        """Name of the vectors made with these settings; it tells their indexes apart."""
+        if self.provider == "local":
+            return LOCAL_EMBEDDING_MODEL
+        if self.openai_dimensions:
+            return f"{self.openai_model}@{self.openai_dimensions}"
+        return self.openai_model
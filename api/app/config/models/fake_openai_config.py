@@ -0,0 +1,28 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class FakeOpenAIConfig(BaseModel):
+    """Settings of the local fake OpenAI server (`python -m app.fake_openai`)."""
+
+    host: str = "127.0.0.1"
+    port: int = 8100
+
+    # stub: synthesize responses from the request's tools and response schema
+    # record: forward to `upstream_url` and save every response as a fixture
+    # replay: serve recorded fixtures, falling back to stubs when `replay_fallback_to_stub`
+    mode: Literal["stub", "record", "replay"] = "stub"
+    fixtures_dir: str = "fixtures/openai"
+    upstream_url: str = "https://api.openai.com/v1"
+    replay_fallback_to_stub: bool = True
+
+    # simulated latency per request (not applied in record mode)
+    latency_distribution: Literal["none", "fixed", "uniform", "lognormal"] = "none"
+    latency_mean_ms: float = 500
+    # half-width for uniform, standard deviation for lognormal
+    latency_spread_ms: float = 250
+
+    # fraction of requests answered with one of `error_status_codes`
+    error_rate: float = 0.0
+    error_status_codes: list[int] = [429, 500]
+    embedding_dimensions: int = 1536
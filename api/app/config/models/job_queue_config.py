@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+from app.database.schemas.enums.job_type import JobType
+
+
+class JobQueueConfig(BaseModel):
+    # how often an idle worker polls for new jobs
+    poll_interval_seconds: float = 2
+    # a running job not heartbeated for this long is handed to another worker
+    visibility_timeout_seconds: float = 300
+    # attempts per job before it is marked failed
+    max_attempts: int = 3
+    # delay before the first retry; doubled after every further failed attempt
+    retry_backoff_seconds: float = 30
+
+    # jobs run concurrently by one worker process, per job type
+    concurrency: dict[JobType, int] = {
+        JobType.EXTRACT_REGULATION: 2,
+        JobType.EVALUATE_FEATURE: 10,
+    }
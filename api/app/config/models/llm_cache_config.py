@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+
+class LlmCacheConfig(BaseModel):
+    # exact-match cache of chat model responses, keyed by (model, messages, tools, response schema)
+    enabled: bool = True
+    ttl_seconds: float | None = 7 * 24 * 60 * 60
+
+    # in-memory LRU tier
+    memory_max_bytes: int = 32 * 1024 * 1024
+
+    # on-disk tier, shared by the API and worker processes of a host
+    disk_enabled: bool = True
+    disk_dir: str = ".cache/llm_responses"
+    disk_max_bytes: int = 512 * 1024 * 1024
+
+    # agents that always call the model: rou_extract, rou_dedup, feat_eval, term_mapping, learning
+    # rou_extract already caches parsed results per chunk
+    disabled_agents: list[str] = ["rou_extract"]
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+
+class ModelPrice(BaseModel):
+    # USD per million tokens
+    input: float
+    cached_input: float
+    output: float
+
+
+class LlmUsageConfig(BaseModel):
+    # record tokens, latency and cost of every agent run, model call and embedding call
+    enabled: bool = True
+
+    # rows are buffered and inserted in batches
+    batch_size: int = 200
+    flush_interval_seconds: float = 5
+
+    # matched against the model name reported by the API by longest prefix,
+    # e.g. "gpt-4o-mini" covers "gpt-4o-mini-2024-07-18"; unknown models cost 0
+    prices: dict[str, ModelPrice] = {
+        "gpt-4o-mini": ModelPrice(input=0.15, cached_input=0.075, output=0.60),
+        "gpt-4o": ModelPrice(input=2.50, cached_input=1.25, output=10.00),
+        "gpt-4.1-mini": ModelPrice(input=0.40, cached_input=0.10, output=1.60),
+        "gpt-4.1": ModelPrice(input=2.00, cached_input=0.50, output=8.00),
+        "gpt-5-nano": ModelPrice(input=0.05, cached_input=0.005, output=0.40),
+        "gpt-5-mini": ModelPrice(input=0.25, cached_input=0.025, output=2.00),
+        "gpt-5": ModelPrice(input=1.25, cached_input=0.125, output=10.00),
+        "text-embedding-3-small": ModelPrice(input=0.02, cached_input=0.02, output=0),
+        "text-embedding-3-large": ModelPrice(input=0.13, cached_input=0.13, output=0),
+    }
@@ -4,3 +4,19 @@ from pydantic import BaseModel, SecretStr
 class OpenAIConfig(BaseModel):
     model: str
     api_key: SecretStr
+    # point all clients at an OpenAI-compatible server, e.g. the fake server
+    # (`python -m app.fake_openai`) at "http://127.0.0.1:8100/v1"; None uses api.openai.com
+    base_url: str | None = None
+
+    # process-wide limits shared by every chat and embedding call
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 200_000
+    # upper bound for the adaptive backoff after a 429
+    max_backoff_seconds: float = 60
+
+    # connection pool of the shared HTTP clients
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 60
+    # negotiated per connection; requires the `h2` package
+    http2: bool = True
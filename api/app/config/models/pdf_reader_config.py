@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class PdfReaderConfig(BaseModel):
+    # size of the process pool that parses PDFs off the event loop
+    max_workers: int = 2
+    # parse tasks handed to the process pool at the same time, across all PDFs of a worker
+    max_concurrent_parses: int = 2
+    # pages handed to a pool worker in a single task
+    pages_per_task: int = 20
+    # parse the page ranges of one large PDF on several pool workers in parallel
+    split_large_pdfs: bool = True
+
+    # on-disk cache of extracted text, keyed by the SHA-256 of the PDF bytes
+    text_cache_enabled: bool = True
+    text_cache_dir: str = ".cache/pdf_text"
+    text_cache_max_bytes: int = 256 * 1024 * 1024
+    text_cache_compress: bool = True
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class QueryEmbeddingCacheConfig(BaseModel):
+    # cache of ROU search query embeddings, keyed by (embedding model, normalized query)
+    enabled: bool = True
+    ttl_seconds: float | None = None
+
+    # in-memory LRU tier; a 1536-dimension float32 vector takes 6 KiB
+    memory_max_bytes: int = 16 * 1024 * 1024
+
+    # on-disk tier, shared by the API and worker processes of a host
+    disk_enabled: bool = True
+    disk_dir: str = ".cache/query_embeddings"
+    disk_max_bytes: int = 256 * 1024 * 1024
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+
+
+class RouExtractionConfig(BaseModel):
+    # on-disk cache of per-chunk extraction results, keyed by (chunk, system prompt, model)
+    chunk_cache_enabled: bool = True
+    chunk_cache_dir: str = ".cache/rou_chunks"
+    chunk_cache_max_bytes: int = 128 * 1024 * 1024
+    chunk_cache_ttl_seconds: float | None = 30 * 24 * 60 * 60
+
+    # chunks extracted at once per document; the page stream pauses beyond it. Bounds
+    # memory only: the shared OpenAI rate limiter paces the map and reduce calls
+    max_chunks_in_flight: int = 20
+
+    # tree reduce: max number of ROU lists merged by one dedup call
+    reduce_fan_in: int = 4
+    # tree reduce: estimated prompt tokens of the ROU lists merged by one dedup call
+    reduce_token_budget: int = 16000
+
+    # local pre-dedup of chunk ROUs before the LLM reduce, embedded with `embedding.provider`;
+    # the thresholds below are tuned for text-embedding-3-small
+    prededup_enabled: bool = True
+    # cosine similarity above which same-jurisdiction ROUs are merged without the LLM
+    prededup_merge_threshold: float = 0.95
+    # cosine similarity above which ROUs are clustered and left for the LLM to decide
+    prededup_ambiguous_threshold: float = 0.85
+    # send only ambiguous clusters to the LLM, skipping it entirely when there are none
+    skip_llm_reduce_when_unambiguous: bool = True
@@ -0,0 +1,29 @@
+from typing import Literal
+from pydantic import BaseModel
+
+
+class RouIndexConfig(BaseModel):
+    # where ROU embeddings live: the ChromaDB collection, or the `rou_embeddings`
+    # table with a pgvector HNSW index; fill a new backend with
+    # `python -m app.rou_index reconcile --index-missing`
+    backend: Literal["chroma", "pgvector"] = "chroma"
+    # documents embedded per request are capped by estimated tokens and count,
+    # well below the embeddings API limits (300k tokens, 2048 inputs)
+    embedding_batch_token_budget: int = 50_000
+    embedding_batch_max_inputs: int = 512
+    # embedding requests in flight per indexing call; all of them still pass the shared rate limiter
+    embedding_concurrency: int = 4
+    # vectors written to the index per call
+    upsert_batch_size: int = 1000
+    # attempts per batch before indexing gives up; vectors are upserted, so retrying is safe
+    max_attempts: int = 3
+    retry_backoff_seconds: float = 2
+
+    # how often each process checks which index version is active, see `python -m app.rou_index migrate`
+    active_refresh_interval_seconds: float = 30
+
+    # pgvector: HNSW candidates visited per search; higher trades latency for recall
+    pgvector_ef_search: int = 100
+    # keep scanning until enough rows pass the filters; only used when the server
+    # runs pgvector >= 0.8, which is checked on the first search
+    pgvector_iterative_scan: bool = True
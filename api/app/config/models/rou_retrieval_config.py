@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+
+
+class RouRetrievalConfig(BaseModel):
+    # fuse BM25 keyword hits with vector hits; vector search alone misses exact
+    # identifiers such as statute numbers ("SB976", "Article 16")
+    hybrid: bool = True
+    # ROUs returned per search, and candidates taken from each retriever before fusion
+    n_results: int = 10
+    n_candidates: int = 30
+    # reciprocal-rank fusion constant; larger values flatten the weight of top ranks
+    rrf_k: int = 60
+    # BM25 term-frequency saturation and document-length normalization
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    # how often each process picks up ROUs stored or deleted by other processes
+    refresh_interval_seconds: float = 60
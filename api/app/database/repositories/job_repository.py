@@ -0,0 +1,190 @@
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Annotated, Any
+
+from fastapi import Depends
+from sqlalchemy import and_, func, or_, select, update
+
+from app.database.schemas.enums.job_status import JobStatus
+from app.database.schemas.enums.job_type import JobType
+from app.database.schemas.job import Job
+from app.database.repositories.session import AsyncDbSessionDep, async_db_session_context
+from app.database.repositories.base_repository import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+    """Repository for the background job queue."""
+
+    def __init__(self, session: AsyncDbSessionDep) -> None:
+        super().__init__(Job, session)
+
+    async def enqueue_many(
+        self, job_type: JobType, payloads: list[dict[str, Any]], max_attempts: int
+    ) -> list[Job]:
+        """
+        Queue one job per payload.
+
+        Args:
+            job_type (JobType): The kind of work to run.
+            payloads (list[dict]): JSON payloads handed to the job handler.
+            max_attempts (int): Attempts before a job is marked failed.
+
+        Returns:
+            list[Job]: The queued jobs.
+        """
+        return await self.create_many(
+            [
+                Job(job_type=job_type, payload=payload, max_attempts=max_attempts)
+                for payload in payloads
+            ]
+        )
+
+    async def claim(
+        self, job_type: JobType, worker_id: str, limit: int, visibility_timeout: float
+    ) -> list[Job]:
+        """
+        Claim up to `limit` runnable jobs for a worker.
+
+        Rows locked by a concurrent claim are skipped rather than waited on, so any
+        number of workers can poll the same table. A running job whose
+        `locked_until` has passed is considered abandoned and claimed again.
+
+        Args:
+            job_type (JobType): Only jobs of this type are claimed.
+            worker_id (str): Recorded on the claimed jobs.
+            limit (int): Maximum number of jobs to claim.
+            visibility_timeout (float): Seconds until a claimed job becomes claimable again.
+
+        Returns:
+            list[Job]: The claimed jobs.
+        """
+        now = func.now()
+        claimable = (
+            select(Job.id)
+            .where(
+                Job.job_type == job_type,
+                Job.attempts < Job.max_attempts,
+                or_(
+                    and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+                    and_(Job.status == JobStatus.RUNNING, Job.locked_until < now),
+                ),
+            )
+            .order_by(Job.run_after, Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        q = (
+            update(Job)
+            .where(Job.id.in_(claimable.scalar_subquery()))
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        rows = await self.session.execute(q)
+        jobs = list(rows.scalars().all())
+        await self.session.commit()
+        return jobs
+
+    async def heartbeat(self, job_id: int, worker_id: str, visibility_timeout: float) -> bool:
+        """
+        Extend the lock of a running job.
+
+        Returns:
+            bool: False if the job is no longer held by this worker.
+        """
+        q = (
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+            .values(locked_until=func.now() + timedelta(seconds=visibility_timeout))
+        )
+        rows = await self.session.execute(q)
+        await self.session.commit()
+        return rows.rowcount > 0
+
+    async def complete(self, job_id: int, worker_id: str) -> bool:
+        """
+        Mark a job held by this worker completed.
+
+        Returns:
+            bool: False if the job is no longer held by this worker; it is left as is.
+        """
+        q = (
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+            .values(status=JobStatus.COMPLETED, locked_until=None, last_error=None)
+        )
+        rows = await self.session.execute(q)
+        await self.session.commit()
+        return rows.rowcount > 0
+
+    async def fail(
+        self, job: Job, worker_id: str, error: str, retry_backoff: float
+    ) -> JobStatus | None:
+        """
+        Record a failed attempt of a job held by this worker, re-queueing it
+        with exponential backoff while attempts are left.
+
+        Returns:
+            JobStatus | None: QUEUED if the job will be retried, FAILED if not, and
+                None if the job is no longer held by this worker; it is left as is.
+        """
+        if job.attempts < job.max_attempts:
+            status = JobStatus.QUEUED
+            delay = retry_backoff * 2 ** (job.attempts - 1)
+        else:
+            status, delay = JobStatus.FAILED, 0
+
+        q = (
+            update(Job)
+            .where(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+            .values(
+                status=status,
+                locked_until=None,
+                last_error=error,
+                run_after=func.now() + timedelta(seconds=delay),
+            )
+        )
+        rows = await self.session.execute(q)
+        await self.session.commit()
+        return status if rows.rowcount > 0 else None
+
+    async def fail_abandoned(self, job_type: JobType) -> list[Job]:
+        """
+        Mark running jobs whose lock expired on their last attempt as failed.
+
+        Returns:
+            list[Job]: The jobs marked failed.
+        """
+        q = (
+            update(Job)
+            .where(
+                Job.job_type == job_type,
+                Job.status == JobStatus.RUNNING,
+                Job.locked_until < func.now(),
+                Job.attempts >= Job.max_attempts,
+            )
+            .values(status=JobStatus.FAILED, locked_until=None, last_error="Visibility timeout expired")
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        rows = await self.session.execute(q)
+        jobs = list(rows.scalars().all())
+        await self.session.commit()
+        return jobs
+
+
+JobRepositoryDep = Annotated[JobRepository, Depends(JobRepository)]
+
+
+@asynccontextmanager
+async def job_repository_context():
+    """
+    Context manager for JobRepository.
+    """
+    async with async_db_session_context() as session:
+        yield JobRepository(session)
@@ -0,0 +1,132 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Annotated, Any
+
+from fastapi import Depends
+from sqlalchemy import Float, cast, func, insert, select
+
+from app.database.schemas.check import Check
+from app.database.schemas.enums.llm_usage_kind import LlmUsageKind
+from app.database.schemas.llm_usage import LlmUsage
+from app.database.schemas.regulation import Regulation
+from app.database.repositories.session import AsyncDbSessionDep, async_db_session_context
+from app.database.repositories.base_repository import BaseRepository
+from app.dtos.llm_usage_dto import LlmUsageStageSummaryDTO, LlmUsageTotalsDTO
+
+
+class LlmUsageRepository(BaseRepository[LlmUsage]):
+    """Repository for LLM token, latency and cost records."""
+
+    def __init__(self, session: AsyncDbSessionDep) -> None:
+        super().__init__(LlmUsage, session)
+
+    async def insert_many(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Insert usage rows in one statement, without loading them back.
+
+        Links to checks or regulations deleted since the rows were recorded are
+        cleared, as ON DELETE SET NULL would have done, so one deleted check does
+        not fail the whole batch.
+
+        Args:
+            rows (list[dict]): Column values of the rows.
+        """
+        if not rows:
+            return
+        for column, model in (("check_id", Check), ("regulation_id", Regulation)):
+            ids = {row[column] for row in rows if row.get(column) is not None}
+            if not ids:
+                continue
+            existing = set(
+                (await self.session.execute(select(model.id).where(model.id.in_(ids)))).scalars()
+            )
+            rows = [
+                {**row, column: None} if row.get(column) not in existing else row for row in rows
+            ]
+        await self.session.execute(insert(LlmUsage), rows)
+        await self.session.commit()
+
+    async def summarize_stages(self, since: datetime | None = None) -> list[LlmUsageStageSummaryDTO]:
+        """
+        Latency and token percentiles per stage and kind.
+
+        Args:
+            since (datetime | None): Only count rows created at or after this time.
+
+        Returns:
+            list[LlmUsageStageSummaryDTO]: One summary per stage and kind.
+        """
+        total_tokens = LlmUsage.prompt_tokens + LlmUsage.completion_tokens
+
+        def percentile(fraction: float, column):
+            return func.percentile_cont(fraction).within_group(cast(column, Float))
+
+        q = (
+            select(
+                LlmUsage.stage,
+                LlmUsage.kind,
+                func.count().label("count"),
+                func.count(LlmUsage.error).label("errors"),
+                func.sum(LlmUsage.cache_hits).label("cache_hits"),
+                percentile(0.5, LlmUsage.latency_ms).label("p50_latency_ms"),
+                percentile(0.95, LlmUsage.latency_ms).label("p95_latency_ms"),
+                percentile(0.5, total_tokens).label("p50_total_tokens"),
+                percentile(0.95, total_tokens).label("p95_total_tokens"),
+                func.sum(LlmUsage.prompt_tokens).label("prompt_tokens"),
+                func.sum(LlmUsage.completion_tokens).label("completion_tokens"),
+                func.sum(LlmUsage.cached_tokens).label("cached_tokens"),
+                func.sum(LlmUsage.tool_calls).label("tool_calls"),
+                func.sum(LlmUsage.cost_usd).label("cost_usd"),
+            )
+            .group_by(LlmUsage.stage, LlmUsage.kind)
+            .order_by(LlmUsage.kind, LlmUsage.stage)
+        )
+        if since is not None:
+            q = q.where(LlmUsage.created_at >= since)
+
+        rows = await self.session.execute(q)
+        return [LlmUsageStageSummaryDTO.model_validate(row._mapping) for row in rows]
+
+    async def get_totals(
+        self, check_id: int | None = None, regulation_id: int | None = None
+    ) -> list[LlmUsageTotalsDTO]:
+        """
+        Tokens and cost spent on a check or regulation, per stage.
+
+        Returns:
+            list[LlmUsageTotalsDTO]: One entry per stage of the agent runs.
+        """
+        q = (
+            select(
+                LlmUsage.stage,
+                func.count().label("runs"),
+                func.sum(LlmUsage.latency_ms).label("latency_ms"),
+                func.sum(LlmUsage.prompt_tokens).label("prompt_tokens"),
+                func.sum(LlmUsage.completion_tokens).label("completion_tokens"),
+                func.sum(LlmUsage.cached_tokens).label("cached_tokens"),
+                func.sum(LlmUsage.tool_calls).label("tool_calls"),
+                func.sum(LlmUsage.cost_usd).label("cost_usd"),
+            )
+            .where(LlmUsage.kind == LlmUsageKind.AGENT)
+            .group_by(LlmUsage.stage)
+            .order_by(LlmUsage.stage)
+        )
+        if check_id is not None:
+            q = q.where(LlmUsage.check_id == check_id)
+        if regulation_id is not None:
+            q = q.where(LlmUsage.regulation_id == regulation_id)
+
+        rows = await self.session.execute(q)
+        return [LlmUsageTotalsDTO.model_validate(row._mapping) for row in rows]
+
+
+LlmUsageRepositoryDep = Annotated[LlmUsageRepository, Depends(LlmUsageRepository)]
+
+
+@asynccontextmanager
+async def llm_usage_repository_context():
+    """
+    Context manager for LlmUsageRepository.
+    """
+    async with async_db_session_context() as session:
+        yield LlmUsageRepository(session)
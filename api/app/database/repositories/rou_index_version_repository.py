@@ -0,0 +1,116 @@
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy import select, update
+
+from app.database.schemas.enums.rou_index_version_status import RouIndexVersionStatus
+from app.database.schemas.rou_index_version import RouIndexVersion
+from app.database.repositories.session import AsyncDbSessionDep, async_db_session_context
+from app.database.repositories.base_repository import BaseRepository
+
+
+class RouIndexVersionRepository(BaseRepository[RouIndexVersion]):
+    """Repository for the versions of the ROU vector index."""
+
+    def __init__(self, session: AsyncDbSessionDep) -> None:
+        super().__init__(RouIndexVersion, session)
+
+    async def get_active(self, backend: str) -> RouIndexVersion | None:
+        """
+        Get the version every process of a backend searches and writes to.
+
+        Args:
+            backend (str): The `rou_index.backend` setting.
+
+        Returns:
+            RouIndexVersion | None: None until a version was activated.
+        """
+        q = select(RouIndexVersion).where(
+            RouIndexVersion.backend == backend,
+            RouIndexVersion.status == RouIndexVersionStatus.ACTIVE,
+        )
+        rows = await self.session.execute(q)
+        return rows.scalars().first()
+
+    async def save_checkpoint(self, id: int, last_rou_id: int, embedded: int) -> None:
+        """
+        Record the progress of a build.
+
+        Args:
+            id (int): The version being built.
+            last_rou_id (int): All ROUs up to this id are embedded.
+            embedded (int): ROUs embedded in the page just written.
+        """
+        q = (
+            update(RouIndexVersion)
+            .where(RouIndexVersion.id == id)
+            .values(last_rou_id=last_rou_id, embedded=RouIndexVersion.embedded + embedded)
+        )
+        await self.session.execute(q)
+        await self.session.commit()
+
+    async def set_status(self, id: int, status: RouIndexVersionStatus) -> None:
+        q = update(RouIndexVersion).where(RouIndexVersion.id == id).values(status=status)
+        await self.session.execute(q)
+        await self.session.commit()
+
+    async def activate(self, id: int, backend: str, catch_up_after: datetime) -> None:
+        """
+        Make a version the active one of its backend, retiring the current one.
+
+        Both updates commit together, so readers see either version active,
+        never both or none.
+
+        Args:
+            id (int): The version to activate.
+            backend (str): Its backend.
+            catch_up_after (datetime): When every process will have picked up the switch.
+        """
+        await self.session.execute(
+            update(RouIndexVersion)
+            .where(
+                RouIndexVersion.backend == backend,
+                RouIndexVersion.status == RouIndexVersionStatus.ACTIVE,
+            )
+            .values(status=RouIndexVersionStatus.RETIRED)
+        )
+        await self.session.execute(
+            update(RouIndexVersion)
+            .where(RouIndexVersion.id == id)
+            .values(status=RouIndexVersionStatus.ACTIVE, catch_up_after=catch_up_after)
+        )
+        await self.session.commit()
+
+    async def set_caught_up(self, id: int) -> None:
+        q = update(RouIndexVersion).where(RouIndexVersion.id == id).values(catch_up_after=None)
+        await self.session.execute(q)
+        await self.session.commit()
+
+    async def reload(self, version: RouIndexVersion) -> RouIndexVersion:
+        """
+        Re-read a loaded version, after the bulk updates above changed its row.
+
+        Args:
+            version (RouIndexVersion): A version loaded by this repository.
+
+        Returns:
+            RouIndexVersion: The same instance, with the current column values.
+        """
+        await self.session.refresh(version)
+        return version
+
+
+RouIndexVersionRepositoryDep = Annotated[
+    RouIndexVersionRepository, Depends(RouIndexVersionRepository)
+]
+
+
+@asynccontextmanager
+async def rou_index_version_repository_context():
+    """
+    Context manager for RouIndexVersionRepository.
+    """
+    async with async_db_session_context() as session:
+        yield RouIndexVersionRepository(session)
@@ -2,6 +2,9 @@ from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy import select
+
+from app.database.schemas.enums.rou_type import RouType
 from app.database.schemas.rou import ROU
 from app.database.repositories.session import AsyncDbSessionDep, async_db_session_context
 from app.database.repositories.base_repository import BaseRepository
@@ -13,6 +16,42 @@ class RouRepository(BaseRepository[ROU]):
     def __init__(self, session: AsyncDbSessionDep) -> None:
         super().__init__(ROU, session)
 
+    async def get_page(self, after_id: int = 0, limit: int = 1000) -> list[ROU]:
+        """
+        Get ROUs in ID order, for walking the whole table in batches.
+
+        Args:
+            after_id (int): Only return ROUs with a larger ID.
+            limit (int): Maximum number of ROUs to return.
+
+        Returns:
+            list[ROU]: The next page of ROUs; empty after the last one.
+        """
+        q = select(ROU).where(ROU.id > after_id).order_by(ROU.id).limit(limit)
+        rows = await self.session.execute(q)
+        return list(rows.scalars().all())
+
+    async def get_ids(
+        self, source_id: int | None = None, rou_type: RouType | None = None
+    ) -> list[int]:
+        """
+        Get ROU IDs without loading the rows.
+
+        Args:
+            source_id (int | None): Only the ROUs of this regulation; all ROUs if None.
+            rou_type (RouType | None): Only the ROUs of this type; all types if None.
+
+        Returns:
+            list[int]: The IDs, in ascending order.
+        """
+        q = select(ROU.id).order_by(ROU.id)
+        if source_id is not None:
+            q = q.where(ROU.source_id == source_id)
+        if rou_type is not None:
+            q = q.where(ROU.type == rou_type)
+        rows = await self.session.execute(q)
+        return list(rows.scalars().all())
+
 
 RouRepositoryDep = Annotated[RouRepository, Depends(RouRepository)]
 
@@ -9,6 +9,10 @@ from app.database.schemas.eval_result import EvalResult
 from app.database.schemas.terminology import Terminology
 from app.database.schemas.active_prompt import ActivePrompt
 from app.database.schemas.system_prompt_version import SystemPromptVersion
+from app.database.schemas.job import Job
+from app.database.schemas.llm_usage import LlmUsage
+from app.database.schemas.rou_embedding import RouEmbedding
+from app.database.schemas.rou_index_version import RouIndexVersion
 
 __all__ = [
     "Base",
@@ -22,4 +26,8 @@ __all__ = [
     "Terminology",
     "ActivePrompt",
     "SystemPromptVersion",
+    "Job",
+    "LlmUsage",
+    "RouEmbedding",
+    "RouIndexVersion",
 ]
@@ -0,0 +1,13 @@
+from enum import StrEnum, auto
+
+
+class ExtractionStatus(StrEnum):
+    """
+    Enumeration for the ROU extraction status of a Regulation.
+    """
+
+    PENDING = auto()  # Extraction has not started yet
+    EXTRACTING = auto()  # Chunks are being extracted; their ROUs are stored as they finish
+    DEDUPLICATING = auto()  # All chunks are done; the deduplication pass is running
+    COMPLETED = auto()  # Deduplicated ROUs replaced the per-chunk ROUs
+    FAILED = auto()  # Extraction stopped with an error; per-chunk ROUs stored so far are kept
@@ -0,0 +1,12 @@
+from enum import StrEnum, auto
+
+
+class JobStatus(StrEnum):
+    """
+    Enumeration for the status of a queued Job.
+    """
+
+    QUEUED = auto()  # Waiting to be claimed by a worker, possibly after a failed attempt
+    RUNNING = auto()  # Claimed by a worker until `locked_until`; reclaimed once that passes
+    COMPLETED = auto()  # Finished successfully
+    FAILED = auto()  # Failed on its last attempt
@@ -0,0 +1,10 @@
+from enum import StrEnum, auto
+
+
+class JobType(StrEnum):
+    """
+    Enumeration for the kind of work a queued Job performs.
+    """
+
+    EXTRACT_REGULATION = auto()  # Extract and store the ROUs of a regulation
+    EVALUATE_FEATURE = auto()  # Run the AI compliance check of a feature
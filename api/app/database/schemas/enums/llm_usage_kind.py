@@ -0,0 +1,11 @@
+from enum import StrEnum, auto
+
+
+class LlmUsageKind(StrEnum):
+    """
+    Enumeration for what an LlmUsage row measures.
+    """
+
+    AGENT = auto()  # A whole agent or pipeline run, including tool calls
+    MODEL = auto()  # A single chat model call within a run
+    EMBEDDING = auto()  # A single embedding call, for ROUs or a search query
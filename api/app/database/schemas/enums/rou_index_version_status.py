@@ -0,0 +1,13 @@
+from enum import StrEnum, auto
+
+
+class RouIndexVersionStatus(StrEnum):
+    """
+    Enumeration for the lifecycle of a RouIndexVersion.
+    """
+
+    BUILDING = auto()  # Being filled in the background; searches do not use it yet
+    READY = auto()  # Every ROU was embedded once; can be switched to
+    ACTIVE = auto()  # Searched and written by all processes; one per backend
+    RETIRED = auto()  # Replaced by another version; kept for switching back until dropped
+    DROPPED = auto()  # Its vectors were deleted
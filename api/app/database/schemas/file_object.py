@@ -16,6 +16,7 @@ class FileObject(Base, UuidMixin, TimestampMixin):
 
     bucket_name: Mapped[str] = mapped_column(String(100), nullable=False)
     path: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
 
     regulation: Mapped["Regulation"] = relationship(
         "Regulation", back_populates="file_object", uselist=False
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Any
+from sqlalchemy import JSON, DateTime, Enum, Index, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.schemas.enums.job_status import JobStatus
+from app.database.schemas.enums.job_type import JobType
+from app.database.schemas.mixins.serial_id_mixin import SerialIdMixin
+from app.database.schemas.mixins.timestamp_mixin import TimestampMixin
+from app.database.schemas.base import Base
+
+
+class Job(Base, SerialIdMixin, TimestampMixin):
+    """
+    Unit of background work, claimed by worker processes with `FOR UPDATE SKIP LOCKED`.
+    """
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_claim", "job_type", "status", "run_after"),)
+
+    job_type: Mapped[JobType] = mapped_column(Enum(JobType), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus), nullable=False, default=JobStatus.QUEUED
+    )
+    payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    # not claimable before this time; pushed back after a failed attempt
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    # visibility timeout: a running job whose lock expired is claimable again
+    locked_until: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
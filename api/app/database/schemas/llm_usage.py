@@ -0,0 +1,40 @@
+from sqlalchemy import Enum, Float, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.schemas.enums.llm_usage_kind import LlmUsageKind
+from app.database.schemas.mixins.serial_id_mixin import SerialIdMixin
+from app.database.schemas.mixins.timestamp_mixin import TimestampMixin
+from app.database.schemas.base import Base
+
+
+class LlmUsage(Base, SerialIdMixin, TimestampMixin):
+    """
+    Tokens, latency and cost of one agent run or chat model call.
+    """
+
+    __tablename__ = "llm_usage"
+    __table_args__ = (Index("ix_llm_usage_stage_created_at", "stage", "kind", "created_at"),)
+
+    kind: Mapped[LlmUsageKind] = mapped_column(Enum(LlmUsageKind), nullable=False)
+    # e.g. feat_eval, term_mapping, learning, rou_extraction, rou_extract, rou_dedup
+    stage: Mapped[str] = mapped_column(String, nullable=False)
+    model: Mapped[str | None] = mapped_column(String, nullable=True)
+
+    # usage is kept when the check or regulation is deleted
+    check_id: Mapped[int | None] = mapped_column(
+        ForeignKey("checks.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    regulation_id: Mapped[int | None] = mapped_column(
+        ForeignKey("regulations.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+
+    prompt_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completion_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # prompt tokens served from OpenAI's prompt cache, billed at a discount
+    cached_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    latency_ms: Mapped[float] = mapped_column(Float, nullable=False)
+    tool_calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # model calls answered by the LLM response cache; they spend no tokens
+    cache_hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
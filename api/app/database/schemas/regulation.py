@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Text
+from sqlalchemy import Enum, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
+from app.database.schemas.enums.extraction_status import ExtractionStatus
 from app.database.schemas.mixins.serial_id_mixin import SerialIdMixin
 from app.database.schemas.mixins.timestamp_mixin import TimestampMixin
 from app.database.schemas.base import Base
@@ -21,6 +22,13 @@ class Regulation(Base, SerialIdMixin, TimestampMixin):
 
     title: Mapped[str] = mapped_column(Text, nullable=False)
 
+    extraction_status: Mapped[ExtractionStatus] = mapped_column(
+        Enum(ExtractionStatus), nullable=False, default=ExtractionStatus.PENDING
+    )
+    chunks_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    chunks_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    chunks_failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
     file_object_id: Mapped[UUID] = mapped_column(
         ForeignKey("file_objects.id"), nullable=False, unique=True
     )
@@ -0,0 +1,36 @@
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.schemas.base import Base
+from app.database.schemas.mixins.timestamp_mixin import TimestampMixin
+from app.database.schemas.types.vector import Vector
+
+ROU_EMBEDDING_DIMENSIONS = 1536
+
+
+class RouEmbedding(Base, TimestampMixin):
+    """
+    Embedding of a ROU's canonical text, for the pgvector ROU vector store.
+
+    Kept out of `regulatory_obligation_units` so loading ROUs does not load
+    vectors; deleting a ROU deletes its embeddings. A ROU has one embedding per
+    model, so the index of another model can be built next to the active one.
+    """
+
+    __tablename__ = "rou_embeddings"
+    __table_args__ = (
+        Index(
+            "ix_rou_embeddings_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    rou_id: Mapped[int] = mapped_column(
+        ForeignKey("regulatory_obligation_units.id", ondelete="CASCADE"), primary_key=True
+    )
+    model: Mapped[str] = mapped_column(String, primary_key=True)
+    embedding: Mapped[list[float]] = mapped_column(
+        Vector(ROU_EMBEDDING_DIMENSIONS), nullable=False
+    )
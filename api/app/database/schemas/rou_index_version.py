@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Index, Integer, String, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.schemas.enums.rou_index_version_status import RouIndexVersionStatus
+from app.database.schemas.mixins.serial_id_mixin import SerialIdMixin
+from app.database.schemas.mixins.timestamp_mixin import TimestampMixin
+from app.database.schemas.base import Base
+
+
+class RouIndexVersion(Base, SerialIdMixin, TimestampMixin):
+    """
+    ROU vector index of one embedding model in one backend.
+
+    The ACTIVE version of the configured backend is the one every process
+    searches and writes to; switching is a single update of the statuses.
+    Without an ACTIVE version, processes use the `embedding` config.
+    """
+
+    __tablename__ = "rou_index_versions"
+    __table_args__ = (
+        Index(
+            "uq_rou_index_versions_active",
+            "backend",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+    )
+
+    backend: Mapped[str] = mapped_column(String, nullable=False)
+    # settings the version's embeddings are made with, see `EmbeddingConfig`
+    provider: Mapped[str] = mapped_column(String, nullable=False)
+    openai_model: Mapped[str] = mapped_column(String, nullable=False)
+    openai_dimensions: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # `EmbeddingConfig.model`, which names the collection or tags the rows
+    model: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[RouIndexVersionStatus] = mapped_column(
+        Enum(RouIndexVersionStatus), nullable=False, default=RouIndexVersionStatus.BUILDING
+    )
+
+    # build checkpoint: ROUs are embedded in id order, up to and including this id
+    last_rou_id: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    embedded: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # switch in progress: set on activation to when every process will have picked
+    # it up, cleared once the version caught up with their writes to the previous one
+    catch_up_after: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
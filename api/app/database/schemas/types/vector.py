@@ -0,0 +1,41 @@
+from typing import Any, List
+
+from sqlalchemy import Float
+from sqlalchemy.types import UserDefinedType
+
+
+class Vector(UserDefinedType):
+    """
+    pgvector `vector(n)` column.
+
+    Values travel in pgvector's text form ("[0.1,0.2,...]"), which asyncpg
+    passes through for types it has no codec for.
+    """
+
+    cache_ok = True
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+
+    def get_col_spec(self, **kw: Any) -> str:
+        return f"VECTOR({self.dimensions})"
+
+    def bind_processor(self, dialect):
+        def process(value: List[float] | None) -> str | None:
+            if value is None:
+                return None
+            return "[" + ",".join(str(float(x)) for x in value) + "]"
+
+        return process
+
+    def result_processor(self, dialect, coltype):
+        def process(value: str | None) -> List[float] | None:
+            if value is None:
+                return None
+            return [float(x) for x in value.strip("[]").split(",")]
+
+        return process
+
+    class comparator_factory(UserDefinedType.Comparator):
+        def cosine_distance(self, other: Any):
+            return self.op("<=>", return_type=Float)(other)
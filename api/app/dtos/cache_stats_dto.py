@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field, computed_field
+
+
+class CacheStatsDTO(BaseModel):
+    """
+    Hit/miss counters and current footprint of a cache.
+    """
+
+    hits: int = Field(0, description="Number of lookups served from the cache")
+    misses: int = Field(0, description="Number of lookups not found in the cache")
+    entries: int = Field(0, description="Number of entries currently stored")
+    size_bytes: int = Field(0, description="Total size of the stored entries in bytes")
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
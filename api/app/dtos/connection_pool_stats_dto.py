@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field, computed_field
+
+
+class ConnectionPoolStatsDTO(BaseModel):
+    """
+    Connection reuse counters of the shared OpenAI HTTP clients.
+    """
+
+    requests: int = Field(..., description="Requests sent since startup")
+    new_connections: int = Field(..., description="Requests that had to open a new connection")
+    http2_requests: int = Field(..., description="Requests served over HTTP/2")
+
+    @computed_field
+    @property
+    def reused_connections(self) -> int:
+        return self.requests - self.new_connections
+
+    @computed_field
+    @property
+    def reuse_rate(self) -> float:
+        return self.reused_connections / self.requests if self.requests else 0.0
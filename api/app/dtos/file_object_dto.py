@@ -9,5 +9,6 @@ class FileObjectDTO(BaseModel):
     id: UUID
     bucket_name: str
     path: str
+    content_hash: str | None = None
     created_at: datetime
     updated_at: datetime
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+
+
+class ExtractRegulationJobPayload(BaseModel):
+    """
+    Payload of an EXTRACT_REGULATION job
+    """
+
+    regulation_id: int
+
+
+class EvaluateFeatureJobPayload(BaseModel):
+    """
+    Payload of an EVALUATE_FEATURE job
+    """
+
+    # the check carries the feature to evaluate
+    check_id: int
@@ -0,0 +1,7 @@
+from app.dtos.tiered_cache_stats_dto import TieredCacheStatsDTO
+
+
+class LlmCacheStatsDTO(TieredCacheStatsDTO):
+    """
+    Counters of the two-tier LLM response cache.
+    """
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+
+from app.database.schemas.enums.llm_usage_kind import LlmUsageKind
+
+
+class LlmUsageStageSummaryDTO(BaseModel):
+    """
+    Latency and token distribution of one stage.
+
+    Agent rows cover a whole run (e.g. one feature evaluation including its tool
+    calls); model rows cover single chat model calls within runs.
+    """
+
+    stage: str
+    kind: LlmUsageKind
+    count: int = Field(..., description="Runs or calls recorded")
+    errors: int = Field(..., description="Runs or calls that raised")
+    cache_hits: int = Field(..., description="Model calls answered by the LLM response cache")
+    p50_latency_ms: float
+    p95_latency_ms: float
+    p50_total_tokens: float
+    p95_total_tokens: float
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    tool_calls: int
+    cost_usd: float
+
+
+class LlmUsageTotalsDTO(BaseModel):
+    """
+    Tokens and cost spent on one check or regulation, per stage.
+
+    Only agent rows are counted, as they already include their model calls.
+    """
+
+    stage: str
+    runs: int
+    latency_ms: float = Field(..., description="Total wall time of the runs")
+    prompt_tokens: int
+    completion_tokens: int
+    cached_tokens: int
+    tool_calls: int
+    cost_usd: float
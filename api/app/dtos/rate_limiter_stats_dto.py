@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field, computed_field
+
+
+class RateLimiterStatsDTO(BaseModel):
+    """
+    Counters of the process-wide OpenAI rate limiter.
+    """
+
+    queue_depth: int = Field(..., description="Requests currently waiting for capacity")
+    requests: int = Field(..., description="Requests admitted since startup")
+    rate_limited: int = Field(..., description="Responses with status 429 since startup")
+    total_wait_seconds: float = Field(..., description="Total time requests spent waiting")
+    max_wait_seconds: float = Field(..., description="Longest time a single request waited")
+    requests_available: float = Field(..., description="Request capacity currently in the bucket")
+    tokens_available: float = Field(..., description="Token capacity currently in the bucket")
+
+    @computed_field
+    @property
+    def avg_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.requests if self.requests else 0.0
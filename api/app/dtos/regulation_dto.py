@@ -2,6 +2,7 @@ from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict
 
+from app.database.schemas.enums.extraction_status import ExtractionStatus
 from app.dtos.rou_dto import RouDto
 
 
@@ -24,4 +25,33 @@ class RegulationDTO(RegulationCreateDTO):
     id: int
     created_at: datetime
     updated_at: datetime
+    extraction_status: ExtractionStatus
+    chunks_total: int
+    chunks_done: int
+    chunks_failed: int
     rous: list[RouDto] | None
+
+
+class RegulationProgressUpdateDTO(BaseModel):
+    """
+    DTO for updating the extraction progress of a Regulation
+    """
+
+    extraction_status: ExtractionStatus | None = None
+    chunks_total: int | None = None
+    chunks_done: int | None = None
+    chunks_failed: int | None = None
+
+
+class RegulationProgressDTO(BaseModel):
+    """
+    Extraction progress of a Regulation, without its ROUs
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    extraction_status: ExtractionStatus
+    chunks_total: int
+    chunks_done: int
+    chunks_failed: int
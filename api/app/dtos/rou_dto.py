@@ -36,6 +36,17 @@ class RouDto(BaseModel):
     created_at: datetime = Field(..., description="The creation date of the ROU")
 
 
+class RouSearchHitDto(RouDto):
+    """
+    ROU returned by a search, in rank order.
+    """
+
+    distance: float | None = Field(
+        None,
+        description="Embedding distance to the query, smaller is closer; None if only matched by keywords",
+    )
+
+
 class HumanRouDto(BaseModel):
     """
     DTO for human-created ROU.
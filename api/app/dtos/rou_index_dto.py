@@ -0,0 +1,123 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.database.schemas.enums.rou_index_version_status import RouIndexVersionStatus
+
+
+class RouIndexReconcileResultDTO(BaseModel):
+    """
+    Outcome of diffing the ROUs in Postgres against the vectors in ChromaDB.
+    """
+
+    rous: int = Field(..., description="ROUs in Postgres")
+    vectors: int = Field(..., description="Vectors in ChromaDB before reconciling")
+    orphans: int = Field(..., description="Vectors whose ROU no longer exists")
+    orphans_purged: int = Field(0, description="Orphaned vectors deleted")
+    missing: int = Field(..., description="ROUs without a vector")
+    missing_indexed: int = Field(0, description="Missing vectors embedded and written")
+    compacted: bool = Field(False, description="Whether the collection was rebuilt afterwards")
+
+
+class EmbeddingThroughputDTO(BaseModel):
+    """
+    Speed and retrieval quality of one embedding model on a sample of ROUs.
+    """
+
+    model: str = Field(..., description="Embedding model")
+    embeddings_per_second: float = Field(..., description="ROU texts embedded per second")
+    self_hit_rate: float = Field(
+        ..., description="Share of ROU descriptions whose own ROU is among the top k hits"
+    )
+
+
+class EmbeddingComparisonDTO(BaseModel):
+    """
+    Outcome of searching a sample of ROUs with two embedding models.
+    """
+
+    sample_size: int = Field(..., description="ROUs embedded and searched")
+    k: int = Field(..., description="Hits compared per query")
+    baseline: EmbeddingThroughputDTO
+    candidate: EmbeddingThroughputDTO
+    agreement: float = Field(
+        ..., description="Mean share of the baseline's top k hits the candidate also returns"
+    )
+
+
+class RouIndexVersionDTO(BaseModel):
+    """
+    A version of the ROU vector index and its build progress.
+    """
+
+    id: int
+    backend: str
+    provider: str
+    openai_model: str
+    openai_dimensions: Optional[int]
+    model: str
+    status: RouIndexVersionStatus
+    last_rou_id: int = Field(..., description="ROUs up to this id are embedded")
+    embedded: int = Field(..., description="ROUs embedded by builds so far, repeats included")
+    catch_up_after: Optional[datetime] = Field(
+        None, description="Activated, but not caught up with writes to the previous version yet"
+    )
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RouIndexRecallDTO(BaseModel):
+    """
+    Retrieval quality and latency of one index version on a sample of ROUs.
+    """
+
+    version_id: int
+    model: str
+    recall_at_k: float = Field(
+        ..., description="Share of ROU descriptions whose own ROU is among the top k hits"
+    )
+    p50_latency_ms: float = Field(..., description="Median query latency, embedding included")
+
+
+class RouIndexRecallExampleDTO(BaseModel):
+    """
+    A sampled ROU that one index finds by its description and the other does not.
+    """
+
+    rou_id: int
+    query: str
+    active_rank: Optional[int] = Field(..., description="1-based rank in the active index")
+    candidate_rank: Optional[int] = Field(..., description="1-based rank in the candidate index")
+
+
+class RouIndexRecallReportDTO(BaseModel):
+    """
+    Side-by-side comparison of the active index and a candidate version.
+    """
+
+    sample_size: int
+    k: int
+    active: RouIndexRecallDTO
+    candidate: RouIndexRecallDTO
+    overlap: float = Field(..., description="Mean share of the active top k the candidate also returns")
+    examples: List[RouIndexRecallExampleDTO] = Field(
+        default_factory=list, description="Queries where only one index finds the ROU itself"
+    )
+
+
+class RouIndexSwitchResultDTO(BaseModel):
+    """
+    Outcome of activating an index version.
+    """
+
+    version: RouIndexVersionDTO
+    before_switch: Optional[RouIndexReconcileResultDTO] = Field(
+        ..., description="Catch-up of the version with Postgres before activating it; "
+        "None when resuming an interrupted switch"
+    )
+    after_switch: RouIndexReconcileResultDTO = Field(
+        ..., description="Catch-up with writes made by processes still on the old version"
+    )
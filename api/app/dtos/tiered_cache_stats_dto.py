@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field, computed_field
+
+from app.dtos.cache_stats_dto import CacheStatsDTO
+
+
+class TieredCacheStatsDTO(BaseModel):
+    """
+    Counters of a cache with an in-memory tier in front of an optional disk tier.
+
+    Every lookup goes to the memory tier first; only its misses reach the disk tier.
+    """
+
+    memory: CacheStatsDTO = Field(..., description="In-memory LRU tier")
+    disk: CacheStatsDTO | None = Field(None, description="On-disk tier, if enabled")
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.memory.hits + self.memory.misses
+        hits = self.memory.hits + (self.disk.hits if self.disk else 0)
+        return hits / lookups if lookups else 0.0
@@ -0,0 +1,33 @@
+"""
+Local OpenAI-compatible server.
+
+Usage:
+    uv run python -m app.fake_openai [--mode stub|record|replay] [--port 8100]
+
+Point the API and workers at it with `OPENAI__BASE_URL=http://127.0.0.1:8100/v1`.
+Settings live under `fake_openai` in the app config.
+"""
+
+import argparse
+
+import uvicorn
+
+from app.config.app_config import get_app_config
+from app.fake_openai.server import create_app
+
+
+def main() -> None:
+    config = get_app_config().fake_openai
+    parser = argparse.ArgumentParser(description="Run the local fake OpenAI server.")
+    parser.add_argument("--mode", choices=["stub", "record", "replay"], default=config.mode)
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    args = parser.parse_args()
+
+    config = config.model_copy(update={"mode": args.mode})
+    print(f"Fake OpenAI server ({config.mode}) on http://{args.host}:{args.port}/v1")
+    uvicorn.run(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
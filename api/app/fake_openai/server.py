@@ -0,0 +1,160 @@
+import asyncio
+from contextlib import asynccontextmanager
+import json
+import math
+from pathlib import Path
+import random
+from typing import Any, Callable
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import httpx
+
+from app.config.models.fake_openai_config import FakeOpenAIConfig
+from app.fake_openai.stubs import stub_chat_completion, stub_embeddings, to_stream_chunks
+from app.services.cache.disk_cache import content_hash
+
+# request fields that do not change the response content
+_STREAM_FIELDS = ("stream", "stream_options")
+
+
+class FixtureStore:
+    """Recorded responses on disk, one JSON file per request."""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    @staticmethod
+    def key(endpoint: str, request: dict[str, Any]) -> str:
+        body = {k: v for k, v in request.items() if k not in _STREAM_FIELDS}
+        return content_hash(f"{endpoint}\0{json.dumps(body, sort_keys=True)}")
+
+    def _path(self, endpoint: str, request: dict[str, Any]) -> Path:
+        folder = endpoint.strip("/").replace("/", "_")
+        return self.directory / folder / f"{self.key(endpoint, request)}.json"
+
+    def load(self, endpoint: str, request: dict[str, Any]) -> dict[str, Any] | None:
+        path = self._path(endpoint, request)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text())["response"]
+
+    def save(self, endpoint: str, request: dict[str, Any], response: dict[str, Any]) -> None:
+        path = self._path(endpoint, request)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # keep the request next to the response so fixtures can be reviewed in diffs
+        path.write_text(json.dumps({"request": request, "response": response}, indent=2))
+
+
+def _error(status_code: int, message: str, error_type: str) -> JSONResponse:
+    headers = {"retry-after": "1"} if status_code == 429 else None
+    return JSONResponse(
+        {"error": {"message": message, "type": error_type, "param": None, "code": None}},
+        status_code=status_code,
+        headers=headers,
+    )
+
+
+def _latency_seconds(config: FakeOpenAIConfig) -> float:
+    mean, spread = config.latency_mean_ms, config.latency_spread_ms
+    match config.latency_distribution:
+        case "fixed":
+            latency = mean
+        case "uniform":
+            latency = random.uniform(mean - spread, mean + spread)
+        case "lognormal" if mean > 0:
+            # parameters of the underlying normal for the configured mean and stddev
+            sigma = math.sqrt(math.log(1 + (spread / mean) ** 2))
+            latency = random.lognormvariate(math.log(mean) - sigma**2 / 2, sigma)
+        case _:
+            latency = 0
+    return max(latency, 0) / 1000
+
+
+def _stream(completion: dict[str, Any]) -> StreamingResponse:
+    def events():
+        for chunk in to_stream_chunks(completion):
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def create_app(config: FakeOpenAIConfig) -> FastAPI:
+    """
+    OpenAI-compatible server for local runs and load tests.
+
+    Serves `/v1/chat/completions` and `/v1/embeddings` in one of three modes:
+    `stub` synthesizes responses from the request, `record` proxies to the real
+    API and stores each response as a fixture, and `replay` serves the stored
+    fixtures. Latency and errors are simulated in `stub` and `replay` mode only.
+    """
+    fixtures = FixtureStore(config.fixtures_dir)
+    upstream = httpx.AsyncClient(base_url=config.upstream_url, timeout=httpx.Timeout(600, connect=5))
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI):
+        yield
+        await upstream.aclose()
+
+    app = FastAPI(title="Fake OpenAI", lifespan=lifespan)
+
+    async def respond(
+        endpoint: str,
+        http_request: Request,
+        stub: Callable[[dict[str, Any]], dict[str, Any]],
+    ) -> Response:
+        try:
+            request = await http_request.json()
+        except json.JSONDecodeError:
+            return _error(400, "Request body is not valid JSON", "invalid_request_error")
+        stream = bool(request.get("stream"))
+
+        if config.mode == "record":
+            # fixtures are always recorded unstreamed and re-chunked on the way out
+            upstream_response = await upstream.post(
+                endpoint,
+                json={k: v for k, v in request.items() if k not in _STREAM_FIELDS},
+                headers={"authorization": http_request.headers.get("authorization", "")},
+            )
+            if upstream_response.is_error:
+                return Response(
+                    upstream_response.content,
+                    status_code=upstream_response.status_code,
+                    media_type="application/json",
+                )
+            response = upstream_response.json()
+            fixtures.save(endpoint, request, response)
+        else:
+            await asyncio.sleep(_latency_seconds(config))
+            if config.error_status_codes and random.random() < config.error_rate:
+                status_code = random.choice(config.error_status_codes)
+                return _error(status_code, f"Injected {status_code} error", "fake_openai_error")
+
+            response = fixtures.load(endpoint, request) if config.mode == "replay" else None
+            if response is None:
+                if config.mode == "replay" and not config.replay_fallback_to_stub:
+                    return _error(
+                        404,
+                        f"No fixture for this request (key {fixtures.key(endpoint, request)})",
+                        "fixture_not_found",
+                    )
+                response = stub(request)
+
+        if stream and endpoint == "/chat/completions":
+            return _stream(response)
+        return JSONResponse(response)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(http_request: Request):
+        return await respond("/chat/completions", http_request, stub_chat_completion)
+
+    @app.post("/v1/embeddings")
+    async def embeddings(http_request: Request):
+        return await respond(
+            "/embeddings",
+            http_request,
+            lambda request: stub_embeddings(request, config.embedding_dimensions),
+        )
+
+    return app
@@ -0,0 +1,220 @@
+import base64
+import hashlib
+import json
+import math
+import random
+import struct
+import time
+from typing import Any
+import uuid
+
+from app.clients.openai_rate_limiter import estimate_tokens
+
+
+def _seed(*parts: Any) -> int:
+    digest = hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8"))
+    return int.from_bytes(digest.digest()[:8], "big")
+
+
+def stub_from_schema(schema: dict[str, Any], seed: int = 0) -> Any:
+    """
+    Build a value that validates against a JSON schema.
+
+    Covers the subset pydantic and LangChain emit for tools and structured
+    output: `$ref`/`$defs`, `anyOf`, `enum`, objects, arrays and scalars.
+    Values are deterministic for a given schema and seed.
+    """
+    return _stub(schema, schema.get("$defs", {}) | schema.get("definitions", {}), seed, "")
+
+
+def _stub(schema: dict[str, Any], defs: dict[str, Any], seed: int, path: str) -> Any:
+    if "$ref" in schema:
+        return _stub(defs[schema["$ref"].rsplit("/", 1)[-1]], defs, seed, path)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return schema["enum"][_seed(seed, path) % len(schema["enum"])]
+    if "default" in schema and schema["default"] is not None:
+        return schema["default"]
+
+    for key in ("anyOf", "oneOf", "allOf"):
+        if schema.get(key):
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return _stub(options[0] if options else schema[key][0], defs, seed, path)
+
+    schema_type = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(schema_type, list):
+        schema_type = next((t for t in schema_type if t != "null"), "null")
+
+    if schema_type == "object":
+        return {
+            name: _stub(prop, defs, seed, f"{path}.{name}")
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if schema_type == "array":
+        count = max(schema.get("minItems", 1), 1)
+        return [_stub(schema.get("items", {}), defs, seed, f"{path}[{i}]") for i in range(count)]
+    if schema_type == "integer":
+        return schema.get("minimum", _seed(seed, path) % 10)
+    if schema_type == "number":
+        return float(schema.get("minimum", (_seed(seed, path) % 100) / 100))
+    if schema_type == "boolean":
+        return _seed(seed, path) % 2 == 0
+    if schema_type == "null":
+        return None
+    return f"stub{path or '-value'}-{_seed(seed, path) % 10_000:04d}"
+
+
+def _usage(request: dict[str, Any], completion: str) -> dict[str, int]:
+    prompt_tokens = estimate_tokens(json.dumps(request.get("messages", [])))
+    completion_tokens = estimate_tokens(completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def _forced_tool(request: dict[str, Any]) -> dict[str, Any] | None:
+    tools = [tool["function"] for tool in request.get("tools", []) if tool.get("type") == "function"]
+    if not tools:
+        return None
+
+    tool_choice = request.get("tool_choice", "auto")
+    if tool_choice == "none":
+        return None
+    if isinstance(tool_choice, dict):
+        name = tool_choice.get("function", {}).get("name")
+        return next((tool for tool in tools if tool["name"] == name), tools[0])
+
+    # let an agent loop finish: answer once the last tool call has been answered
+    messages = request.get("messages", [])
+    if tool_choice != "required" and messages and messages[-1].get("role") == "tool":
+        return None
+    return tools[0]
+
+
+def stub_chat_completion(request: dict[str, Any]) -> dict[str, Any]:
+    """
+    Synthesize a `/chat/completions` response.
+
+    A `json_schema` response format is answered with JSON content matching the
+    schema; otherwise, if tools are offered, the first (or forced) tool is called
+    with arguments built from its parameters schema. Plain text is returned once
+    a tool result is the last message.
+    """
+    seed = _seed(request.get("messages", []))
+    message: dict[str, Any] = {"role": "assistant", "content": None, "refusal": None}
+    finish_reason = "stop"
+
+    response_format = request.get("response_format") or {}
+    tool = _forced_tool(request)
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"].get("schema", {})
+        message["content"] = json.dumps(stub_from_schema(schema, seed))
+    elif tool is not None:
+        arguments = json.dumps(stub_from_schema(tool.get("parameters", {}), seed))
+        message["tool_calls"] = [
+            {
+                "id": f"call_{_seed(seed, tool['name']):016x}",
+                "type": "function",
+                "function": {"name": tool["name"], "arguments": arguments},
+            }
+        ]
+        finish_reason = "tool_calls"
+    elif response_format.get("type") == "json_object":
+        message["content"] = "{}"
+    else:
+        message["content"] = f"Stub response {seed % 10_000:04d}."
+
+    completion = message["content"] or json.dumps(message.get("tool_calls"))
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "stub"),
+        "choices": [
+            {"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}
+        ],
+        "usage": _usage(request, completion),
+    }
+
+
+def _embed(text: str, dimensions: int) -> list[float]:
+    rng = random.Random(_seed(text))
+    vector = [rng.gauss(0, 1) for _ in range(dimensions)]
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _encode(vector: list[float], encoding_format: str | None) -> list[float] | str:
+    # the openai SDK asks for base64 (little-endian float32) unless told otherwise
+    if encoding_format == "base64":
+        return base64.b64encode(struct.pack(f"<{len(vector)}f", *vector)).decode("ascii")
+    return vector
+
+
+def stub_embeddings(request: dict[str, Any], default_dimensions: int) -> dict[str, Any]:
+    """
+    Synthesize an `/embeddings` response.
+
+    Vectors are unit-length and derived from a hash of the input, so equal texts
+    embed equally. Token-id inputs are embedded by their JSON form.
+    """
+    inputs = request.get("input", [])
+    if isinstance(inputs, str) or (inputs and isinstance(inputs[0], int)):
+        inputs = [inputs]
+    dimensions = request.get("dimensions") or default_dimensions
+
+    data = [
+        {
+            "object": "embedding",
+            "index": i,
+            "embedding": _encode(
+                _embed(text if isinstance(text, str) else json.dumps(text), dimensions),
+                request.get("encoding_format"),
+            ),
+        }
+        for i, text in enumerate(inputs)
+    ]
+    prompt_tokens = sum(estimate_tokens(json.dumps(text)) for text in inputs)
+    return {
+        "object": "list",
+        "data": data,
+        "model": request.get("model", "stub"),
+        "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens},
+    }
+
+
+def to_stream_chunks(completion: dict[str, Any]) -> list[dict[str, Any]]:
+    """Split a chat completion into the chunks of a `stream=true` response."""
+    base = {key: completion[key] for key in ("id", "created", "model")}
+    chunks = []
+    for choice in completion["choices"]:
+        delta = {key: value for key, value in choice["message"].items() if value is not None}
+        if "tool_calls" in delta:
+            delta["tool_calls"] = [
+                {"index": i, **tool_call} for i, tool_call in enumerate(delta["tool_calls"])
+            ]
+        chunks.append(
+            {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {"index": choice["index"], "delta": delta, "finish_reason": None}
+                ],
+            }
+        )
+        chunks.append(
+            {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {"index": choice["index"], "delta": {}, "finish_reason": choice["finish_reason"]}
+                ],
+            }
+        )
+    chunks.append(
+        {**base, "object": "chat.completion.chunk", "choices": [], "usage": completion.get("usage")}
+    )
+    return chunks
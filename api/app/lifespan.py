@@ -0,0 +1,63 @@
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+
+from app.clients.chromadb_client import warm_up_rou_collection
+from app.clients.openai_client import get_openai_http_async_client, get_openai_http_client
+from app.clients.rou_vector_store import get_active_rou_vector_store, get_rou_vector_store
+from app.config.app_config import get_app_config
+from app.services.feature.feat_eval.feat_eval_agent import get_feat_eval_graph
+from app.services.feature.feat_eval.learning_agent import get_learning_graph
+from app.services.feature.feat_eval.term_mapping_agent import get_term_mapping_graph
+from app.services.regulation.pdf_reader import get_pdf_parse_limiter
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import (
+    get_map_reduce_rou_extractor,
+)
+from app.services.regulation.rou_lexical_index import get_rou_lexical_index
+from app.services.usage.llm_usage_recorder import get_llm_usage_recorder
+
+
+def build_singletons() -> None:
+    """
+    Build the process-wide compiled graphs, model clients and ChromaDB collection.
+
+    They are cached on first use anyway; building them at startup keeps the
+    cost out of the first requests. Request-scoped state (DB sessions, prompts)
+    is passed to them at call time.
+    """
+    get_map_reduce_rou_extractor()
+    get_feat_eval_graph()
+    get_term_mapping_graph()
+    get_learning_graph()
+    rou_vector_store = get_rou_vector_store()
+
+    app_config = get_app_config()
+    if app_config.rou_index.backend == "chroma" and app_config.chroma.warm_up:
+        warm_up_rou_collection(rou_vector_store.embedding_provider.model)
+
+
+async def close_singletons() -> None:
+    get_rou_lexical_index().stop()
+    get_active_rou_vector_store().close()
+    await get_llm_usage_recorder().stop()
+    await get_openai_http_async_client().aclose()
+    get_openai_http_client().close()
+
+
+@asynccontextmanager
+async def singletons_context():
+    build_singletons()
+    get_pdf_parse_limiter().start()
+    get_llm_usage_recorder().start()
+    get_rou_lexical_index().start()
+    get_active_rou_vector_store().start()
+    try:
+        yield
+    finally:
+        await close_singletons()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with singletons_context():
+        yield
@@ -2,11 +2,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config.app_config import get_app_config
+from app.lifespan import lifespan
 from app.routers.regulation_router import router as regulation_router
 from app.routers.feature_router import router as feature_router
 from app.routers.terminology_router import router as terminology_router
+from app.routers.metrics_router import router as metrics_router
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 allow_origins = get_app_config().core.allow_origins
 
 # Add CORS middleware to allow frontend connections
@@ -21,3 +23,4 @@ app.add_middleware(
 app.include_router(regulation_router)
 app.include_router(feature_router)
 app.include_router(terminology_router)
+app.include_router(metrics_router)
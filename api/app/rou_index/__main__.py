@@ -0,0 +1,196 @@
+"""
+Maintenance commands for the ROU vector index.
+
+Usage:
+    uv run python -m app.rou_index backfill-metadata [--batch-size 1000]
+    uv run python -m app.rou_index reconcile [--dry-run] [--index-missing] [--compact]
+    uv run python -m app.rou_index reindex [--batch-size 1000]
+    uv run python -m app.rou_index compare-embeddings [--sample-size 1000] [--k 10]
+    uv run python -m app.rou_index migrate list
+    uv run python -m app.rou_index migrate start --provider local
+    uv run python -m app.rou_index migrate build VERSION [--max-per-second 200]
+    uv run python -m app.rou_index migrate report VERSION [--sample-size 200] [--k 10]
+    uv run python -m app.rou_index migrate switch VERSION
+    uv run python -m app.rou_index migrate drop VERSION
+
+Run against the same database and ChromaDB index as the API; commands work
+on the active index version. `reconcile` is safe to schedule; with
+`--compact`, stop the API and workers first.
+
+To move to other embedding settings without downtime: `migrate start`
+registers a new index version, `migrate build` fills it next to the active
+one (interrupt and rerun it at will, it resumes from its checkpoint),
+`migrate report` compares recall of both, and `migrate switch` activates it
+for all processes. If `migrate switch` is interrupted after activating the
+version, run it again: it resumes with the catch-up of the writes processes
+made to the old version meanwhile (`migrate list` shows `catch_up_after`
+while that is pending). Set the same `embedding` settings in the config
+afterwards; the old version stays available to `switch` back to until it
+is dropped.
+"""
+
+import argparse
+import asyncio
+
+from app.clients.embedding_provider import create_embedding_provider
+from app.clients.rou_vector_store import get_active_rou_vector_store
+from app.config.app_config import get_app_config
+from app.services.regulation.rou_index_migration_service import (
+    rou_index_migration_service_context,
+)
+from app.services.regulation.rou_index_service import rou_index_service_context
+from app.services.usage.llm_usage_recorder import get_llm_usage_recorder
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Maintain the ROU vector index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser(
+        "backfill-metadata",
+        help="Write jurisdiction, source_id and type metadata onto existing vectors.",
+    )
+    backfill.add_argument("--batch-size", type=int, default=1000)
+
+    reconcile = commands.add_parser(
+        "reconcile",
+        help="Purge vectors whose ROU was deleted and report ROUs without a vector.",
+    )
+    reconcile.add_argument("--dry-run", action="store_true", help="Only report.")
+    reconcile.add_argument(
+        "--index-missing", action="store_true", help="Embed and write ROUs without a vector."
+    )
+    reconcile.add_argument(
+        "--compact", action="store_true", help="Rebuild the collection without deleted entries."
+    )
+
+    reindex = commands.add_parser(
+        "reindex",
+        help="Embed every ROU again into the active index.",
+    )
+    reindex.add_argument("--batch-size", type=int, default=1000)
+
+    compare = commands.add_parser(
+        "compare-embeddings",
+        help="Report throughput and top-k agreement of the OpenAI and local embedding models.",
+    )
+    compare.add_argument("--sample-size", type=int, default=1000)
+    compare.add_argument("--k", type=int, default=10)
+    compare.add_argument("--batch-size", type=int, default=100)
+
+    migrate = commands.add_parser(
+        "migrate", help="Build a ROU index with other embedding settings and switch to it."
+    )
+    steps = migrate.add_subparsers(dest="step", required=True)
+    steps.add_parser("list", help="Show the index versions.")
+
+    start = steps.add_parser("start", help="Register a new index version.")
+    start.add_argument("--provider", choices=["openai", "local"], required=True)
+    start.add_argument("--openai-model", help="Defaults to the configured one.")
+    start.add_argument("--openai-dimensions", type=int)
+
+    build = steps.add_parser("build", help="Embed the ROUs into a version, from its checkpoint.")
+    build.add_argument("version", type=int)
+    build.add_argument("--batch-size", type=int, default=1000)
+    build.add_argument("--max-per-second", type=float, help="Embeddings per second at most.")
+
+    report = steps.add_parser("report", help="Compare recall of a version and the active one.")
+    report.add_argument("version", type=int)
+    report.add_argument("--sample-size", type=int, default=200)
+    report.add_argument("--k", type=int, default=10)
+
+    switch = steps.add_parser("switch", help="Activate a version for all processes.")
+    switch.add_argument("version", type=int)
+
+    drop = steps.add_parser("drop", help="Delete the vectors of an inactive version.")
+    drop.add_argument("version", type=int)
+    return parser.parse_args()
+
+
+async def migrate(args: argparse.Namespace) -> None:
+    async with rou_index_migration_service_context() as rou_index_migration_service:
+        match args.step:
+            case "list":
+                for version in await rou_index_migration_service.list_versions():
+                    print(version.model_dump_json())
+            case "start":
+                embedding_config = get_app_config().embedding
+                update = {"provider": args.provider, "openai_dimensions": args.openai_dimensions}
+                if args.openai_model:
+                    update["openai_model"] = args.openai_model
+                version = await rou_index_migration_service.start(
+                    embedding_config.model_copy(update=update)
+                )
+                print(version.model_dump_json(indent=2))
+            case "build":
+                version = await rou_index_migration_service.build(
+                    args.version, batch_size=args.batch_size, max_per_second=args.max_per_second
+                )
+                print(version.model_dump_json(indent=2))
+            case "report":
+                result = await rou_index_migration_service.report(
+                    args.version, sample_size=args.sample_size, k=args.k
+                )
+                print(result.model_dump_json(indent=2))
+            case "switch":
+                result = await rou_index_migration_service.switch(args.version)
+                print(result.model_dump_json(indent=2))
+            case "drop":
+                version = await rou_index_migration_service.drop(args.version)
+                print(version.model_dump_json(indent=2))
+
+
+async def maintain(args: argparse.Namespace) -> None:
+    async with rou_index_service_context() as rou_index_service:
+        match args.command:
+            case "backfill-metadata":
+                processed = await rou_index_service.backfill_metadata(batch_size=args.batch_size)
+                print(f"Done: {processed} ROUs")
+            case "reconcile":
+                result = await rou_index_service.reconcile(
+                    dry_run=args.dry_run, index_missing=args.index_missing, compact=args.compact
+                )
+                print(result.model_dump_json(indent=2))
+            case "reindex":
+                processed = await rou_index_service.reindex(batch_size=args.batch_size)
+                print(f"Done: {processed} ROUs")
+            case "compare-embeddings":
+                embedding_config = get_app_config().embedding
+                baseline = create_embedding_provider(
+                    embedding_config.model_copy(update={"provider": "openai"})
+                )
+                candidate = create_embedding_provider(
+                    embedding_config.model_copy(update={"provider": "local"})
+                )
+                try:
+                    result = await rou_index_service.compare_embeddings(
+                        baseline,
+                        candidate,
+                        sample_size=args.sample_size,
+                        k=args.k,
+                        batch_size=args.batch_size,
+                    )
+                finally:
+                    candidate.close()
+                print(result.model_dump_json(indent=2))
+
+
+async def main() -> None:
+    args = parse_args()
+    active_rou_vector_store = get_active_rou_vector_store()
+    await active_rou_vector_store.refresh()
+    # embedding calls are accounted like those of the API and workers
+    llm_usage_recorder = get_llm_usage_recorder()
+    llm_usage_recorder.start()
+    try:
+        if args.command == "migrate":
+            await migrate(args)
+        else:
+            await maintain(args)
+    finally:
+        active_rou_vector_store.close()
+        await llm_usage_recorder.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,5 +1,5 @@
 from typing import List
-from fastapi import APIRouter, BackgroundTasks, UploadFile
+from fastapi import APIRouter, UploadFile
 
 from app.services.feature.feat_eval.feature_eval_service import FeatureEvalServiceDep
 from app.dtos.reconcile_check_result_request import ReconcileCheckResultRequest
@@ -40,14 +40,13 @@ async def upload_feature(
     feature: FeatureCreateDTO,
     feature_service: FeatureServiceDep,
     feature_eval_service: FeatureEvalServiceDep,
-    background_tasks: BackgroundTasks,
 ):
     """
     Create a new feature.
     """
     inserted_feature = await feature_service.create_feature(feature)
 
-    background_tasks.add_task(feature_eval_service.trigger_evals, [inserted_feature.id])
+    await feature_eval_service.trigger_evals([inserted_feature.id])
 
     return inserted_feature
 
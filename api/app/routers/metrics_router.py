@@ -0,0 +1,77 @@
+from fastapi import APIRouter
+
+from app.clients.openai_client import get_openai_connection_stats, get_openai_rate_limiter
+from app.dtos.cache_stats_dto import CacheStatsDTO
+from app.dtos.connection_pool_stats_dto import ConnectionPoolStatsDTO
+from app.dtos.llm_cache_stats_dto import LlmCacheStatsDTO
+from app.dtos.llm_usage_dto import LlmUsageStageSummaryDTO, LlmUsageTotalsDTO
+from app.dtos.rate_limiter_stats_dto import RateLimiterStatsDTO
+from app.dtos.tiered_cache_stats_dto import TieredCacheStatsDTO
+from app.services.cache.llm_response_cache import get_llm_response_cache
+from app.services.cache.query_embedding_cache import get_query_embedding_cache
+from app.services.usage.llm_usage_service import LlmUsageServiceDep
+
+# Create the router
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/openai-rate-limiter", response_model=RateLimiterStatsDTO)
+async def get_openai_rate_limiter_stats():
+    """
+    Get queue depth, wait times and 429 counters of the shared OpenAI rate limiter.
+    """
+    return get_openai_rate_limiter().stats()
+
+
+@router.get("/openai-connections", response_model=ConnectionPoolStatsDTO)
+async def get_openai_connection_pool_stats():
+    """
+    Get connection reuse counters of the shared OpenAI HTTP clients.
+    """
+    return get_openai_connection_stats().stats()
+
+
+@router.get("/llm-cache", response_model=LlmCacheStatsDTO)
+async def get_llm_cache_stats():
+    """
+    Get hit/miss counters of the LLM response cache.
+    """
+    llm_response_cache = get_llm_response_cache()
+    return llm_response_cache.stats() if llm_response_cache else LlmCacheStatsDTO(memory=CacheStatsDTO())
+
+
+@router.get("/query-embedding-cache", response_model=TieredCacheStatsDTO)
+async def get_query_embedding_cache_stats():
+    """
+    Get hit/miss counters of the ROU search query embedding cache.
+    """
+    query_embedding_cache = get_query_embedding_cache()
+    return (
+        query_embedding_cache.stats()
+        if query_embedding_cache
+        else TieredCacheStatsDTO(memory=CacheStatsDTO())
+    )
+
+
+@router.get("/llm-usage", response_model=list[LlmUsageStageSummaryDTO])
+async def get_llm_usage(llm_usage_service: LlmUsageServiceDep, since_hours: float | None = None):
+    """
+    Get p50/p95 latency and tokens per stage, for agent runs and single model calls.
+    """
+    return await llm_usage_service.get_stage_summaries(since_hours)
+
+
+@router.get("/llm-usage/checks/{check_id}", response_model=list[LlmUsageTotalsDTO])
+async def get_check_llm_usage(check_id: int, llm_usage_service: LlmUsageServiceDep):
+    """
+    Get tokens and cost spent on a check, per stage.
+    """
+    return await llm_usage_service.get_check_usage(check_id)
+
+
+@router.get("/llm-usage/regulations/{regulation_id}", response_model=list[LlmUsageTotalsDTO])
+async def get_regulation_llm_usage(regulation_id: int, llm_usage_service: LlmUsageServiceDep):
+    """
+    Get tokens and cost spent on extracting a regulation, per stage.
+    """
+    return await llm_usage_service.get_regulation_usage(regulation_id)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, BackgroundTasks, UploadFile
+from fastapi import APIRouter, UploadFile
 
+from app.dtos.cache_stats_dto import CacheStatsDTO
 from app.dtos.feature_dto import FeatureDTO
-from app.dtos.regulation_dto import RegulationCreateDTO, RegulationDTO
-from app.services.regulation.rou_service import RouServiceDep, SupabaseStorageServiceDep
+from app.dtos.regulation_dto import RegulationCreateDTO, RegulationDTO, RegulationProgressDTO
+from app.services.job.job_service import JobServiceDep
+from app.services.regulation.rou_service import SupabaseStorageServiceDep
 from app.services.regulation.regulation_service import RegulationServiceDep
+from app.services.regulation.pdf_reader import get_pdf_text_cache
+from app.services.regulation.rou_extraction.rou_extract_model import get_rou_chunk_cache
 
 # Create the router
 router = APIRouter(prefix="/regulations", tags=["Regulations"])
@@ -18,16 +22,15 @@ async def upload_regulation_file(file: UploadFile, supabase_storage_service: Sup
 async def upload_regulation(
     regulation: RegulationCreateDTO,
     regulation_service: RegulationServiceDep,
-    background_task: BackgroundTasks,
-    rou_service: RouServiceDep,
+    job_service: JobServiceDep,
 ):
     """
     Create a new regulation.
     """
     uploaded_regulation = await regulation_service.upload_regulation(regulation)
 
-    # Non-blocking rous extraction task
-    background_task.add_task(rou_service.extract_from_regulation, regulation=uploaded_regulation)
+    # ROUs are extracted by a worker
+    await job_service.enqueue_regulation_extraction(uploaded_regulation.id)
 
     return uploaded_regulation
 
@@ -40,6 +43,24 @@ async def get_regulations(regulation_service: RegulationServiceDep):
     return await regulation_service.get_all_regulations()
 
 
+@router.get("/text-cache/stats", response_model=CacheStatsDTO)
+async def get_text_cache_stats():
+    """
+    Get hit/miss counters of the extracted regulation text cache.
+    """
+    pdf_text_cache = get_pdf_text_cache()
+    return pdf_text_cache.stats() if pdf_text_cache else CacheStatsDTO()
+
+
+@router.get("/extraction-cache/stats", response_model=CacheStatsDTO)
+async def get_extraction_cache_stats():
+    """
+    Get hit/miss counters of the per-chunk ROU extraction cache.
+    """
+    rou_chunk_cache = get_rou_chunk_cache()
+    return rou_chunk_cache.stats() if rou_chunk_cache else CacheStatsDTO()
+
+
 @router.get("/{regulation_id}", response_model=RegulationDTO)
 async def get_regulation(regulation_id: int, regulation_service: RegulationServiceDep):
     """
@@ -48,6 +69,14 @@ async def get_regulation(regulation_id: int, regulation_service: RegulationServi
     return await regulation_service.get_regulation_by_id(regulation_id)
 
 
+@router.get("/{regulation_id}/progress", response_model=RegulationProgressDTO)
+async def get_regulation_progress(regulation_id: int, regulation_service: RegulationServiceDep):
+    """
+    Get the ROU extraction progress of a regulation, without loading its ROUs.
+    """
+    return await regulation_service.get_extraction_progress(regulation_id)
+
+
 @router.delete("/{regulation_id}")
 async def delete_regulation(regulation_id: int, regulation_service: RegulationServiceDep):
     """
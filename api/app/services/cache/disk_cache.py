@@ -0,0 +1,165 @@
+import gzip
+import hashlib
+import os
+from pathlib import Path
+import threading
+import time
+
+from app.dtos.cache_stats_dto import CacheStatsDTO
+
+
+def content_hash(data: bytes | str) -> str:
+    """SHA-256 hex digest used as a content-addressed cache key."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class DiskCache:
+    """
+    Content-addressed byte cache on local disk.
+
+    Entries are evicted least-recently-used first once the total size exceeds
+    `max_bytes`, down to `low_watermark` of it so that the directory scan behind an
+    eviction runs once per batch of writes rather than on every write. The access
+    time of an entry is bumped on every hit and used as the LRU clock; the
+    modification time is the write time and is used for the TTL.
+
+    All methods do blocking file IO; call them through `asyncio.to_thread` from
+    coroutines.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int,
+        compress: bool = False,
+        ttl_seconds: float | None = None,
+        low_watermark: float = 0.9,
+    ):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.ttl_seconds = ttl_seconds
+        self.low_watermark_bytes = int(max_bytes * low_watermark)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._evicting = False
+        self._hits = 0
+        self._misses = 0
+        entries = self._entries()
+        self._entry_count = len(entries)
+        self._size_bytes = sum(path.stat().st_size for path in entries)
+
+    def _entries(self) -> list[Path]:
+        return [path for path in self.directory.glob("*/*") if not path.name.endswith(".tmp")]
+
+    def _path(self, key: str, compressed: bool) -> Path:
+        return self.directory / key[:2] / (f"{key}.gz" if compressed else key)
+
+    def _find(self, key: str) -> Path | None:
+        # entries written before `compress` was toggled are still readable
+        for compressed in (self.compress, not self.compress):
+            path = self._path(key, compressed)
+            if path.exists():
+                return path
+        return None
+
+    def _is_expired(self, path: Path) -> bool:
+        if self.ttl_seconds is None:
+            return False
+        return time.time() - path.stat().st_mtime > self.ttl_seconds
+
+    def get(self, key: str) -> bytes | None:
+        path = self._find(key)
+        if path is not None and self._is_expired(path):
+            self.delete(key)
+            path = None
+
+        try:
+            data = path.read_bytes() if path is not None else None
+        except FileNotFoundError:
+            # evicted concurrently
+            data = None
+
+        with self._lock:
+            if data is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except FileNotFoundError:
+            pass
+        return gzip.decompress(data) if path.suffix == ".gz" else data
+
+    def set(self, key: str, value: bytes) -> None:
+        data = gzip.compress(value) if self.compress else value
+        if len(data) > self.max_bytes:
+            return
+
+        self.delete(key)
+        path = self._path(key, self.compress)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._entry_count += 1
+            self._size_bytes += len(data)
+            # a single thread evicts; writers arriving meanwhile don't rescan
+            evict = self._size_bytes > self.max_bytes and not self._evicting
+            self._evicting = self._evicting or evict
+        if evict:
+            try:
+                self._evict()
+            finally:
+                with self._lock:
+                    self._evicting = False
+
+    def delete(self, key: str) -> None:
+        for compressed in (True, False):
+            path = self._path(key, compressed)
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            with self._lock:
+                self._entry_count -= 1
+                self._size_bytes -= size
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self._entries():
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+
+        entries.sort(key=lambda entry: entry[0].st_atime)
+        total = sum(stat.st_size for stat, _ in entries)
+        count = len(entries)
+        for stat, path in entries:
+            if total <= self.low_watermark_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+            count -= 1
+
+        # the scan also picks up entries written or removed by other processes
+        with self._lock:
+            self._entry_count = count
+            self._size_bytes = total
+
+    def stats(self) -> CacheStatsDTO:
+        with self._lock:
+            return CacheStatsDTO(
+                hits=self._hits,
+                misses=self._misses,
+                entries=self._entry_count,
+                size_bytes=self._size_bytes,
+            )
@@ -0,0 +1,132 @@
+from functools import lru_cache
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration, Generation
+from pydantic import BaseModel
+
+from app.config.app_config import get_app_config
+from app.dtos.llm_cache_stats_dto import LlmCacheStatsDTO
+from app.services.cache.disk_cache import DiskCache, content_hash
+from app.services.cache.memory_lru import MemoryLru
+
+# set in the generation info of responses served from the cache
+LLM_CACHE_HIT_KEY = "llm_cache_hit"
+
+
+def _to_serializable(generation: Generation) -> Generation:
+    # structured output attaches the parsed pydantic object, which LangChain cannot
+    # serialize; the OpenAI output parser accepts its dict form as well
+    if not isinstance(generation, ChatGeneration):
+        return generation
+    parsed = generation.message.additional_kwargs.get("parsed")
+    if not isinstance(parsed, BaseModel):
+        return generation
+
+    message = generation.message.model_copy(
+        update={
+            "additional_kwargs": {
+                **generation.message.additional_kwargs,
+                "parsed": parsed.model_dump(mode="json"),
+            }
+        }
+    )
+    return generation.model_copy(update={"message": message})
+
+
+class LlmResponseCache(BaseCache):
+    """
+    Exact-match cache of chat model responses, plugged into LangChain's model cache.
+
+    LangChain calls the cache with the serialized messages as `prompt` and the
+    model configuration as `llm_string`; the latter includes the model name and
+    parameters as well as bound tools and the structured-output schema. A hit is
+    returned without calling the API.
+
+    Lookups go to an in-memory LRU first, then to the optional disk tier; disk
+    hits are promoted to memory.
+    """
+
+    def __init__(
+        self,
+        memory_max_bytes: int,
+        ttl_seconds: float | None = None,
+        disk: DiskCache | None = None,
+    ):
+        self.memory = MemoryLru(memory_max_bytes, ttl_seconds)
+        self.disk = disk
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return content_hash(f"{llm_string}\0{prompt}")
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+
+        data = self.memory.get(key)
+        if data is None and self.disk is not None:
+            data = self.disk.get(key)
+            if data is not None:
+                self.memory.set(key, data)
+
+        if data is None:
+            return None
+
+        generations = loads(data.decode("utf-8"))
+        for generation in generations:
+            # lets usage accounting tell cache hits from API calls; kept off the
+            # message so it does not leak into the prompts of later turns
+            generation.generation_info = {**(generation.generation_info or {}), LLM_CACHE_HIT_KEY: True}
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self._key(prompt, llm_string)
+        data = dumps([_to_serializable(generation) for generation in return_val]).encode("utf-8")
+
+        self.memory.set(key, data)
+        if self.disk is not None:
+            self.disk.set(key, data)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.memory.clear()
+
+    def stats(self) -> LlmCacheStatsDTO:
+        return LlmCacheStatsDTO(
+            memory=self.memory.stats(), disk=self.disk.stats() if self.disk else None
+        )
+
+
+@lru_cache
+def get_llm_response_cache() -> LlmResponseCache | None:
+    """LLM response cache shared by all agents of the process."""
+    config = get_app_config().llm_cache
+    if not config.enabled:
+        return None
+
+    disk = (
+        DiskCache(
+            directory=config.disk_dir,
+            max_bytes=config.disk_max_bytes,
+            compress=True,
+            ttl_seconds=config.ttl_seconds,
+        )
+        if config.disk_enabled
+        else None
+    )
+    return LlmResponseCache(
+        memory_max_bytes=config.memory_max_bytes, ttl_seconds=config.ttl_seconds, disk=disk
+    )
+
+
+def get_agent_llm_cache(agent: str) -> LlmResponseCache | bool:
+    """
+    Value for the `cache` argument of an agent's chat model.
+
+    Returns False (never cache) when caching is disabled or the agent opted out
+    via `llm_cache.disabled_agents`.
+    """
+    cache = get_llm_response_cache()
+    if cache is None or agent in get_app_config().llm_cache.disabled_agents:
+        return False
+    return cache
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+import threading
+import time
+
+from app.dtos.cache_stats_dto import CacheStatsDTO
+
+
+class MemoryLru:
+    """Thread-safe LRU of serialized entries, bounded by their total size."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float | None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds is not None:
+                if time.time() - entry[0] > self.ttl_seconds:
+                    self._pop(key)
+                    entry = None
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.time(), value)
+            self._size_bytes += len(value)
+            while self._size_bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size_bytes -= len(entry[1])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStatsDTO:
+        with self._lock:
+            return CacheStatsDTO(
+                hits=self._hits,
+                misses=self._misses,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+            )
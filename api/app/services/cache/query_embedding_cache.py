@@ -0,0 +1,84 @@
+import asyncio
+from functools import lru_cache
+from typing import List
+
+import numpy as np
+
+from app.config.app_config import get_app_config
+from app.dtos.tiered_cache_stats_dto import TieredCacheStatsDTO
+from app.services.cache.disk_cache import DiskCache, content_hash
+from app.services.cache.memory_lru import MemoryLru
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a search query."""
+    return " ".join(query.lower().split())
+
+
+class QueryEmbeddingCache:
+    """
+    Cache of search query embeddings.
+
+    Queries are keyed by embedding model and normalized text, so "Age verification
+    Utah" and "age  verification utah" share an entry. Vectors are stored as raw
+    float32 bytes, a quarter of the size of their JSON form. Memory hits are served
+    on the event loop; the disk tier is read and written in a thread.
+    """
+
+    def __init__(
+        self,
+        memory_max_bytes: int,
+        ttl_seconds: float | None = None,
+        disk: DiskCache | None = None,
+    ):
+        self.memory = MemoryLru(memory_max_bytes, ttl_seconds)
+        self.disk = disk
+
+    @staticmethod
+    def _key(model: str, query: str) -> str:
+        return content_hash(f"{model}\0{normalize_query(query)}")
+
+    async def get(self, model: str, query: str) -> List[float] | None:
+        key = self._key(model, query)
+
+        data = self.memory.get(key)
+        if data is None and self.disk is not None:
+            data = await asyncio.to_thread(self.disk.get, key)
+            if data is not None:
+                self.memory.set(key, data)
+
+        return np.frombuffer(data, dtype=np.float32).tolist() if data is not None else None
+
+    async def set(self, model: str, query: str, embedding: List[float]) -> None:
+        key = self._key(model, query)
+        data = np.asarray(embedding, dtype=np.float32).tobytes()
+
+        self.memory.set(key, data)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, data)
+
+    def stats(self) -> TieredCacheStatsDTO:
+        return TieredCacheStatsDTO(
+            memory=self.memory.stats(), disk=self.disk.stats() if self.disk else None
+        )
+
+
+@lru_cache
+def get_query_embedding_cache() -> QueryEmbeddingCache | None:
+    """Query embedding cache shared by all searches of the process."""
+    config = get_app_config().query_embedding_cache
+    if not config.enabled:
+        return None
+
+    disk = (
+        DiskCache(
+            directory=config.disk_dir,
+            max_bytes=config.disk_max_bytes,
+            ttl_seconds=config.ttl_seconds,
+        )
+        if config.disk_enabled
+        else None
+    )
+    return QueryEmbeddingCache(
+        memory_max_bytes=config.memory_max_bytes, ttl_seconds=config.ttl_seconds, disk=disk
+    )
@@ -90,6 +90,7 @@ class CheckService:
             input=input,
             agent_output=agent_output,
             reconciled_output=reconciled_output,
+            check_id=new_check.id,
         )
 
 
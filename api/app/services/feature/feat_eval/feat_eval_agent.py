@@ -1,9 +1,11 @@
 import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Annotated
 from fastapi import Depends
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -24,7 +26,10 @@ from app.services.feature.feat_eval.query_rous_tool import QueryRousTool
 from app.dtos.check_dto import CheckDTO, CheckUpdateDTO
 from app.dtos.feature_dto import FeatureDTO
 from app.services.regulation.regulation_service import RegulationServiceDep, regulation_service_context
-from app.config.app_config import OpenAIConfigDep, get_app_config
+from app.clients.openai_client import get_openai_http_async_client
+from app.services.cache.llm_response_cache import get_agent_llm_cache
+from app.services.usage.llm_usage_recorder import LLM_STAGE_KEY, usage_callbacks
+from app.config.app_config import get_app_config
 
 user_prompt_template = PromptTemplate.from_template(
     """
@@ -42,38 +47,57 @@ Terminologies Mapping:
 )
 
 
+@lru_cache
+def get_feat_eval_graph() -> CompiledStateGraph:
+    """Compiled evaluation agent, shared by all requests of the process."""
+    openai_config = get_app_config().openai
+    model = ChatOpenAI(
+        model=openai_config.model,
+        api_key=openai_config.api_key,
+        base_url=openai_config.base_url,
+        http_async_client=get_openai_http_async_client(),
+        cache=get_agent_llm_cache("feat_eval"),
+        metadata={LLM_STAGE_KEY: "feat_eval"},
+    )
+    return create_react_agent(
+        model=model,
+        response_format=EvalResultDTO,
+        tools=[QueryRousTool()],
+    )
+
+
 class FeatEvalAgent:
     def __init__(
         self,
-        openai_config: OpenAIConfigDep,
         regulation_service: RegulationServiceDep,
         check_repository: CheckRepositoryDep,
         eval_result_repository: EvalResultRepositoryDep,
         system_prompt_service: SystemPromptServiceDep,
     ):
-        model = ChatOpenAI(model=openai_config.model, api_key=openai_config.api_key)
-        self.agent = create_react_agent(
-            model=model,
-            response_format=EvalResultDTO,
-            tools=[QueryRousTool(regulation_service=regulation_service)],
-        )
+        self.agent = get_feat_eval_graph()
+        self.regulation_service = regulation_service
         self.check_repository = check_repository
         self.eval_result_repository = eval_result_repository
         self.system_prompt_service = system_prompt_service
 
     async def ainvoke(self, feature: FeatureDTO, check: CheckDTO) -> CheckDTO:
-        try:
-            system_prompt = await self.system_prompt_service.get_active_prompt_text(
-                AgentType.FEATURE_EVAL_AGENT
-            )
-            result = await self._eval_feature(feature, system_prompt)
-            await self._update_check_with_result(check.id, result)
-        except Exception:
-            await self.check_repository.update_by_id(check.id, CheckUpdateDTO(status=Status.FAILED))
+        """
+        Evaluate a feature and store the result on its check.
+
+        Errors propagate, so the job queue retries the evaluation; the check is
+        marked FAILED only after the last attempt, see `fail_check`.
+        """
+        system_prompt = await self.system_prompt_service.get_active_prompt_text(
+            AgentType.FEATURE_EVAL_AGENT
+        )
+        result = await self._eval_feature(feature, system_prompt, check.id)
+        await self._update_check_with_result(check.id, result)
 
         return check
 
-    async def _eval_feature(self, feature: FeatureDTO, system_prompt: str) -> EvalResultDTO:
+    async def _eval_feature(
+        self, feature: FeatureDTO, system_prompt: str, check_id: int
+    ) -> EvalResultDTO:
         messages = [
             SystemMessage(content=system_prompt),
             HumanMessage(
@@ -84,7 +108,13 @@ class FeatEvalAgent:
                 ).to_string()
             ),
         ]
-        res = await self.agent.ainvoke({"messages": messages})
+        res = await self.agent.ainvoke(
+            {"messages": messages},
+            config={
+                "configurable": {"regulation_service": self.regulation_service},
+                "callbacks": usage_callbacks("feat_eval", check_id=check_id),
+            },
+        )
 
         return EvalResultDTO.model_validate(res["structured_response"])
 
@@ -104,7 +134,6 @@ async def feat_eval_agent_context():
     """
     Context manager for FeatEvalAgent.
     """
-    openai_config = get_app_config().openai
     async with (
         regulation_service_context() as regulation_service,
         check_repository_context() as check_repo,
@@ -112,7 +141,6 @@ async def feat_eval_agent_context():
         system_prompt_service_context() as system_prompt_service,
     ):
         yield FeatEvalAgent(
-            openai_config=openai_config,
             regulation_service=regulation_service,
             check_repository=check_repo,
             eval_result_repository=eval_result_repo,
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated, List
 from fastapi import BackgroundTasks, Depends
 
@@ -9,9 +8,19 @@ from app.services.check.check_service import CheckServiceDep
 from app.services.feature.feature_service import FeatureServiceDep
 from app.services.feature.feat_eval.feat_eval_agent import feat_eval_agent_context
 from app.services.feature.feat_eval.term_mapping_agent import term_mapping_agent_context
+from app.services.job.job_service import JobServiceDep
 
-# Max 10 concurrent evaluations
-semaphore = asyncio.Semaphore(10)
+
+async def evaluate_feature(feature: FeatureDTO, check: CheckDTO) -> None:
+    """Map the feature's terminologies if needed, then run the AI check. Runs on a worker."""
+    feature_to_eval = feature
+
+    if not feature.terminologies:
+        async with term_mapping_agent_context() as term_mapping_agent:
+            feature_to_eval = await term_mapping_agent.ainvoke(feature, check_id=check.id)
+
+    async with feat_eval_agent_context() as feat_eval_agent:
+        await feat_eval_agent.ainvoke(feature_to_eval, check)
 
 
 class FeatureEvalService:
@@ -19,33 +28,19 @@ class FeatureEvalService:
         self,
         feature_service: FeatureServiceDep,
         check_service: CheckServiceDep,
+        job_service: JobServiceDep,
         background_tasks: BackgroundTasks,
     ):
         self.feature_service = feature_service
         self.check_service = check_service
+        self.job_service = job_service
         self.background_tasks = background_tasks
 
-    async def _trigger_eval(self, feature: FeatureDTO, check: CheckDTO):
-        async with semaphore:
-            feature_to_eval = feature
-
-            if not feature.terminologies:
-                async with term_mapping_agent_context() as term_mapping_agent:
-                    feature_to_eval = await term_mapping_agent.ainvoke(feature)
-
-            async with feat_eval_agent_context() as feat_eval_agent:
-                await feat_eval_agent.ainvoke(feature_to_eval, check)
-
     async def trigger_evals(self, feature_ids: List[int]) -> List[CheckDTO]:
+        """Create pending AI checks and queue their evaluation for the workers."""
         checks = await self.check_service.init_checks(feature_ids, check_type=CheckType.AI)
-        features = await self.feature_service.get_many_features_by_ids(feature_ids)
-
-        async def run_concurrent_tasks(features: List[FeatureDTO], checks: List[CheckDTO]):
-            await asyncio.gather(
-                *[self._trigger_eval(feature, check) for feature, check in zip(features, checks)]
-            )
 
-        asyncio.create_task(run_concurrent_tasks(features, checks))
+        await self.job_service.enqueue_feature_evaluations(checks)
 
         return checks
 
@@ -1,12 +1,17 @@
+from functools import lru_cache
 from typing import Annotated
 from fastapi import Depends
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
 from pydantic import BaseModel
 
-from app.config.app_config import LearningAgentConfigDep, OpenAIConfigDep
+from app.clients.openai_client import get_openai_http_async_client
+from app.services.cache.llm_response_cache import get_agent_llm_cache
+from app.services.usage.llm_usage_recorder import LLM_STAGE_KEY, usage_callbacks
+from app.config.app_config import LearningAgentConfigDep, get_app_config
 from app.database.schemas.enums.agent_type import AgentType
 from app.dtos.system_prompt_dto import SystemPromptVersionCreateDTO
 from app.services.system_prompt.system_prompt_service import SystemPromptServiceDep
@@ -17,20 +22,38 @@ class LearningResultDTO(BaseModel):
     patch_summary: str
 
 
+@lru_cache
+def get_learning_graph() -> CompiledStateGraph:
+    """Compiled learning agent, shared by all requests of the process."""
+    openai_config = get_app_config().openai
+    model = ChatOpenAI(
+        model=openai_config.model,
+        api_key=openai_config.api_key,
+        base_url=openai_config.base_url,
+        http_async_client=get_openai_http_async_client(),
+        cache=get_agent_llm_cache("learning"),
+        metadata={LLM_STAGE_KEY: "learning"},
+    )
+    return create_react_agent(model=model, response_format=LearningResultDTO, tools=[])
+
+
 class LearningAgent:
     def __init__(
         self,
-        openai_config: OpenAIConfigDep,
         learning_agent_config: LearningAgentConfigDep,
         system_prompt_service: SystemPromptServiceDep,
     ):
-        model = ChatOpenAI(model=openai_config.model, api_key=openai_config.api_key)
-        self.agent = create_react_agent(model=model, response_format=LearningResultDTO, tools=[])
+        self.agent = get_learning_graph()
         self.config = learning_agent_config
         self.system_prompt_service = system_prompt_service
 
     async def ainvoke(
-        self, agent_type: AgentType, input: str, agent_output: str, reconciled_output: str
+        self,
+        agent_type: AgentType,
+        input: str,
+        agent_output: str,
+        reconciled_output: str,
+        check_id: int | None = None,
     ):
         print("Invoking learning agent...")
         prompt_template = PromptTemplate.from_template(self.config.user_prompt_template)
@@ -47,7 +70,10 @@ class LearningAgent:
                 ).to_string()
             ),
         ]
-        res = await self.agent.ainvoke({"messages": messages})
+        res = await self.agent.ainvoke(
+            {"messages": messages},
+            config={"callbacks": usage_callbacks("learning", check_id=check_id)},
+        )
 
         learning_result = LearningResultDTO.model_validate(res["structured_response"])
 
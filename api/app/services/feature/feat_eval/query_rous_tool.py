@@ -1,24 +1,53 @@
 from typing import List, Optional
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import ArgsSchema, BaseTool
 from pydantic import BaseModel, Field
 
-from app.dtos.rou_dto import RouDto
+from app.dtos.rou_dto import RouSearchHitDto
 from app.services.regulation.regulation_service import RegulationService
 
 
 class QueryRousInput(BaseModel):
     query: str = Field(..., description="The query string to search for relevant ROUs.")
+    jurisdictions: Optional[List[str]] = Field(
+        None,
+        description=(
+            "Only return ROUs of these jurisdictions, e.g. ['EU', 'California']. "
+            "Matching ignores case and punctuation but not synonyms; omit to search all."
+        ),
+    )
+    regulation_ids: Optional[List[int]] = Field(
+        None,
+        description="Only return ROUs extracted from these regulations (the ROUs' source_id).",
+    )
 
 
 class QueryRousTool(BaseTool):
+    """
+    The tool is shared by all runs of the compiled agent graph; the request's
+    `regulation_service` is passed in `config["configurable"]`.
+    """
+
     name: str = "QueryROUsTool"
-    description: str = "A tool to query regulation obligation units based on a specific query."
+    description: str = (
+        "A tool to query regulation obligation units based on a specific query. "
+        "Filter by jurisdiction or regulation when you know which ones apply; "
+        "if a filtered search returns nothing, search again without the filter."
+    )
     args_schema: Optional[ArgsSchema] = QueryRousInput
-    regulation_service: RegulationService
 
-    def _run(self, query: str) -> List[RouDto]:
+    def _run(self, query: str) -> List[RouSearchHitDto]:
         raise NotImplementedError("Synchronous execution is not supported.")
 
-    async def _arun(self, query: str) -> List[RouDto]:
-        response = await self.regulation_service.query_relevant_rous(query)
+    async def _arun(
+        self,
+        query: str,
+        config: RunnableConfig,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[RouSearchHitDto]:
+        regulation_service: RegulationService = config["configurable"]["regulation_service"]
+        response = await regulation_service.query_relevant_rous(
+            query, jurisdictions=jurisdictions, regulation_ids=regulation_ids
+        )
         return response
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import ArgsSchema, BaseTool
 from pydantic import BaseModel, Field
 
@@ -10,17 +11,24 @@ class QueryTerminologiesInput(BaseModel):
 
 
 class QueryTerminologiesTool(BaseTool):
+    """
+    The tool is shared by all runs of the compiled agent graph; the request's
+    `terminology_repository` is passed in `config["configurable"]`.
+    """
+
     name: str = "QueryTerminologiesTool"
     description: str = "A tool to query terminology mappings from the database based on a short form/key."
     args_schema: Optional[ArgsSchema] = QueryTerminologiesInput
-    terminology_repository: TerminologyRepository
 
     def _run(self, key: str) -> List[dict]:
         raise NotImplementedError("Synchronous execution is not supported.")
 
-    async def _arun(self, key: str) -> List[dict]:
+    async def _arun(self, key: str, config: RunnableConfig) -> List[dict]:
         """Query terminologies by key and return as simple dict for LLM"""
-        terminologies = await self.terminology_repository.get_by_filter(key=key)
+        terminology_repository: TerminologyRepository = config["configurable"][
+            "terminology_repository"
+        ]
+        terminologies = await terminology_repository.get_by_filter(key=key)
         
         # Return simple dict format for LLM consumption
         return [
@@ -1,9 +1,11 @@
 import asyncio
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Annotated, List
 from fastapi import Depends
 from langchain_core.prompts import PromptTemplate
 from langchain_openai import ChatOpenAI
+from langgraph.graph.state import CompiledStateGraph
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import HumanMessage, SystemMessage
 
@@ -20,7 +22,10 @@ from app.services.feature.feat_eval.query_terminologies_tool import (
 )
 from app.dtos.feature_dto import FeatureDTO, FeatureUpdateDTO
 from app.dtos.term_mapping_result import Mapping, TermMappingResultDTO
-from app.config.app_config import OpenAIConfigDep, get_app_config
+from app.clients.openai_client import get_openai_http_async_client
+from app.services.cache.llm_response_cache import get_agent_llm_cache
+from app.services.usage.llm_usage_recorder import LLM_STAGE_KEY, usage_callbacks
+from app.config.app_config import get_app_config
 
 
 user_prompt_template = PromptTemplate.from_template(
@@ -85,23 +90,37 @@ You are a terminology mapping expert. Your task is to identify abbreviations, ac
 )
 
 
+@lru_cache
+def get_term_mapping_graph() -> CompiledStateGraph:
+    """Compiled term mapping agent, shared by all requests of the process."""
+    openai_config = get_app_config().openai
+    model = ChatOpenAI(
+        model=openai_config.model,
+        api_key=openai_config.api_key,
+        base_url=openai_config.base_url,
+        http_async_client=get_openai_http_async_client(),
+        cache=get_agent_llm_cache("term_mapping"),
+        metadata={LLM_STAGE_KEY: "term_mapping"},
+    )
+    return create_react_agent(
+        model=model,
+        response_format=TermMappingResultDTO,
+        tools=[QueryTerminologiesTool()],
+    )
+
+
 class TermMappingAgent:
     def __init__(
         self,
-        openai_config: OpenAIConfigDep,
         terminology_repository: TerminologyRepositoryDep,
         feature_service: FeatureServiceDep,
     ):
-        model = ChatOpenAI(model=openai_config.model, api_key=openai_config.api_key)
-        self.agent = create_react_agent(
-            model=model,
-            response_format=TermMappingResultDTO,
-            tools=[QueryTerminologiesTool(terminology_repository=terminology_repository)],
-        )
+        self.agent = get_term_mapping_graph()
+        self.terminology_repository = terminology_repository
         self.feature_service = feature_service
 
-    async def ainvoke(self, feature: FeatureDTO) -> FeatureDTO:
-        mappings = await self._generate_mappings(feature)
+    async def ainvoke(self, feature: FeatureDTO, check_id: int | None = None) -> FeatureDTO:
+        mappings = await self._generate_mappings(feature, check_id)
 
         updated_feature = await self.feature_service.update_feature(
             feature.id,
@@ -114,7 +133,9 @@ class TermMappingAgent:
 
         return updated_feature
 
-    async def _generate_mappings(self, feature: FeatureDTO) -> List[Mapping]:
+    async def _generate_mappings(
+        self, feature: FeatureDTO, check_id: int | None = None
+    ) -> List[Mapping]:
         """Extract terminology mappings from a feature"""
         messages = [
             system_prompt,
@@ -125,7 +146,13 @@ class TermMappingAgent:
             ),
         ]
 
-        res = await self.agent.ainvoke({"messages": messages})
+        res = await self.agent.ainvoke(
+            {"messages": messages},
+            config={
+                "configurable": {"terminology_repository": self.terminology_repository},
+                "callbacks": usage_callbacks("term_mapping", check_id=check_id),
+            },
+        )
         res_dto = TermMappingResultDTO.model_validate(res["structured_response"])
 
         return res_dto.mappings
@@ -141,7 +168,6 @@ async def term_mapping_agent_context():
     """
     async with feature_service_context() as feature_service, terminology_repository_context() as terminology_repository:
         yield TermMappingAgent(
-            openai_config=get_app_config().openai,
             terminology_repository=terminology_repository,
             feature_service=feature_service,
         )
@@ -0,0 +1,54 @@
+from contextlib import asynccontextmanager
+from typing import Annotated, List
+from fastapi import Depends
+from pydantic import BaseModel
+
+from app.config.app_config import JobQueueConfigDep, get_app_config
+from app.database.repositories.job_repository import JobRepositoryDep, job_repository_context
+from app.database.schemas.enums.job_type import JobType
+from app.dtos.check_dto import CheckDTO
+from app.dtos.job_dto import EvaluateFeatureJobPayload, ExtractRegulationJobPayload
+
+
+class JobService:
+    """
+    Queues background work for the worker processes (`python -m app.worker`).
+    """
+
+    def __init__(self, job_repository: JobRepositoryDep, job_queue_config: JobQueueConfigDep):
+        self.job_repository = job_repository
+        self.config = job_queue_config
+
+    async def _enqueue(self, job_type: JobType, payloads: List[BaseModel]) -> None:
+        if not payloads:
+            return
+
+        jobs = await self.job_repository.enqueue_many(
+            job_type,
+            [payload.model_dump() for payload in payloads],
+            max_attempts=self.config.max_attempts,
+        )
+        print(f"Queued {len(jobs)} {job_type} jobs")
+
+    async def enqueue_regulation_extraction(self, regulation_id: int) -> None:
+        await self._enqueue(
+            JobType.EXTRACT_REGULATION, [ExtractRegulationJobPayload(regulation_id=regulation_id)]
+        )
+
+    async def enqueue_feature_evaluations(self, checks: List[CheckDTO]) -> None:
+        await self._enqueue(
+            JobType.EVALUATE_FEATURE,
+            [EvaluateFeatureJobPayload(check_id=check.id) for check in checks],
+        )
+
+
+JobServiceDep = Annotated[JobService, Depends(JobService)]
+
+
+@asynccontextmanager
+async def job_service_context():
+    """
+    Context manager for JobService.
+    """
+    async with job_repository_context() as job_repository:
+        yield JobService(job_repository, get_app_config().job_queue)
@@ -1,13 +1,197 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from typing import List
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+from typing import AsyncIterator, Iterator, NamedTuple
 import PyPDF2
-from fastapi import UploadFile
+
+from app.config.app_config import get_app_config
+from app.config.models.pdf_reader_config import PdfReaderConfig
+from app.services.cache.disk_cache import DiskCache, content_hash
+
+
+class PdfPage(NamedTuple):
+    """A single parsed PDF page. `number` is 1-based."""
+
+    number: int
+    text: str
+
+
+def iter_pdf_pages(file_bytes: BytesIO) -> Iterator[PdfPage]:
+    """Lazily parses a PDF, yielding the text of each page as soon as it is extracted."""
+    reader = PyPDF2.PdfReader(file_bytes)
+    for number, page in enumerate(reader.pages, start=1):
+        yield PdfPage(number=number, text=page.extract_text() + "\n")
+
+
+@lru_cache
+def get_pdf_text_cache() -> DiskCache | None:
+    """On-disk cache of extracted page texts keyed by the SHA-256 of the PDF bytes."""
+    config = get_app_config().pdf_reader
+    if not config.text_cache_enabled:
+        return None
+
+    return DiskCache(
+        directory=config.text_cache_dir,
+        max_bytes=config.text_cache_max_bytes,
+        compress=config.text_cache_compress,
+    )
+
+
+def get_cached_page_texts(key: str) -> list[str] | None:
+    cache = get_pdf_text_cache()
+    data = cache.get(key) if cache else None
+    return json.loads(data) if data is not None else None
+
+
+def cache_page_texts(key: str, page_texts: list[str]) -> None:
+    cache = get_pdf_text_cache()
+    if cache:
+        cache.set(key, json.dumps(page_texts).encode("utf-8"))
+
+
+async def aiter_page_texts(page_texts: list[str]) -> AsyncIterator[PdfPage]:
+    """Replays already extracted page texts as a page stream."""
+    for number, text in enumerate(page_texts, start=1):
+        yield PdfPage(number=number, text=text)
 
 
 def read_pdf(file_bytes: BytesIO) -> str:
     """Reads a PDF and returns the full text as a string."""
-    text = ""
-    reader = PyPDF2.PdfReader(file_bytes)
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text
+    key = content_hash(file_bytes.getvalue())
+    page_texts = get_cached_page_texts(key)
+    if page_texts is None:
+        page_texts = [page.text for page in iter_pdf_pages(file_bytes)]
+        cache_page_texts(key, page_texts)
+
+    return "".join(page_texts)
+
+
+@lru_cache(maxsize=2)
+def _open_pdf(path: str) -> PyPDF2.PdfReader:
+    """Pool worker: decodes a PDF once per worker process, for all the page ranges it parses."""
+    return PyPDF2.PdfReader(path)
+
+
+def _count_pages(path: str) -> int:
+    return len(_open_pdf(path).pages)
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> list[PdfPage]:
+    """Pool worker: extracts the text of pages [start, stop)."""
+    reader = _open_pdf(path)
+    return [
+        PdfPage(number=i + 1, text=reader.pages[i].extract_text() + "\n") for i in range(start, stop)
+    ]
+
+
+def _write_temp_pdf(data: bytes, key: str) -> str:
+    # named after the content hash, so a worker's decoded copy can never belong to other bytes
+    fd, path = tempfile.mkstemp(prefix=f"{key}-", suffix=".pdf")
+    with os.fdopen(fd, "wb") as file:
+        file.write(data)
+    return path
+
+
+@lru_cache
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """Process pool used for all PDF parsing, created on first use."""
+    return ProcessPoolExecutor(
+        max_workers=get_app_config().pdf_reader.max_workers,
+        # spawn, as forking the multi-threaded API process is unsafe
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+class PdfParseLimiter:
+    """
+    Bounds the parse tasks in flight in the process pool, across all PDFs of the process.
+
+    An asyncio.Semaphore binds to the event loop it first waits on, so `start`
+    creates it from the lifespan, inside the loop that serves the parses.
+    """
+
+    def __init__(self, config: PdfReaderConfig):
+        self.config = config
+        self._semaphore: asyncio.Semaphore | None = None
+
+    def start(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrent_parses)
+
+    async def run(self, fn, *args):
+        """Run a parse task in the pool; the permit covers the pool call only."""
+        if self._semaphore is None:
+            raise RuntimeError("PDF parsing is not started; enter `singletons_context` first")
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(get_pdf_executor(), fn, *args)
+
+
+@lru_cache
+def get_pdf_parse_limiter() -> PdfParseLimiter:
+    return PdfParseLimiter(get_app_config().pdf_reader)
+
+
+async def aiter_pdf_pages(file_bytes: BytesIO, use_cache: bool = True) -> AsyncIterator[PdfPage]:
+    """
+    Yields the pages of a PDF in order, serving them from the text cache when possible.
+
+    Set `use_cache` to False when the cache has already been checked for this file.
+    """
+    data = file_bytes.getvalue()
+    key = content_hash(data)
+
+    page_texts = await asyncio.to_thread(get_cached_page_texts, key) if use_cache else None
+    if page_texts is not None:
+        async for page in aiter_page_texts(page_texts):
+            yield page
+        return
+
+    parsed_texts: list[str] = []
+    async for page in _parse_pdf_pages(data, key):
+        parsed_texts.append(page.text)
+        yield page
+
+    await asyncio.to_thread(cache_page_texts, key, parsed_texts)
+
+
+async def _parse_pdf_pages(data: bytes, key: str) -> AsyncIterator[PdfPage]:
+    """
+    Parses a PDF in the process pool, yielding pages in order as they become available.
+
+    PDF decoding and text extraction are CPU-bound, so they run outside the event
+    loop. The document is written to a temporary file that pool workers open and
+    decode once each, then handed to the pool in page ranges; when
+    `split_large_pdfs` is enabled several ranges are parsed in parallel.
+    """
+    config = get_app_config().pdf_reader
+    limiter = get_pdf_parse_limiter()
+
+    path = await asyncio.to_thread(_write_temp_pdf, data, key)
+    pending: deque[asyncio.Task[list[PdfPage]]] = deque()
+    try:
+        page_count = await limiter.run(_count_pages, path)
+        ranges = deque(
+            (start, min(start + config.pages_per_task, page_count))
+            for start in range(0, page_count, config.pages_per_task)
+        )
+        window = config.max_workers if config.split_large_pdfs else 1
+
+        while ranges or pending:
+            while ranges and len(pending) < window:
+                start, stop = ranges.popleft()
+                pending.append(
+                    asyncio.create_task(limiter.run(_extract_page_range, path, start, stop))
+                )
+
+            for page in await pending.popleft():
+                yield page
+    finally:
+        for task in pending:
+            task.cancel()
+        Path(path).unlink(missing_ok=True)
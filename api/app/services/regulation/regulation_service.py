@@ -1,20 +1,45 @@
 from contextlib import asynccontextmanager
-from typing import Annotated, List
-from chromadb.api.models.Collection import Collection
+import traceback
+from typing import Annotated, Dict, List, Optional
 from fastapi import Depends
 from sqlalchemy.orm import selectinload
 
-from app.config.app_config import get_app_config
 from app.database.schemas.regulation import Regulation
 from app.database.repositories.regulation_repository import (
     RegulationRepositoryDep,
     regulation_repository_context,
 )
-from app.dtos.rou_dto import RouDto
+from app.dtos.rou_dto import RouSearchHitDto
 from app.database.repositories.rou_repository import RouRepositoryDep, rou_repository_context
-from app.clients.chromadb_client import ROU_COLLECTION_NAME, ChromaDbClientDep, get_chromadb_client
-from app.services.regulation.rou_extraction.rou_extract_model import RouExtractModel, RouExtractModelDep
-from app.dtos.regulation_dto import RegulationCreateDTO, RegulationDTO
+from app.clients.rou_vector_store import (
+    RouVectorStoreDep,
+    RouVectorStoreError,
+    get_rou_vector_store,
+)
+from app.config.app_config import RouRetrievalConfigDep, get_app_config
+from app.services.regulation.rou_lexical_index import RouLexicalIndexDep, get_rou_lexical_index
+from app.services.regulation.rou_extraction.rou_extract_model import (
+    RouExtractModelDep,
+    get_rou_extract_model,
+)
+from app.dtos.regulation_dto import (
+    RegulationCreateDTO,
+    RegulationDTO,
+    RegulationProgressDTO,
+    RegulationProgressUpdateDTO,
+)
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int = 60) -> List[int]:
+    """
+    Merge rankings by summing 1 / (k + rank) per item, so items ranked well by
+    several retrievers come first without comparing their incompatible scores.
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1 / (k + rank)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
 
 
 class RegulationService:
@@ -22,12 +47,16 @@ class RegulationService:
         self,
         rou_extractor: RouExtractModelDep,
         rou_repository: RouRepositoryDep,
-        chromadb_client: ChromaDbClientDep,
+        rou_vector_store: RouVectorStoreDep,
+        rou_lexical_index: RouLexicalIndexDep,
+        retrieval_config: RouRetrievalConfigDep,
         regulation_repository: RegulationRepositoryDep,
     ):
         self.rou_extractor = rou_extractor
         self.rou_repository = rou_repository
-        self.chromadb_client = chromadb_client
+        self.rou_vector_store = rou_vector_store
+        self.rou_lexical_index = rou_lexical_index
+        self.retrieval_config = retrieval_config
         self.regulation_repository = regulation_repository
 
     async def upload_regulation(self, regulation: RegulationCreateDTO) -> RegulationDTO:
@@ -56,16 +85,102 @@ class RegulationService:
 
         return RegulationDTO.model_validate(entry)
 
-    async def delete_regulation_by_id(self, regulation_id: int) -> None:
-        await self.regulation_repository.delete_by_id(regulation_id)
+    async def get_extraction_progress(self, regulation_id: int) -> RegulationProgressDTO:
+        entry = await self.regulation_repository.get_one_by_id(regulation_id)
+
+        if not entry:
+            raise ValueError(f"Regulation with ID {regulation_id} not found")
 
-    async def query_relevant_rous(self, query: str) -> List[RouDto]:
-        rous_collection: Collection = self.chromadb_client.get_collection(ROU_COLLECTION_NAME)
-        results = rous_collection.query(query_texts=[query])
+        return RegulationProgressDTO.model_validate(entry)
 
-        rou_ids = [int(i) for i in results["ids"][0]]
+    async def update_extraction_progress(
+        self, regulation_id: int, progress: RegulationProgressUpdateDTO
+    ) -> None:
+        await self.regulation_repository.update_by_id(regulation_id, progress)
+
+    async def delete_regulation_by_id(self, regulation_id: int) -> None:
+        """
+        Delete a regulation, its ROUs (cascaded in Postgres) and their vectors.
+
+        The vectors are deleted after the rows, so a failure leaves orphaned
+        vectors for `python -m app.rou_index reconcile` rather than ROUs that
+        can no longer be found.
+        """
+        rou_ids = await self.rou_repository.get_ids(source_id=regulation_id)
+        await self.regulation_repository.delete_by_id(regulation_id)
+        self.rou_lexical_index.remove(rou_ids)
+        try:
+            await self.rou_vector_store.delete([str(rou_id) for rou_id in rou_ids])
+        except RouVectorStoreError:
+            print(f"Failed to delete the vectors of {len(rou_ids)} ROUs of regulation {regulation_id}")
+            traceback.print_exc()
+
+    async def query_relevant_rous(
+        self,
+        query: str,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[RouSearchHitDto]:
+        """
+        Find the ROUs most relevant to a query, optionally only within some jurisdictions
+        and regulations.
+
+        In hybrid mode, vector hits are fused with BM25 hits by reciprocal rank,
+        so ROUs naming the statute or article in the query are found even when
+        their embeddings are not close.
+
+        The ROUs come with the vector hits or from the in-process index, so Postgres
+        is only asked for hits neither has. ROUs deleted by another process are
+        served until the index next refreshes.
+
+        Returns:
+            List[RouSearchHitDto]: The matching ROUs, most relevant first.
+        """
+        config = self.retrieval_config
+        if config.hybrid:
+            vector_hits = await self.rou_vector_store.query(
+                query,
+                n_results=config.n_candidates,
+                jurisdictions=jurisdictions,
+                regulation_ids=regulation_ids,
+            )
+            lexical_ids = self.rou_lexical_index.search(
+                query,
+                n_results=config.n_candidates,
+                jurisdictions=jurisdictions,
+                regulation_ids=regulation_ids,
+            )
+            rou_ids = reciprocal_rank_fusion(
+                [[hit.rou_id for hit in vector_hits], lexical_ids], k=config.rrf_k
+            )
+            rou_ids = rou_ids[: config.n_results]
+        else:
+            vector_hits = await self.rou_vector_store.query(
+                query,
+                n_results=config.n_results,
+                jurisdictions=jurisdictions,
+                regulation_ids=regulation_ids,
+            )
+            rou_ids = [hit.rou_id for hit in vector_hits]
+
+        # stores that load the ROUs with the hits (pgvector) leave nothing to look up
+        rous = {hit.rou_id: hit.rou for hit in vector_hits if hit.rou is not None}
+        rous.update(self.rou_lexical_index.get(rou_id for rou_id in rou_ids if rou_id not in rous))
+        if missing := [rou_id for rou_id in rou_ids if rou_id not in rous]:
+            loaded = await self.rou_repository.get_by_filter(id=missing)
+            self.rou_lexical_index.add(loaded)
+            rous.update(self.rou_lexical_index.get(missing))
+            if len(loaded) < len(missing):
+                print(
+                    f"{len(missing) - len(loaded)} ROU search hits have no row; "
+                    "run `python -m app.rou_index reconcile` to purge orphaned vectors"
+                )
+
+        distances = {hit.rou_id: hit.distance for hit in vector_hits}
         return [
-            RouDto.model_validate(rou) for rou in await self.rou_repository.get_by_filter(id=rou_ids)
+            RouSearchHitDto(**rous[rou_id].model_dump(), distance=distances.get(rou_id))
+            for rou_id in rou_ids
+            if rou_id in rous
         ]
 
 
@@ -77,12 +192,12 @@ async def regulation_service_context():
     """
     Context manager for RegulationService.
     """
-    openai_config = get_app_config().openai
-    rou_extractor = RouExtractModel(openai_config=openai_config)
     async with rou_repository_context() as rou_repo, regulation_repository_context() as regulation_repo:
         yield RegulationService(
-            rou_extractor=rou_extractor,
+            rou_extractor=get_rou_extract_model(),
             rou_repository=rou_repo,
-            chromadb_client=get_chromadb_client(openai_config=openai_config),
+            rou_vector_store=get_rou_vector_store(),
+            rou_lexical_index=get_rou_lexical_index(),
+            retrieval_config=get_app_config().rou_retrieval,
             regulation_repository=regulation_repo,
         )
@@ -1,88 +1,267 @@
 import asyncio
+from functools import lru_cache
 import logging
 import operator
-from typing import Annotated, List
+from typing import Annotated, AsyncIterable, AsyncIterator, List, Literal
 from fastapi import Depends
+from langchain_core.callbacks import Callbacks
+from langchain_core.runnables import RunnableConfig
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from pydantic import BaseModel
-from langgraph.types import Send
+from langgraph.config import get_stream_writer
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import StreamWriter
+from openai import OpenAIError
 
+from app.clients.openai_rate_limiter import estimate_tokens
+from app.config.app_config import RouExtractionConfigDep, get_app_config
+from app.services.regulation.pdf_reader import PdfPage
 from app.services.regulation.rou_extraction.rou_deduplicate_model import (
     RouDedupModelDep,
+    get_rou_dedup_model,
 )
 from app.dtos.extraction_result import ExtractedRouDto
-from app.services.regulation.rou_extraction.rou_extract_model import RouExtractModelDep
+from app.services.regulation.rou_extraction.rou_extract_model import (
+    RouExtractModelDep,
+    get_rou_extract_model,
+)
+from app.services.regulation.rou_extraction.rou_prededup import RouPreDedupDep, get_rou_prededup
 
 
 class OverallState(BaseModel):
-    text: str
-    # chunk list (created in map-start)
-    chunks: list[str] = []
+    # number of chunks generated from the page stream (set by map_extract)
+    chunk_count: int = 0
+    # number of chunks whose ROUs were served from the chunk cache
+    cache_hits: int = 0
     # aggregator: each map node returns a list of ROU dicts and the graph will combine them via operator.add
     chunk_rous: Annotated[list[list[ExtractedRouDto]], operator.add] = []
     # final result
     final_rous: list[ExtractedRouDto] = []
 
 
-class MapInputState(BaseModel):
-    chunk: str
+class ExtractionEvent(BaseModel):
+    """
+    Progress event emitted while a document is extracted.
+
+    - chunk_generated: a new chunk was split off the page stream
+    - chunk_extracted: a chunk finished; `rous` holds its (not yet deduplicated) ROUs
+    - chunk_failed: extracting a chunk raised an error
+    - deduplicating: all chunks finished and the reduce step started
+    - completed: `rous` holds the final, deduplicated ROUs
+    """
 
+    kind: Literal["chunk_generated", "chunk_extracted", "chunk_failed", "deduplicating", "completed"]
+    rous: List[ExtractedRouDto] = []
 
-semaphore = asyncio.Semaphore(20)
+
+async def _single_page(text: str) -> AsyncIterator[PdfPage]:
+    yield PdfPage(number=1, text=text)
 
 
 class MapReduceRouExtractor:
     def __init__(
-        self, rou_extractor_model: RouExtractModelDep, rou_dedup_model: RouDedupModelDep
+        self,
+        rou_extractor_model: RouExtractModelDep,
+        rou_dedup_model: RouDedupModelDep,
+        rou_prededup: RouPreDedupDep,
+        rou_extraction_config: RouExtractionConfigDep,
     ):
         self.text_splitter = RecursiveCharacterTextSplitter()
         self.map_model = rou_extractor_model
         self.reduce_model = rou_dedup_model
+        self.prededup = rou_prededup
+        self.config = rou_extraction_config
 
         # build a graph instance tied to this extractor
         self.compiled_graph = self._build_graph()
 
     def _build_graph(self):
         graph = StateGraph(OverallState)
-        graph.add_node("generate_chunks", self.generate_chunks)
         graph.add_node("map_extract", self.map_extract)
         graph.add_node("reduce_rous", self.reduce_rous)
 
-        graph.add_edge(START, "generate_chunks")
-        graph.add_conditional_edges(
-            "generate_chunks", self.continue_to_map, ["map_extract"]
-        )
+        graph.add_edge(START, "map_extract")
         graph.add_edge("map_extract", "reduce_rous")
         graph.add_edge("reduce_rous", END)
 
         return graph.compile()
 
-    def generate_chunks(self, state: OverallState):
-        chunks = self.text_splitter.split_text(state.text)
-        print(f"Generated {len(chunks)} chunks")
-        return {"chunks": chunks}
+    async def generate_chunks(self, pages: AsyncIterable[PdfPage]) -> AsyncIterator[str]:
+        """
+        Split a stream of pages into chunks.
+
+        A chunk is yielded as soon as no later page can extend it, so only the
+        trailing, still-growing chunk is buffered between pages.
+        """
+        buffer = ""
+        async for page in pages:
+            buffer += page.text
+            chunks = self.text_splitter.split_text(buffer)
+            if len(chunks) < 2:
+                continue
+
+            for chunk in chunks[:-1]:
+                yield chunk
+            # keep the raw tail (including separators stripped by the splitter)
+            buffer = buffer[buffer.rindex(chunks[-1]) :]
+
+        for chunk in self.text_splitter.split_text(buffer):
+            yield chunk
+
+    async def _extract_chunk(
+        self, chunk: str, writer: StreamWriter, in_flight: asyncio.Semaphore
+    ) -> tuple[List[ExtractedRouDto], bool]:
+        try:
+            rous, cache_hit = await self.map_model.extract_cached(chunk)
+            print(f"Extracted {len(rous)} ROUs from chunk{' (cached)' if cache_hit else ''}")
+            writer(ExtractionEvent(kind="chunk_extracted", rous=rous))
+            return rous, cache_hit
+        except (OpenAIError, ValueError, OSError) as e:
+            # a failed chunk must not throw away the chunks that succeeded: API errors,
+            # output that does not parse (ValueError) and chunk cache I/O
+            print(f"Failed to extract chunk: {e}")
+            writer(ExtractionEvent(kind="chunk_failed"))
+            return [], False
+        finally:
+            in_flight.release()
+
+    async def map_extract(self, state: OverallState, config: RunnableConfig):
+        pages: AsyncIterable[PdfPage] = config["configurable"]["pages"]
+        writer = get_stream_writer()
+
+        # request pacing is left to the OpenAI rate limiter; this only bounds the chunks
+        # held in memory, pausing the page stream while too many are in flight
+        in_flight = asyncio.Semaphore(self.config.max_chunks_in_flight)
+        tasks: list[asyncio.Task[tuple[List[ExtractedRouDto], bool]]] = []
+        async for chunk in self.generate_chunks(pages):
+            writer(ExtractionEvent(kind="chunk_generated"))
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(self._extract_chunk(chunk, writer, in_flight)))
+        print(f"Generated {len(tasks)} chunks")
+
+        results = await asyncio.gather(*tasks)
+        cache_hits = sum(cache_hit for _, cache_hit in results)
+        print(f"{cache_hits}/{len(tasks)} chunks served from cache")
+
+        return {
+            "chunk_count": len(tasks),
+            "cache_hits": cache_hits,
+            "chunk_rous": [rous for rous, _ in results],
+        }
+
+    def _batch_for_reduce(
+        self, rous_lists: List[List[ExtractedRouDto]]
+    ) -> List[List[List[ExtractedRouDto]]]:
+        """
+        Group ROU lists into dedup batches of at most `reduce_fan_in` lists within
+        `reduce_token_budget`. A batch always takes at least two lists so every
+        level of the tree shrinks.
+        """
+        batches: List[List[List[ExtractedRouDto]]] = []
+        batch: List[List[ExtractedRouDto]] = []
+        batch_tokens = 0
+
+        for rous in rous_lists:
+            tokens = sum(estimate_tokens(rou.model_dump_json()) for rou in rous)
+            if len(batch) >= 2 and (
+                len(batch) >= self.config.reduce_fan_in
+                or batch_tokens + tokens > self.config.reduce_token_budget
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+
+            batch.append(rous)
+            batch_tokens += tokens
 
-    def continue_to_map(self, state: OverallState):
-        return [Send("map_extract", MapInputState(chunk=c)) for c in state.chunks]
+        if batch:
+            batches.append(batch)
+        return batches
 
-    async def map_extract(self, state: MapInputState):
-        async with semaphore:
-            rous = await self.map_model.extract(state.chunk)
-            print(f"Extracted {len(rous)} ROUs from chunk")
-        return {"chunk_rous": [rous]}
+    async def _dedup_batch(self, batch: List[List[ExtractedRouDto]]) -> List[ExtractedRouDto]:
+        if len(batch) == 1:
+            return batch[0]
+
+        return await self.reduce_model.dedup(batch)
+
+    async def _tree_reduce(self, rous_lists: List[List[ExtractedRouDto]]) -> List[ExtractedRouDto]:
+        """
+        Tree reduce: dedup batches of ROU lists concurrently, then dedup the
+        merged batches, until a single ROU list is left.
+        """
+        rous_lists = [rous for rous in rous_lists if rous]
+
+        level = 0
+        while len(rous_lists) > 1:
+            level += 1
+            batches = self._batch_for_reduce(rous_lists)
+            rous_lists = list(await asyncio.gather(*(self._dedup_batch(b) for b in batches)))
+            print(f"Reduce level {level}: merged into {len(rous_lists)} ROU lists")
+
+        return rous_lists[0] if rous_lists else []
 
     async def reduce_rous(self, state: OverallState):
-        print(f"Reducing {len(state.chunk_rous)} ROUs")
-        final_rous = await self.reduce_model.dedup(state.chunk_rous)
+        get_stream_writer()(ExtractionEvent(kind="deduplicating"))
+        print(f"Reducing {len(state.chunk_rous)} ROU lists")
+
+        if not self.config.prededup_enabled:
+            final_rous = await self._tree_reduce(state.chunk_rous)
+        else:
+            prededup = await self.prededup.run(state.chunk_rous)
+
+            if not self.config.skip_llm_reduce_when_unambiguous:
+                final_rous = await self._tree_reduce(prededup.rous_lists)
+            else:
+                # clusters are independent, so each one is reduced on its own
+                merged_clusters = await asyncio.gather(
+                    *(self._tree_reduce([[rou] for rou in cluster]) for cluster in prededup.ambiguous)
+                )
+                final_rous = prededup.unique + [rou for rous in merged_clusters for rou in rous]
+
         print(f"Reduced to {len(final_rous)} final ROUs")
         return {"final_rous": final_rous}
 
-    async def extract(self, text: str) -> List[ExtractedRouDto]:
-        res = await self.compiled_graph.ainvoke(OverallState(text=text))
+    async def extract_pages(
+        self, pages: AsyncIterable[PdfPage], callbacks: Callbacks = None
+    ) -> List[ExtractedRouDto]:
+        """Extract ROUs from a page stream, starting LLM calls while later pages are still parsed."""
+        res = await self.compiled_graph.ainvoke(
+            OverallState(), config={"configurable": {"pages": pages}, "callbacks": callbacks}
+        )
         return res["final_rous"]
 
+    async def astream_pages(
+        self, pages: AsyncIterable[PdfPage], callbacks: Callbacks = None
+    ) -> AsyncIterator[ExtractionEvent]:
+        """Extract ROUs from a page stream, yielding progress events as chunks finish."""
+        async for mode, data in self.compiled_graph.astream(
+            OverallState(),
+            config={"configurable": {"pages": pages}, "callbacks": callbacks},
+            stream_mode=["custom", "updates"],
+        ):
+            if mode == "custom":
+                yield data
+            elif "reduce_rous" in data:
+                yield ExtractionEvent(kind="completed", rous=data["reduce_rous"]["final_rous"])
+
+    async def extract(self, text: str) -> List[ExtractedRouDto]:
+        return await self.extract_pages(_single_page(text))
+
+
+@lru_cache
+def get_map_reduce_rou_extractor() -> MapReduceRouExtractor:
+    """
+    Extractor with its compiled graph, shared by all requests of the process.
+
+    The graph holds no per-request state; the pages of each run are passed in its config.
+    """
+    return MapReduceRouExtractor(
+        rou_extractor_model=get_rou_extract_model(),
+        rou_dedup_model=get_rou_dedup_model(),
+        rou_prededup=get_rou_prededup(),
+        rou_extraction_config=get_app_config().rou_extraction,
+    )
+
 
 MapReduceRouExtractorDep = Annotated[
-    MapReduceRouExtractor, Depends(MapReduceRouExtractor)
+    MapReduceRouExtractor, Depends(get_map_reduce_rou_extractor)
 ]
@@ -1,16 +1,25 @@
+from functools import lru_cache
 from typing import Annotated, List
 from fastapi import Depends
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
-from app.config.app_config import OpenAIConfigDep
+from app.clients.openai_client import get_openai_http_async_client
+from app.services.cache.llm_response_cache import get_agent_llm_cache
+from app.services.usage.llm_usage_recorder import LLM_STAGE_KEY
+from app.config.app_config import OpenAIConfigDep, get_app_config
 from app.dtos.extraction_result import DedupResult, ExtractedRouDto
 
 
 class RouDedupModel:
     def __init__(self, openai_config: OpenAIConfigDep):
         self.dedup_model = ChatOpenAI(
-            model="gpt-4o-mini", api_key=openai_config.api_key
+            model="gpt-4o-mini",
+            api_key=openai_config.api_key,
+            base_url=openai_config.base_url,
+            http_async_client=get_openai_http_async_client(),
+            cache=get_agent_llm_cache("rou_dedup"),
+            metadata={LLM_STAGE_KEY: "rou_dedup"},
         ).with_structured_output(DedupResult)
         self.system_prompt = """
 You are an expert compliance analyst specializing in global geo-regulations.  
@@ -69,4 +78,10 @@ Additional Context for Accuracy:
         return res.rous if res else []
 
 
-RouDedupModelDep = Annotated[RouDedupModel, Depends(RouDedupModel)]
+@lru_cache
+def get_rou_dedup_model() -> RouDedupModel:
+    """Dedup model shared by all requests of the process."""
+    return RouDedupModel(openai_config=get_app_config().openai)
+
+
+RouDedupModelDep = Annotated[RouDedupModel, Depends(get_rou_dedup_model)]
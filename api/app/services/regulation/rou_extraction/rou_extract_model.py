@@ -1,16 +1,43 @@
+import asyncio
+from functools import lru_cache
 from typing import Annotated, List
 from fastapi import Depends
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 
-from app.config.app_config import OpenAIConfigDep
+from app.clients.openai_client import get_openai_http_async_client
+from app.services.cache.llm_response_cache import get_agent_llm_cache
+from app.services.usage.llm_usage_recorder import LLM_STAGE_KEY
+from app.config.app_config import OpenAIConfigDep, get_app_config
 from app.dtos.extraction_result import ExtractedRouDto, ExtractionResult
+from app.services.cache.disk_cache import DiskCache, content_hash
+
+
+@lru_cache
+def get_rou_chunk_cache() -> DiskCache | None:
+    """Cache of per-chunk extraction results, so unchanged chunks skip the LLM call."""
+    config = get_app_config().rou_extraction
+    if not config.chunk_cache_enabled:
+        return None
+
+    return DiskCache(
+        directory=config.chunk_cache_dir,
+        max_bytes=config.chunk_cache_max_bytes,
+        compress=True,
+        ttl_seconds=config.chunk_cache_ttl_seconds,
+    )
 
 
 class RouExtractModel:
     def __init__(self, openai_config: OpenAIConfigDep):
+        self.model_name = "gpt-4o-mini"
         self.extractor_model = ChatOpenAI(
-            model="gpt-4o-mini", api_key=openai_config.api_key
+            model=self.model_name,
+            api_key=openai_config.api_key,
+            base_url=openai_config.base_url,
+            http_async_client=get_openai_http_async_client(),
+            cache=get_agent_llm_cache("rou_extract"),
+            metadata={LLM_STAGE_KEY: "rou_extract"},
         ).with_structured_output(ExtractionResult)
         self.system_prompt = """
 You are an expert compliance analyst specializing in global geo-regulations. 
@@ -121,6 +148,11 @@ Follow these steps for each chunk of text:
 
         return messages
 
+    def _cache_key(self, text: str) -> str:
+        return content_hash(
+            f"{content_hash(text)}:{content_hash(self.system_prompt)}:{self.model_name}"
+        )
+
     async def extract(self, text: str) -> List[ExtractedRouDto]:
         """
         Extract ROUs from a text chunk.
@@ -131,12 +163,40 @@ Follow these steps for each chunk of text:
         Returns:
             List[ExtractedRouDto]: A list of extracted ROUs.
         """
+        rous, _ = await self.extract_cached(text)
+        return rous
+
+    async def extract_cached(self, text: str) -> tuple[List[ExtractedRouDto], bool]:
+        """
+        Extract ROUs from a text chunk, serving previously extracted chunks from the cache.
+
+        Args:
+            text (str): The text chunk to extract ROUs from.
+
+        Returns:
+            tuple[List[ExtractedRouDto], bool]: The extracted ROUs and whether they came from the cache.
+        """
+        cache = get_rou_chunk_cache()
+        key = self._cache_key(text)
+
+        cached = await asyncio.to_thread(cache.get, key) if cache else None
+        if cached is not None:
+            return ExtractionResult.model_validate_json(cached).rous, True
+
         prompts = self._build_prompts(text)
         res = await self.extractor_model.ainvoke(prompts)
 
         res = ExtractionResult.model_validate(res) if res else None
+        if res and cache:
+            await asyncio.to_thread(cache.set, key, res.model_dump_json().encode("utf-8"))
+
+        return res.rous if res else [], False
+
 
-        return res.rous if res else []
+@lru_cache
+def get_rou_extract_model() -> RouExtractModel:
+    """Extraction model shared by all requests of the process."""
+    return RouExtractModel(openai_config=get_app_config().openai)
 
 
-RouExtractModelDep = Annotated[RouExtractModel, Depends(RouExtractModel)]
+RouExtractModelDep = Annotated[RouExtractModel, Depends(get_rou_extract_model)]
@@ -0,0 +1,168 @@
+import asyncio
+from functools import lru_cache
+import re
+from typing import Annotated, List
+from fastapi import Depends
+import numpy as np
+from pydantic import BaseModel
+
+from app.clients.embedding_provider import EmbeddingProvider, get_embedding_provider
+from app.clients.rou_vector_store import batch_by_tokens
+from app.config.app_config import RouExtractionConfigDep, RouIndexConfigDep, get_app_config
+from app.dtos.extraction_result import ExtractedRouDto
+
+
+class PreDedupResult(BaseModel):
+    # surviving ROUs, still grouped by the chunk they were extracted from
+    rous_lists: List[List[ExtractedRouDto]]
+    # ROUs with no similar neighbour; final as they are
+    unique: List[ExtractedRouDto]
+    # clusters of similar ROUs that need an LLM to decide whether they are duplicates
+    ambiguous: List[List[ExtractedRouDto]]
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+
+def _merge(into: ExtractedRouDto, other: ExtractedRouDto) -> ExtractedRouDto:
+    obligations = into.obligations + [o for o in other.obligations if o not in into.obligations]
+    return into.model_copy(update={"obligations": obligations})
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        root_i, root_j = self.find(i), self.find(j)
+        # the lowest index stays the representative
+        if root_i != root_j:
+            self.parent[max(root_i, root_j)] = min(root_i, root_j)
+
+
+class RouPreDedup:
+    """
+    Local deduplication of chunk ROUs before the LLM reduce.
+
+    1. Collapses exact and normalized-text duplicates of `canonical_text` within a jurisdiction.
+    2. Collapses ROUs of the same jurisdiction whose `canonical_text` embeddings
+       have a cosine similarity of at least `prededup_merge_threshold`.
+    3. Groups the remaining ROUs with a similarity of at least
+       `prededup_ambiguous_threshold` into ambiguous clusters for the LLM.
+    """
+
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        rou_extraction_config: RouExtractionConfigDep,
+        rou_index_config: RouIndexConfigDep,
+    ):
+        # the configured provider, so calls are rate limited and accounted like all embeddings
+        self.embedding_provider = embedding_provider
+        self.config = rou_extraction_config
+        self.index_config = rou_index_config
+
+    async def _similarity(self, rous: List[ExtractedRouDto]) -> np.ndarray:
+        texts = [rou.canonical_text for rou in rous]
+        batches = batch_by_tokens(
+            texts,
+            self.index_config.embedding_batch_token_budget,
+            self.index_config.embedding_batch_max_inputs,
+        )
+        embedded = await asyncio.gather(
+            *(
+                self.embedding_provider.embed([texts[i] for i in batch], stage="rou_prededup")
+                for batch in batches
+            )
+        )
+        vectors = np.asarray(
+            [embedding for batch in embedded for embedding in batch], dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        # a zero vector would turn all of its similarities into NaN; it stays zero instead
+        vectors /= np.where(norms == 0, 1, norms)
+        return vectors @ vectors.T
+
+    async def run(self, chunk_rous: List[List[ExtractedRouDto]]) -> PreDedupResult:
+        # 1. exact and normalized-text duplicates
+        rous: List[ExtractedRouDto] = []
+        chunk_ids: List[int] = []
+        by_text: dict[tuple[str, str], int] = {}
+        for chunk_id, chunk in enumerate(chunk_rous):
+            for rou in chunk:
+                key = (_normalize(rou.canonical_text), _normalize(rou.jurisdiction))
+                if key in by_text:
+                    rous[by_text[key]] = _merge(rous[by_text[key]], rou)
+                    continue
+                by_text[key] = len(rous)
+                rous.append(rou)
+                chunk_ids.append(chunk_id)
+
+        if len(rous) < 2:
+            return PreDedupResult(rous_lists=[rous] if rous else [], unique=rous, ambiguous=[])
+
+        # 2. near-verbatim duplicates within the same jurisdiction
+        similarity = await self._similarity(rous)
+        jurisdictions = np.array([_normalize(rou.jurisdiction) for rou in rous])
+        same_jurisdiction = jurisdictions[:, None] == jurisdictions[None, :]
+
+        is_duplicate = (similarity >= self.config.prededup_merge_threshold) & same_jurisdiction
+
+        duplicates = _UnionFind(len(rous))
+        for i, j in zip(*np.nonzero(np.triu(is_duplicate, k=1))):
+            duplicates.union(int(i), int(j))
+
+        merged: dict[int, ExtractedRouDto] = {}
+        for i, rou in enumerate(rous):
+            root = duplicates.find(i)
+            merged[root] = _merge(merged[root], rou) if root in merged else rou
+
+        # 3. ambiguous clusters among the survivors
+        survivors = sorted(merged)
+        is_similar = (
+            similarity[np.ix_(survivors, survivors)] >= self.config.prededup_ambiguous_threshold
+        )
+
+        clusters = _UnionFind(len(survivors))
+        for i, j in zip(*np.nonzero(np.triu(is_similar, k=1))):
+            clusters.union(int(i), int(j))
+
+        groups: dict[int, List[ExtractedRouDto]] = {}
+        for i, index in enumerate(survivors):
+            groups.setdefault(clusters.find(i), []).append(merged[index])
+
+        rous_lists: List[List[ExtractedRouDto]] = [[] for _ in chunk_rous]
+        for index in survivors:
+            rous_lists[chunk_ids[index]].append(merged[index])
+
+        result = PreDedupResult(
+            rous_lists=[rous for rous in rous_lists if rous],
+            unique=[group[0] for group in groups.values() if len(group) == 1],
+            ambiguous=[group for group in groups.values() if len(group) > 1],
+        )
+        print(
+            f"Pre-dedup: {sum(len(c) for c in chunk_rous)} ROUs -> {len(survivors)} "
+            f"({len(result.unique)} unique, {len(result.ambiguous)} ambiguous clusters)"
+        )
+        return result
+
+
+@lru_cache
+def get_rou_prededup() -> RouPreDedup:
+    """Pre-dedup shared by all requests of the process."""
+    app_config = get_app_config()
+    return RouPreDedup(
+        embedding_provider=get_embedding_provider(),
+        rou_extraction_config=app_config.rou_extraction,
+        rou_index_config=app_config.rou_index,
+    )
+
+
+RouPreDedupDep = Annotated[RouPreDedup, Depends(get_rou_prededup)]
@@ -0,0 +1,383 @@
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+import random
+import statistics
+import time
+from typing import Annotated, List, Optional
+
+from fastapi import Depends
+
+from app.clients.rou_vector_store import (
+    ActiveRouVectorStoreDep,
+    RouVectorStore,
+    get_active_rou_vector_store,
+    rou_index_embedding_config,
+    rou_metadata,
+)
+from app.config.app_config import get_app_config
+from app.config.models.embedding_config import EmbeddingConfig
+from app.database.repositories.rou_index_version_repository import (
+    RouIndexVersionRepositoryDep,
+    rou_index_version_repository_context,
+)
+from app.database.repositories.rou_repository import RouRepositoryDep, rou_repository_context
+from app.database.schemas.enums.rou_index_version_status import RouIndexVersionStatus
+from app.database.schemas.rou_index_version import RouIndexVersion
+from app.dtos.rou_index_dto import (
+    RouIndexRecallDTO,
+    RouIndexRecallExampleDTO,
+    RouIndexRecallReportDTO,
+    RouIndexSwitchResultDTO,
+    RouIndexVersionDTO,
+)
+from app.services.regulation.rou_index_service import RouIndexService
+
+# slack on top of the refresh interval for processes to pick up a switch
+_SWITCH_GRACE_SECONDS = 10
+
+
+class RouIndexMigrationService:
+    """
+    Moves the ROU vector index to other embedding settings without downtime.
+
+    A new version is built next to the active one: ROUs are streamed from
+    Postgres in id order, embedded and written to the version's own
+    collection (or rows, with pgvector), with a checkpoint after every page.
+    Searches keep using the active version until `switch` activates the new
+    one, which every process picks up within `active_refresh_interval_seconds`.
+    """
+
+    def __init__(
+        self,
+        rou_repository: RouRepositoryDep,
+        rou_index_version_repository: RouIndexVersionRepositoryDep,
+        active_rou_vector_store: ActiveRouVectorStoreDep,
+    ):
+        self.rou_repository = rou_repository
+        self.rou_index_version_repository = rou_index_version_repository
+        self.active_rou_vector_store = active_rou_vector_store
+        self.backend = get_app_config().rou_index.backend
+
+    async def _get_version(self, version_id: int) -> RouIndexVersion:
+        version = await self.rou_index_version_repository.get_one_by_id(version_id)
+        if version is None or version.backend != self.backend:
+            raise LookupError(f"ROU index version {version_id} of backend {self.backend} not found")
+        return version
+
+    def _get_store(self, version: RouIndexVersion) -> RouVectorStore:
+        return self.active_rou_vector_store.get_store(rou_index_embedding_config(version))
+
+    async def _get_or_record_active(self) -> RouIndexVersion:
+        active = await self.rou_index_version_repository.get_active(self.backend)
+        if active is not None:
+            return active
+        # the index of the `embedding` config, recorded so it can be switched back to
+        embedding_config = get_app_config().embedding
+        return await self.rou_index_version_repository.create(
+            RouIndexVersion(
+                backend=self.backend,
+                provider=embedding_config.provider,
+                openai_model=embedding_config.openai_model,
+                openai_dimensions=embedding_config.openai_dimensions,
+                model=embedding_config.model,
+                status=RouIndexVersionStatus.ACTIVE,
+                last_rou_id=0,
+                embedded=0,
+            )
+        )
+
+    async def list_versions(self) -> List[RouIndexVersionDTO]:
+        versions = await self.rou_index_version_repository.get_by_filter(backend=self.backend)
+        return [
+            RouIndexVersionDTO.model_validate(version)
+            for version in sorted(versions, key=lambda v: v.id)
+        ]
+
+    async def start(self, embedding_config: EmbeddingConfig) -> RouIndexVersionDTO:
+        """
+        Register a new index version to build.
+
+        Args:
+            embedding_config (EmbeddingConfig): Settings the version is embedded with.
+
+        Returns:
+            RouIndexVersionDTO: The version, in BUILDING status.
+
+        Raises:
+            ValueError: If a version of the same embedding model is active or not dropped yet.
+        """
+        active = await self._get_or_record_active()
+        existing = await self.rou_index_version_repository.get_by_filter(
+            backend=self.backend,
+            model=embedding_config.model,
+            status=[
+                RouIndexVersionStatus.BUILDING,
+                RouIndexVersionStatus.READY,
+                RouIndexVersionStatus.ACTIVE,
+                RouIndexVersionStatus.RETIRED,
+            ],
+        )
+        if existing:
+            raise ValueError(
+                f"Version {existing[0].id} already indexes {embedding_config.model} "
+                f"({existing[0].status}); build, switch to or drop it instead"
+            )
+
+        version = await self.rou_index_version_repository.create(
+            RouIndexVersion(
+                backend=self.backend,
+                provider=embedding_config.provider,
+                openai_model=embedding_config.openai_model,
+                openai_dimensions=embedding_config.openai_dimensions,
+                model=embedding_config.model,
+                status=RouIndexVersionStatus.BUILDING,
+                last_rou_id=0,
+                embedded=0,
+            )
+        )
+        print(
+            f"Created version {version.id} ({version.model}) "
+            f"next to version {active.id} ({active.model})"
+        )
+        return RouIndexVersionDTO.model_validate(version)
+
+    async def build(
+        self, version_id: int, batch_size: int = 1000, max_per_second: Optional[float] = None
+    ) -> RouIndexVersionDTO:
+        """
+        Embed the ROUs into a version, resuming after its checkpoint.
+
+        ROUs created while it runs are picked up as well, as they have higher
+        ids. If a page fails, the checkpoint stays before it; running it again
+        resumes there.
+
+        Args:
+            version_id (int): A BUILDING or READY version.
+            batch_size (int): ROUs per page, and per checkpoint.
+            max_per_second (Optional[float]): Embeddings per second not to exceed,
+                to leave embedding quota and CPU to the live traffic.
+
+        Returns:
+            RouIndexVersionDTO: The version, READY once every ROU was embedded.
+        """
+        version = await self._get_version(version_id)
+        if version.status not in (RouIndexVersionStatus.BUILDING, RouIndexVersionStatus.READY):
+            raise ValueError(f"Version {version.id} is {version.status}; only new versions are built")
+        store = self._get_store(version)
+
+        processed, after_id = 0, version.last_rou_id
+        started = time.perf_counter()
+        while rous := await self.rou_repository.get_page(after_id=after_id, limit=batch_size):
+            await store.index(
+                [str(rou.id) for rou in rous],
+                [rou.canonical_text for rou in rous],
+                [rou_metadata(rou) for rou in rous],
+            )
+            processed += len(rous)
+            after_id = rous[-1].id
+            await self.rou_index_version_repository.save_checkpoint(version.id, after_id, len(rous))
+
+            elapsed = time.perf_counter() - started
+            if max_per_second:
+                await asyncio.sleep(max(processed / max_per_second - elapsed, 0))
+            rate = processed / (time.perf_counter() - started)
+            print(
+                f"Version {version.id}: embedded up to ROU {after_id} "
+                f"({processed} ROUs, {rate:.1f} embeddings/s)"
+            )
+
+        if version.status == RouIndexVersionStatus.BUILDING:
+            await self.rou_index_version_repository.set_status(version.id, RouIndexVersionStatus.READY)
+        return RouIndexVersionDTO.model_validate(
+            await self.rou_index_version_repository.reload(version)
+        )
+
+    @staticmethod
+    async def _search_sample(
+        store: RouVectorStore, queries: List[str], k: int
+    ) -> tuple[List[List[int]], float]:
+        hits: List[List[int]] = []
+        latencies: List[float] = []
+        for query in queries:
+            started = time.perf_counter()
+            hits.append([hit.rou_id for hit in await store.query(query, n_results=k)])
+            latencies.append((time.perf_counter() - started) * 1000)
+        return hits, statistics.median(latencies) if latencies else 0
+
+    async def report(
+        self, version_id: int, sample_size: int = 200, k: int = 10, max_examples: int = 10
+    ) -> RouIndexRecallReportDTO:
+        """
+        Compare a version with the active one on a random sample of ROUs.
+
+        Each sampled ROU's description is searched in both indexes; an index
+        recalls the ROU if it is among the top k hits.
+
+        Args:
+            version_id (int): The candidate version, usually READY.
+            sample_size (int): ROUs to search for.
+            k (int): Hits per search.
+            max_examples (int): Queries to list where only one index recalls the ROU.
+
+        Returns:
+            RouIndexRecallReportDTO: Recall and latency of both and the overlap of their hits.
+        """
+        active = await self._get_or_record_active()
+        candidate = await self._get_version(version_id)
+
+        rou_ids = await self.rou_repository.get_ids()
+        sample = random.sample(rou_ids, min(sample_size, len(rou_ids)))
+        rous = await self.rou_repository.get_many_by_ids(sample)
+        queries = [rou.desc for rou in rous]
+
+        active_hits, active_latency = await self._search_sample(self._get_store(active), queries, k)
+        candidate_hits, candidate_latency = await self._search_sample(
+            self._get_store(candidate), queries, k
+        )
+
+        examples: List[RouIndexRecallExampleDTO] = []
+        active_recalled = candidate_recalled = 0
+        overlaps: List[float] = []
+        for rou, query, active_row, candidate_row in zip(rous, queries, active_hits, candidate_hits):
+            active_rank = active_row.index(rou.id) + 1 if rou.id in active_row else None
+            candidate_rank = candidate_row.index(rou.id) + 1 if rou.id in candidate_row else None
+            active_recalled += active_rank is not None
+            candidate_recalled += candidate_rank is not None
+            overlaps.append(len(set(active_row) & set(candidate_row)) / k)
+            if (active_rank is None) != (candidate_rank is None) and len(examples) < max_examples:
+                examples.append(
+                    RouIndexRecallExampleDTO(
+                        rou_id=rou.id,
+                        query=query,
+                        active_rank=active_rank,
+                        candidate_rank=candidate_rank,
+                    )
+                )
+
+        count = max(len(rous), 1)
+        return RouIndexRecallReportDTO(
+            sample_size=len(rous),
+            k=k,
+            active=RouIndexRecallDTO(
+                version_id=active.id,
+                model=active.model,
+                recall_at_k=active_recalled / count,
+                p50_latency_ms=active_latency,
+            ),
+            candidate=RouIndexRecallDTO(
+                version_id=candidate.id,
+                model=candidate.model,
+                recall_at_k=candidate_recalled / count,
+                p50_latency_ms=candidate_latency,
+            ),
+            overlap=statistics.fmean(overlaps) if overlaps else 0,
+            examples=examples,
+        )
+
+    async def switch(self, version_id: int) -> RouIndexSwitchResultDTO:
+        """
+        Make a version the active one of all processes.
+
+        The version first catches up with Postgres: vectors of ROUs deleted
+        meanwhile are purged and ROUs without a vector are embedded. The switch
+        itself is one transaction. Processes keep writing to the old version
+        until they pick it up, so after waiting for that the version catches up
+        once more. Switching back to a RETIRED version works the same way.
+
+        The version records that this second catch-up is pending; if the switch
+        is interrupted before it, switching to the now ACTIVE version again
+        resumes with the wait and the catch-up.
+
+        Args:
+            version_id (int): A READY or RETIRED version, or the ACTIVE one of an
+                interrupted switch.
+
+        Returns:
+            RouIndexSwitchResultDTO: The activated version and both catch-ups.
+        """
+        version = await self._get_version(version_id)
+        resuming = (
+            version.status == RouIndexVersionStatus.ACTIVE and version.catch_up_after is not None
+        )
+        if not resuming and version.status not in (
+            RouIndexVersionStatus.READY,
+            RouIndexVersionStatus.RETIRED,
+        ):
+            raise ValueError(
+                f"Version {version.id} is {version.status}; only READY or RETIRED versions can be activated"
+            )
+        await self._get_or_record_active()
+        rou_index_service = RouIndexService(
+            rou_repository=self.rou_repository, rou_vector_store=self._get_store(version)
+        )
+
+        before_switch = None
+        if not resuming:
+            before_switch = await rou_index_service.reconcile(index_missing=True)
+            settle_seconds = (
+                get_app_config().rou_index.active_refresh_interval_seconds + _SWITCH_GRACE_SECONDS
+            )
+            await self.rou_index_version_repository.activate(
+                version.id,
+                self.backend,
+                catch_up_after=datetime.now(timezone.utc) + timedelta(seconds=settle_seconds),
+            )
+            await self.active_rou_vector_store.refresh()
+            version = await self.rou_index_version_repository.reload(version)
+
+        wait = (version.catch_up_after - datetime.now(timezone.utc)).total_seconds()
+        print(
+            f"Activated version {version.id}; waiting {max(wait, 0):.0f}s for all processes to switch"
+        )
+        await asyncio.sleep(max(wait, 0))
+        after_switch = await rou_index_service.reconcile(index_missing=True)
+        await self.rou_index_version_repository.set_caught_up(version.id)
+
+        return RouIndexSwitchResultDTO(
+            version=RouIndexVersionDTO.model_validate(
+                await self.rou_index_version_repository.reload(version)
+            ),
+            before_switch=before_switch,
+            after_switch=after_switch,
+        )
+
+    async def drop(self, version_id: int) -> RouIndexVersionDTO:
+        """
+        Delete the vectors of a version that is not active.
+
+        Args:
+            version_id (int): A BUILDING, READY or RETIRED version.
+
+        Returns:
+            RouIndexVersionDTO: The version, DROPPED.
+        """
+        version = await self._get_version(version_id)
+        if version.status in (RouIndexVersionStatus.ACTIVE, RouIndexVersionStatus.DROPPED):
+            raise ValueError(f"Version {version.id} is {version.status} and cannot be dropped")
+        await self._get_store(version).drop()
+        await self.rou_index_version_repository.set_status(version.id, RouIndexVersionStatus.DROPPED)
+        return RouIndexVersionDTO.model_validate(
+            await self.rou_index_version_repository.reload(version)
+        )
+
+
+RouIndexMigrationServiceDep = Annotated[
+    RouIndexMigrationService, Depends(RouIndexMigrationService)
+]
+
+
+@asynccontextmanager
+async def rou_index_migration_service_context():
+    """
+    Context manager for RouIndexMigrationService.
+    """
+    async with (
+        rou_repository_context() as rou_repo,
+        rou_index_version_repository_context() as rou_index_version_repo,
+    ):
+        yield RouIndexMigrationService(
+            rou_repository=rou_repo,
+            rou_index_version_repository=rou_index_version_repo,
+            active_rou_vector_store=get_active_rou_vector_store(),
+        )
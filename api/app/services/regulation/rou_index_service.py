@@ -0,0 +1,212 @@
+from contextlib import asynccontextmanager
+import time
+from typing import Annotated, List, Tuple
+
+from fastapi import Depends
+import numpy as np
+
+from app.clients.embedding_provider import EmbeddingProvider
+from app.clients.rou_vector_store import RouVectorStoreDep, get_rou_vector_store, rou_metadata
+from app.database.repositories.rou_repository import RouRepositoryDep, rou_repository_context
+from app.dtos.rou_index_dto import (
+    EmbeddingComparisonDTO,
+    EmbeddingThroughputDTO,
+    RouIndexReconcileResultDTO,
+)
+
+
+class RouIndexService:
+    """Maintenance of the ROU vector index against the ROUs in Postgres."""
+
+    def __init__(self, rou_repository: RouRepositoryDep, rou_vector_store: RouVectorStoreDep):
+        self.rou_repository = rou_repository
+        self.rou_vector_store = rou_vector_store
+
+    async def backfill_metadata(self, batch_size: int = 1000) -> int:
+        """
+        Write the filter metadata of every ROU onto its vector.
+
+        Vectors indexed before metadata was stored cover the whole corpus in
+        every filtered search otherwise. Running it again is harmless.
+
+        Returns:
+            int: Number of ROUs processed.
+        """
+        processed, after_id = 0, 0
+        while rous := await self.rou_repository.get_page(after_id=after_id, limit=batch_size):
+            await self.rou_vector_store.update_metadata(
+                [str(rou.id) for rou in rous], [rou_metadata(rou) for rou in rous]
+            )
+            processed += len(rous)
+            after_id = rous[-1].id
+            print(f"Backfilled vector metadata of {processed} ROUs")
+        return processed
+
+    async def reindex(self, batch_size: int = 1000) -> int:
+        """
+        Embed every ROU again and overwrite its vector in the store's index.
+
+        To move to other embedding settings, build a new index version instead,
+        see `RouIndexMigrationService`. Running it again is harmless.
+
+        Returns:
+            int: Number of ROUs processed.
+        """
+        model = self.rou_vector_store.embedding_provider.model
+        processed, after_id = 0, 0
+        started = time.perf_counter()
+        while rous := await self.rou_repository.get_page(after_id=after_id, limit=batch_size):
+            await self.rou_vector_store.index(
+                [str(rou.id) for rou in rous],
+                [rou.canonical_text for rou in rous],
+                [rou_metadata(rou) for rou in rous],
+            )
+            processed += len(rous)
+            after_id = rous[-1].id
+            rate = processed / (time.perf_counter() - started)
+            print(f"Re-embedded {processed} ROUs with {model} ({rate:.1f} embeddings/s)")
+        return processed
+
+    @staticmethod
+    async def _embed_timed(
+        provider: EmbeddingProvider, texts: List[str], batch_size: int
+    ) -> Tuple[np.ndarray, float]:
+        # one batch at a time, so throughput reflects a single indexing stream
+        embeddings: List[List[float]] = []
+        started = time.perf_counter()
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(
+                await provider.embed(texts[start : start + batch_size], stage="embedding_comparison")
+            )
+        elapsed = time.perf_counter() - started
+
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        # a zero vector stays zero rather than turning its similarities into NaN
+        matrix /= np.where(norms == 0, 1, norms)
+        return matrix, len(texts) / elapsed
+
+    async def compare_embeddings(
+        self,
+        baseline: EmbeddingProvider,
+        candidate: EmbeddingProvider,
+        sample_size: int = 1000,
+        k: int = 10,
+        batch_size: int = 100,
+    ) -> EmbeddingComparisonDTO:
+        """
+        Compare two embedding models on a sample of ROUs, without touching the index.
+
+        Each ROU's canonical text is embedded with both models, and each ROU's
+        description is searched against them by exact cosine similarity.
+
+        Args:
+            baseline (EmbeddingProvider): The model in use, e.g. OpenAI.
+            candidate (EmbeddingProvider): The model to switch to, e.g. local.
+            sample_size (int): ROUs to embed, the oldest first.
+            k (int): Hits per search.
+            batch_size (int): Texts per embedding call.
+
+        Returns:
+            EmbeddingComparisonDTO: Throughput and self-hit rate of each model and
+                the overlap of their top k hits.
+
+        Raises:
+            ValueError: If k is below 1 or there are no ROUs to compare on.
+        """
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+        rous = await self.rou_repository.get_page(after_id=0, limit=sample_size)
+        if not rous:
+            raise ValueError("No ROUs to compare the embedding models on")
+        documents = [rou.canonical_text for rou in rous]
+        queries = [rou.desc for rou in rous]
+        k = min(k, len(rous))
+
+        top_hits: List[np.ndarray] = []
+        results: List[EmbeddingThroughputDTO] = []
+        for provider in (baseline, candidate):
+            document_matrix, rate = await self._embed_timed(provider, documents, batch_size)
+            query_matrix, _ = await self._embed_timed(provider, queries, batch_size)
+            similarities = query_matrix @ document_matrix.T
+            hits = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+            top_hits.append(hits)
+            results.append(
+                EmbeddingThroughputDTO(
+                    model=provider.model,
+                    embeddings_per_second=rate,
+                    self_hit_rate=float(np.mean([i in row for i, row in enumerate(hits)])),
+                )
+            )
+
+        overlaps = [
+            len(set(baseline_row) & set(candidate_row)) / k
+            for baseline_row, candidate_row in zip(*top_hits)
+        ]
+        return EmbeddingComparisonDTO(
+            sample_size=len(rous),
+            k=k,
+            baseline=results[0],
+            candidate=results[1],
+            agreement=float(np.mean(overlaps)),
+        )
+
+    async def reconcile(
+        self, dry_run: bool = False, index_missing: bool = False, compact: bool = False
+    ) -> RouIndexReconcileResultDTO:
+        """
+        Bring the vector index in line with the ROUs in Postgres.
+
+        Vectors whose ROU was deleted (orphans) are purged in batches. ROUs
+        left without a vector, e.g. by a failed `store_rous` or as the provisional
+        chunk ROUs of a running extraction, are only counted unless `index_missing`
+        is set, as indexing them costs embedding calls.
+
+        Args:
+            dry_run (bool): Only count orphans and missing vectors.
+            index_missing (bool): Embed and write the missing vectors.
+            compact (bool): Rebuild the vector index afterwards, see `RouVectorStore.compact`.
+
+        Returns:
+            RouIndexReconcileResultDTO: What was found and done.
+        """
+        # vectors first: a ROU's row commits before its vector is written, so a ROU
+        # stored between the two reads shows up as missing, never as an orphan
+        vector_ids = set(await self.rou_vector_store.list_ids())
+        rou_ids = {str(rou_id) for rou_id in await self.rou_repository.get_ids()}
+        orphans = sorted(vector_ids - rou_ids, key=int)
+        missing = sorted(rou_ids - vector_ids, key=int)
+        result = RouIndexReconcileResultDTO(
+            rous=len(rou_ids), vectors=len(vector_ids), orphans=len(orphans), missing=len(missing)
+        )
+        if dry_run:
+            return result
+
+        await self.rou_vector_store.delete(orphans)
+        result.orphans_purged = len(orphans)
+
+        if index_missing and missing:
+            rous = await self.rou_repository.get_many_by_ids([int(rou_id) for rou_id in missing])
+            await self.rou_vector_store.index(
+                [str(rou.id) for rou in rous],
+                [rou.canonical_text for rou in rous],
+                [rou_metadata(rou) for rou in rous],
+            )
+            result.missing_indexed = len(rous)
+
+        if compact:
+            await self.rou_vector_store.compact()
+            result.compacted = True
+        return result
+
+
+RouIndexServiceDep = Annotated[RouIndexService, Depends(RouIndexService)]
+
+
+@asynccontextmanager
+async def rou_index_service_context():
+    """
+    Context manager for RouIndexService.
+    """
+    async with rou_repository_context() as rou_repo:
+        yield RouIndexService(rou_repository=rou_repo, rou_vector_store=get_rou_vector_store())
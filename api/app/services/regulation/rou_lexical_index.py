@@ -0,0 +1,202 @@
+import asyncio
+from collections import Counter, defaultdict
+from functools import lru_cache
+import heapq
+import math
+import re
+import traceback
+from typing import Annotated, Dict, Iterable, List, NamedTuple, Optional
+
+from fastapi import Depends
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.clients.rou_vector_store import normalize_jurisdiction
+from app.config.app_config import get_app_config
+from app.config.models.rou_retrieval_config import RouRetrievalConfig
+from app.database.repositories.rou_repository import rou_repository_context
+from app.database.schemas.rou import ROU
+from app.dtos.rou_dto import RouDto
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_ALPHANUMERIC_PARTS = re.compile(r"[a-z]+|[0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-cased word tokens for BM25.
+
+    Tokens mixing letters and digits also yield their parts, so "SB976"
+    matches "SB 976" and "sb-976" and vice versa.
+    """
+    tokens: List[str] = []
+    for token in _TOKEN.findall(text.lower()):
+        tokens.append(token)
+        parts = _ALPHANUMERIC_PARTS.findall(token)
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def _rou_text(rou: ROU | RouDto) -> str:
+    return " ".join([rou.canonical_text, rou.desc, *rou.obligations, rou.jurisdiction])
+
+
+class _Doc(NamedTuple):
+    jurisdiction: str
+    source_id: int
+    length: int
+
+
+class RouLexicalIndex:
+    """
+    In-process BM25 index over the ROUs, complementing vector search on exact terms.
+
+    It holds every ROU anyway, so it also serves them by id; search results are
+    hydrated from it without a Postgres round trip.
+
+    Every process keeps its own copy, loaded from Postgres on `start`. Stores
+    and deletes made by the process update it right away; those of other
+    processes are picked up every `refresh_interval_seconds`. Until the first
+    load finishes, searches return nothing and callers fall back to vector
+    search alone and to Postgres for the rows.
+    """
+
+    def __init__(self, config: RouRetrievalConfig):
+        self.config = config
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._docs: Dict[int, _Doc] = {}
+        self._rous: Dict[int, RouDto] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._total_length = 0
+        self._refresh: asyncio.Task[None] | None = None
+        # ids added while `refresh` reads the ids in Postgres, which its snapshot may miss
+        self._added_during_refresh: set[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, rous: Iterable[ROU]) -> None:
+        """Index ROUs, replacing ROUs with the same ids."""
+        for rou in rous:
+            self.remove([rou.id])
+            if self._added_during_refresh is not None:
+                self._added_during_refresh.add(rou.id)
+            self._rous[rou.id] = RouDto.model_validate(rou)
+            term_counts = Counter(tokenize(_rou_text(rou)))
+            for term, count in term_counts.items():
+                self._postings[term][rou.id] = count
+            length = sum(term_counts.values())
+            self._docs[rou.id] = _Doc(
+                normalize_jurisdiction(rou.jurisdiction), rou.source_id, length
+            )
+            self._doc_terms[rou.id] = list(term_counts)
+            self._total_length += length
+
+    def remove(self, rou_ids: Iterable[int]) -> None:
+        """Drop ROUs from the index; unknown ids are ignored."""
+        for rou_id in rou_ids:
+            doc = self._docs.pop(rou_id, None)
+            if doc is None:
+                continue
+            del self._rous[rou_id]
+            for term in self._doc_terms.pop(rou_id):
+                postings = self._postings[term]
+                del postings[rou_id]
+                if not postings:
+                    del self._postings[term]
+            self._total_length -= doc.length
+
+    def get(self, rou_ids: Iterable[int]) -> Dict[int, RouDto]:
+        """The indexed ROUs among `rou_ids`, by id."""
+        return {rou_id: self._rous[rou_id] for rou_id in rou_ids if rou_id in self._rous}
+
+    def search(
+        self,
+        query: str,
+        n_results: int = 10,
+        jurisdictions: Optional[List[str]] = None,
+        regulation_ids: Optional[List[int]] = None,
+    ) -> List[int]:
+        """
+        Rank ROUs by BM25 score for a query.
+
+        Args:
+            query (str): Free-text query.
+            n_results (int): Maximum number of ROUs to return.
+            jurisdictions (Optional[List[str]]): Only ROUs of these jurisdictions.
+            regulation_ids (Optional[List[int]]): Only ROUs of these regulations.
+
+        Returns:
+            List[int]: IDs of the ROUs sharing terms with the query, best first.
+        """
+        if not self._docs:
+            return []
+
+        allowed_jurisdictions = (
+            {normalize_jurisdiction(j) for j in jurisdictions} if jurisdictions else None
+        )
+        allowed_sources = set(regulation_ids) if regulation_ids else None
+        k1, b = self.config.bm25_k1, self.config.bm25_b
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for rou_id, count in postings.items():
+                doc = self._docs[rou_id]
+                if allowed_jurisdictions and doc.jurisdiction not in allowed_jurisdictions:
+                    continue
+                if allowed_sources and doc.source_id not in allowed_sources:
+                    continue
+                length_norm = 1 - b + b * doc.length / average_length
+                scores[rou_id] += idf * count * (k1 + 1) / (count + k1 * length_norm)
+
+        return heapq.nlargest(n_results, scores, key=scores.__getitem__)
+
+    async def refresh(self, batch_size: int = 1000) -> None:
+        """Sync with the ROUs in Postgres, loading only the rows not indexed yet."""
+        self._added_during_refresh = set()
+        try:
+            async with rou_repository_context() as rou_repository:
+                current_ids = set(await rou_repository.get_ids())
+                current_ids |= self._added_during_refresh
+                self.remove([rou_id for rou_id in self._docs if rou_id not in current_ids])
+
+                missing = sorted(current_ids - self._docs.keys())
+                for start in range(0, len(missing), batch_size):
+                    self.add(
+                        await rou_repository.get_many_by_ids(missing[start : start + batch_size])
+                    )
+        finally:
+            self._added_during_refresh = None
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except (SQLAlchemyError, OSError):
+                print("Failed to refresh the ROU lexical index")
+                traceback.print_exc()
+            await asyncio.sleep(self.config.refresh_interval_seconds)
+
+    def start(self) -> None:
+        if self._refresh is None:
+            self._refresh = asyncio.create_task(self._refresh_periodically())
+
+    def stop(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+            self._refresh = None
+
+
+@lru_cache
+def get_rou_lexical_index() -> RouLexicalIndex:
+    """ROU lexical index shared by all requests of the process."""
+    return RouLexicalIndex(get_app_config().rou_retrieval)
+
+
+RouLexicalIndexDep = Annotated[RouLexicalIndex, Depends(get_rou_lexical_index)]
@@ -1,20 +1,43 @@
+import asyncio
+from contextlib import asynccontextmanager
 from io import BytesIO
 import logging
-from typing import Annotated, List
-from chromadb.api.models.Collection import Collection
+from typing import Annotated, AsyncIterator, List
 from fastapi import Depends
 
+from app.database.schemas.enums.extraction_status import ExtractionStatus
 from app.database.schemas.enums.rou_type import RouType
 from app.dtos.extraction_result import ExtractedRouDto
-from app.dtos.regulation_dto import RegulationDTO
+from app.dtos.regulation_dto import RegulationDTO, RegulationProgressUpdateDTO
 from app.dtos.rou_dto import RouDto
-from app.clients.chromadb_client import ROU_COLLECTION_NAME, ChromaDbClientDep
+from app.clients.rou_vector_store import (
+    RouIndexingError,
+    RouVectorStoreDep,
+    get_rou_vector_store,
+    rou_metadata,
+)
 from app.database.schemas.rou import ROU
-from app.services.regulation.pdf_reader import read_pdf
-from app.services.regulation.regulation_service import RegulationServiceDep
-from app.services.supabase.supabase_storage_service import SupabaseStorageServiceDep
-from app.services.regulation.rou_extraction.map_reduce_rou_extractor import MapReduceRouExtractorDep
-from app.database.repositories.rou_repository import RouRepositoryDep
+from app.services.regulation.pdf_reader import (
+    PdfPage,
+    aiter_page_texts,
+    aiter_pdf_pages,
+    get_cached_page_texts,
+)
+from app.services.regulation.rou_lexical_index import RouLexicalIndexDep, get_rou_lexical_index
+from app.services.regulation.regulation_service import (
+    RegulationServiceDep,
+    regulation_service_context,
+)
+from app.services.supabase.supabase_storage_service import (
+    SupabaseStorageServiceDep,
+    supabase_storage_service_context,
+)
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import (
+    MapReduceRouExtractorDep,
+    get_map_reduce_rou_extractor,
+)
+from app.database.repositories.rou_repository import RouRepositoryDep, rou_repository_context
+from app.services.usage.llm_usage_recorder import usage_callbacks
 
 
 class RouService:
@@ -23,41 +46,179 @@ class RouService:
         rou_repository: RouRepositoryDep,
         rou_extractor: MapReduceRouExtractorDep,
         supabase_storage_service: SupabaseStorageServiceDep,
-        chromadb_client: ChromaDbClientDep,
+        rou_vector_store: RouVectorStoreDep,
+        rou_lexical_index: RouLexicalIndexDep,
         regulation_service: RegulationServiceDep,
     ):
         self.rou_repository = rou_repository
         self.rou_extractor = rou_extractor
         self.supabase_storage_service = supabase_storage_service
-        self.chromadb_client = chromadb_client
+        self.rou_vector_store = rou_vector_store
+        self.rou_lexical_index = rou_lexical_index
         self.regulation_service = regulation_service
 
     async def extract_from_bytes(self, bytes_io: BytesIO) -> List[ExtractedRouDto]:
-        content = read_pdf(bytes_io)
+        return await self.rou_extractor.extract_pages(
+            aiter_pdf_pages(bytes_io), callbacks=usage_callbacks("rou_extraction")
+        )
+
+    async def store_rous(
+        self, rous: List[ExtractedRouDto], source_id: int, index_vectors: bool = True
+    ) -> List[RouDto]:
+        """
+        Store ROUs in Postgres and the lexical index, and embed them into the vector index.
 
-        return await self.rou_extractor.extract(content)
+        Args:
+            rous (List[ExtractedRouDto]): The ROUs to store.
+            source_id (int): The regulation they were extracted from.
+            index_vectors (bool): Embed and write their vectors. Off for provisional ROUs
+                that are soon replaced, which stay findable by keyword meanwhile.
+        """
+        if not rous:
+            return []
 
-    async def store_rous(self, rous: List[ExtractedRouDto], source_id: int) -> List[RouDto]:
-        inserted_rous = await self.rou_repository.create_many(
-            [ROU(type=RouType.AI, source_id=source_id, **rou.model_dump()) for rou in rous]
+        # embed while the rows are inserted; the vectors only need the ids to be written
+        documents = [rou.canonical_text for rou in rous]
+        embeddings = (
+            asyncio.create_task(self.rou_vector_store.embed_documents(documents))
+            if index_vectors
+            else None
         )
+        try:
+            inserted_rous = await self.rou_repository.create_many(
+                [ROU(type=RouType.AI, source_id=source_id, **rou.model_dump()) for rou in rous]
+            )
+        except BaseException:
+            if embeddings is not None:
+                embeddings.cancel()
+            raise
         print(f"Stored {len(rous)} ROUs for regulation {source_id} into postgreSQL")
+        self.rou_lexical_index.add(inserted_rous)
 
-        rous_collection: Collection = self.chromadb_client.get_collection(ROU_COLLECTION_NAME)
-        ids = [str(rou.id) for rou in inserted_rous]
-        documents = [rou.canonical_text for rou in inserted_rous]
-        rous_collection.add(ids=ids, documents=documents)
-        print(f"Stored {len(inserted_rous)} ROUs for regulation {source_id} into ChromaDB")
+        if embeddings is not None:
+            ids = [str(rou.id) for rou in inserted_rous]
+            try:
+                vectors = await embeddings
+            except Exception as e:
+                raise RouIndexingError(ids, e) from e
+            await self.rou_vector_store.upsert(
+                ids, documents, vectors, [rou_metadata(rou) for rou in inserted_rous]
+            )
+            print(f"Stored {len(inserted_rous)} ROUs for regulation {source_id} into ChromaDB")
 
         return [RouDto.model_validate(rou) for rou in inserted_rous]
 
-    async def extract_from_regulation(self, regulation: RegulationDTO) -> List[RouDto]:
+    async def delete_rous(self, rou_ids: List[int]) -> None:
+        if not rou_ids:
+            return
+
+        await self.rou_repository.delete_many_by_ids(rou_ids)
+        self.rou_lexical_index.remove(rou_ids)
+        await self.rou_vector_store.delete([str(rou_id) for rou_id in rou_ids])
+
+    async def _get_pages(self, regulation: RegulationDTO) -> AsyncIterator[PdfPage]:
+        file_object = await self.supabase_storage_service.get_file_object(regulation.file_object_id)
+
+        # Skip the download entirely when the text of this exact file was extracted before
+        page_texts = (
+            await asyncio.to_thread(get_cached_page_texts, file_object.content_hash)
+            if file_object.content_hash
+            else None
+        )
+        if page_texts is not None:
+            print(f"Using cached text for regulation {regulation.id}")
+            return aiter_page_texts(page_texts)
+
         file_bytes = await self.supabase_storage_service.download_file(regulation.file_object_id)
-        file_stream = BytesIO(file_bytes)
+        return aiter_pdf_pages(BytesIO(file_bytes), use_cache=file_object.content_hash is None)
+
+    async def extract_from_regulation(self, regulation: RegulationDTO) -> List[RouDto]:
+        """
+        Extract and store the ROUs of a regulation, recording progress on the regulation row.
 
-        extracted_rous = await self.extract_from_bytes(file_stream)
+        Each chunk's ROUs are stored as soon as the chunk is extracted, so finished work
+        survives a crash. They go to Postgres and the lexical index only: once the
+        deduplication pass completes, the deduplicated ROUs replace them and only those
+        are embedded. A retried extraction starts by deleting the AI ROUs left behind by
+        the failed attempt, so they are not stored twice.
+        """
+        status = ExtractionStatus.EXTRACTING
+        chunks_total = chunks_done = chunks_failed = 0
 
-        return await self.store_rous(extracted_rous, regulation.id)
+        async def report_progress():
+            await self.regulation_service.update_extraction_progress(
+                regulation.id,
+                RegulationProgressUpdateDTO(
+                    extraction_status=status,
+                    chunks_total=chunks_total,
+                    chunks_done=chunks_done,
+                    chunks_failed=chunks_failed,
+                ),
+            )
+
+        await report_progress()
+
+        chunk_rou_ids: List[int] = []
+        final_rous: List[RouDto] = []
+        try:
+            # A previous attempt may have died mid-way; its chunk ROUs are only known by regulation
+            await self.delete_rous(
+                await self.rou_repository.get_ids(source_id=regulation.id, rou_type=RouType.AI)
+            )
+
+            pages = await self._get_pages(regulation)
+
+            async for event in self.rou_extractor.astream_pages(
+                pages, callbacks=usage_callbacks("rou_extraction", regulation_id=regulation.id)
+            ):
+                match event.kind:
+                    case "chunk_generated":
+                        chunks_total += 1
+                        continue
+                    case "chunk_extracted":
+                        stored = await self.store_rous(
+                            event.rous, regulation.id, index_vectors=False
+                        )
+                        chunk_rou_ids.extend(rou.id for rou in stored)
+                        chunks_done += 1
+                    case "chunk_failed":
+                        chunks_failed += 1
+                    case "deduplicating":
+                        status = ExtractionStatus.DEDUPLICATING
+                    case "completed":
+                        final_rous = await self.store_rous(event.rous, regulation.id)
+                        # chunk ROUs have no vectors unless `reconcile --index-missing` ran
+                        # meanwhile; deleting absent vectors is a no-op
+                        await self.delete_rous(chunk_rou_ids)
+                        status = ExtractionStatus.COMPLETED
+
+                await report_progress()
+        except Exception:
+            status = ExtractionStatus.FAILED
+            await report_progress()
+            raise
+
+        return final_rous
 
 
 RouServiceDep = Annotated[RouService, Depends(RouService)]
+
+
+@asynccontextmanager
+async def rou_service_context():
+    """
+    Context manager for RouService.
+    """
+    async with (
+        rou_repository_context() as rou_repo,
+        supabase_storage_service_context() as supabase_storage_service,
+        regulation_service_context() as regulation_service,
+    ):
+        yield RouService(
+            rou_repository=rou_repo,
+            rou_extractor=get_map_reduce_rou_extractor(),
+            supabase_storage_service=supabase_storage_service,
+            rou_vector_store=get_rou_vector_store(),
+            rou_lexical_index=get_rou_lexical_index(),
+            regulation_service=regulation_service,
+        )
@@ -6,6 +6,7 @@ from fastapi import Depends, UploadFile
 from storage3.types import UploadResponse
 
 from app.dtos.file_object_dto import FileObjectDTO
+from app.services.cache.disk_cache import content_hash
 from app.database.schemas.file_object import FileObject
 from app.database.repositories.file_object_repository import (
     FileObjectRepositoryDep,
@@ -29,13 +30,14 @@ class SupabaseStorageService:
                 file.content_type or "application/octet-stream",
             )
             bytes = await file.read()
+            file_hash = content_hash(bytes)
 
             res: UploadResponse = await self.supabase_client.storage.from_(bucket_name).upload(
                 filename, bytes, {"content-type": content_type}
             )
 
             inserted = await self.file_object_repository.create(
-                FileObject(bucket_name=bucket_name, path=res.path)
+                FileObject(bucket_name=bucket_name, path=res.path, content_hash=file_hash)
             )
             return FileObjectDTO.model_validate(inserted)
         except Exception as e:
@@ -46,6 +48,13 @@ class SupabaseStorageService:
 
         return file_objects
 
+    async def get_file_object(self, file_object_id: UUID) -> FileObjectDTO:
+        file_object = await self.file_object_repository.get_one_by_id(file_object_id)
+        if not file_object:
+            raise LookupError(f"FileObject with ID {file_object_id} not found.")
+
+        return FileObjectDTO.model_validate(file_object)
+
     async def download_file(self, file_object_id: UUID) -> bytes:
         """Downloads a file from the specified Supabase storage bucket."""
         file_object: FileObject = await self.file_object_repository.get_one_by_id(file_object_id)
@@ -0,0 +1,271 @@
+import asyncio
+from functools import lru_cache
+import time
+import traceback
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import AsyncCallbackHandler, BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.app_config import get_app_config
+from app.config.models.llm_usage_config import ModelPrice
+from app.database.repositories.llm_usage_repository import llm_usage_repository_context
+from app.database.schemas.enums.llm_usage_kind import LlmUsageKind
+from app.services.cache.llm_response_cache import LLM_CACHE_HIT_KEY
+
+# chat model metadata naming the stage of its calls, e.g. metadata={LLM_STAGE_KEY: "rou_dedup"}
+LLM_STAGE_KEY = "llm_stage"
+
+
+class LlmUsageRecorder:
+    """
+    Buffers usage rows and inserts them into `llm_usage` in batches.
+
+    A batch is written once `batch_size` rows are buffered or every
+    `flush_interval_seconds`, whichever comes first; the rest is written on `stop`.
+    Write failures are logged and the batch dropped, so accounting never fails a run.
+    """
+
+    def __init__(self, batch_size: int, flush_interval_seconds: float):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._rows: list[dict[str, Any]] = []
+        self._flushes: set[asyncio.Task[None]] = set()
+        self._periodic_flush: asyncio.Task[None] | None = None
+
+    def record(self, **row: Any) -> None:
+        self._rows.append(row)
+        if len(self._rows) >= self.batch_size:
+            task = asyncio.get_running_loop().create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def flush(self) -> None:
+        rows, self._rows = self._rows, []
+        if not rows:
+            return
+        try:
+            async with llm_usage_repository_context() as llm_usage_repository:
+                await llm_usage_repository.insert_many(rows)
+        except (SQLAlchemyError, OSError):
+            print(f"Dropping {len(rows)} LLM usage rows")
+            traceback.print_exc()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._periodic_flush is None:
+            self._periodic_flush = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        if self._periodic_flush is not None:
+            self._periodic_flush.cancel()
+            self._periodic_flush = None
+        await asyncio.gather(*self._flushes)
+        await self.flush()
+
+
+@lru_cache
+def get_llm_usage_recorder() -> LlmUsageRecorder:
+    """Usage recorder shared by all runs of the process."""
+    config = get_app_config().llm_usage
+    return LlmUsageRecorder(
+        batch_size=config.batch_size, flush_interval_seconds=config.flush_interval_seconds
+    )
+
+
+def _get_price(model: str | None) -> ModelPrice | None:
+    if model is None:
+        return None
+    prices = get_app_config().llm_usage.prices
+    matches = [name for name in prices if model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+def _cost_usd(
+    model: str | None, prompt_tokens: int, completion_tokens: int, cached_tokens: int
+) -> float:
+    price = _get_price(model)
+    if price is None:
+        return 0.0
+    return (
+        (prompt_tokens - cached_tokens) * price.input
+        + cached_tokens * price.cached_input
+        + completion_tokens * price.output
+    ) / 1_000_000
+
+
+def record_embedding_usage(
+    stage: str, model: str, latency_ms: float, prompt_tokens: int = 0, error: str | None = None
+) -> None:
+    """
+    Record one embedding call; embedding models are not LangChain runs, so no callback sees them.
+
+    Args:
+        stage (str): What the texts were embedded for, e.g. "rou_query".
+        model (str): The embedding model, priced by `llm_usage.prices` like chat models.
+        latency_ms (float): Duration of the call.
+        prompt_tokens (int): Tokens reported by the API; 0 for local models.
+        error (str | None): The error the call failed with.
+    """
+    if not get_app_config().llm_usage.enabled:
+        return
+    get_llm_usage_recorder().record(
+        kind=LlmUsageKind.EMBEDDING,
+        stage=stage,
+        model=model,
+        latency_ms=latency_ms,
+        error=error,
+        check_id=None,
+        regulation_id=None,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=0,
+        cached_tokens=0,
+        tool_calls=0,
+        cache_hits=0,
+        cost_usd=_cost_usd(model, prompt_tokens, 0, 0),
+    )
+
+
+class LlmUsageCallbackHandler(AsyncCallbackHandler):
+    """
+    Records one row per chat model call and one for the whole run it is passed to.
+
+    Pass a new handler to every top-level invocation via `config={"callbacks": ...}`;
+    LangChain hands it down to nested graphs, models and tools. The run row sums
+    the tokens, cost and tool calls of the run's model calls and measures its
+    wall time.
+    """
+
+    def __init__(self, stage: str, check_id: int | None = None, regulation_id: int | None = None):
+        self.stage = stage
+        self.links = {"check_id": check_id, "regulation_id": regulation_id}
+        self.recorder = get_llm_usage_recorder()
+
+        self._root_run_id: UUID | None = None
+        self._started_at: dict[UUID, float] = {}
+        self._model_stages: dict[UUID, str] = {}
+        self._models: set[str] = set()
+        self._totals = {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "tool_calls": 0,
+            "cache_hits": 0,
+            "cost_usd": 0.0,
+        }
+
+    def _elapsed_ms(self, run_id: UUID) -> float:
+        return (time.perf_counter() - self._started_at.pop(run_id, time.perf_counter())) * 1000
+
+    async def on_chain_start(
+        self, serialized, inputs, *, run_id: UUID, parent_run_id: UUID | None = None, **kwargs: Any
+    ) -> None:
+        if parent_run_id is None and self._root_run_id is None:
+            self._root_run_id = run_id
+            self._started_at[run_id] = time.perf_counter()
+
+    async def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id == self._root_run_id:
+            self._record_run(run_id, error=None)
+
+    async def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        if run_id == self._root_run_id:
+            self._record_run(run_id, error=f"{type(error).__name__}: {error}")
+
+    def _record_run(self, run_id: UUID, error: str | None) -> None:
+        self._root_run_id = None
+        self.recorder.record(
+            kind=LlmUsageKind.AGENT,
+            stage=self.stage,
+            model=", ".join(sorted(self._models)) or None,
+            latency_ms=self._elapsed_ms(run_id),
+            error=error,
+            **self.links,
+            **self._totals,
+        )
+
+    async def on_chat_model_start(
+        self,
+        serialized,
+        messages,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._started_at[run_id] = time.perf_counter()
+        self._model_stages[run_id] = (metadata or {}).get(LLM_STAGE_KEY, self.stage)
+
+    async def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        generation = response.generations[0][0] if response.generations else None
+        message = generation.message if isinstance(generation, ChatGeneration) else None
+        if not isinstance(message, AIMessage):
+            return
+
+        usage = message.usage_metadata or {}
+        model = message.response_metadata.get("model_name")
+        cache_hit = bool((generation.generation_info or {}).get(LLM_CACHE_HIT_KEY))
+        # a cached response spends no tokens, even though it reports the original usage
+        prompt_tokens = 0 if cache_hit else usage.get("input_tokens", 0)
+        completion_tokens = 0 if cache_hit else usage.get("output_tokens", 0)
+        cached_tokens = 0 if cache_hit else usage.get("input_token_details", {}).get("cache_read") or 0
+
+        row = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "tool_calls": len(message.tool_calls),
+            "cache_hits": int(cache_hit),
+            "cost_usd": _cost_usd(model, prompt_tokens, completion_tokens, cached_tokens),
+        }
+        for key, value in row.items():
+            self._totals[key] += value
+        if model:
+            self._models.add(model)
+
+        self.recorder.record(
+            kind=LlmUsageKind.MODEL,
+            stage=self._model_stages.pop(run_id, self.stage),
+            model=model,
+            latency_ms=self._elapsed_ms(run_id),
+            error=None,
+            **self.links,
+            **row,
+        )
+
+    async def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self.recorder.record(
+            kind=LlmUsageKind.MODEL,
+            stage=self._model_stages.pop(run_id, self.stage),
+            model=None,
+            latency_ms=self._elapsed_ms(run_id),
+            error=f"{type(error).__name__}: {error}",
+            **self.links,
+            **dict.fromkeys(self._totals, 0),
+        )
+
+
+def usage_callbacks(
+    stage: str, check_id: int | None = None, regulation_id: int | None = None
+) -> list[BaseCallbackHandler]:
+    """
+    Callbacks recording the usage of one run, for `config={"callbacks": ...}`.
+
+    Args:
+        stage (str): Name of the run's stage, e.g. "feat_eval".
+        check_id (int | None): The check the run works on.
+        regulation_id (int | None): The regulation the run works on.
+
+    Returns:
+        list[BaseCallbackHandler]: Empty when usage accounting is disabled.
+    """
+    if not get_app_config().llm_usage.enabled:
+        return []
+    return [LlmUsageCallbackHandler(stage, check_id=check_id, regulation_id=regulation_id)]
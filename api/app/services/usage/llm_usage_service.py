@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, List
+from fastapi import Depends
+
+from app.database.repositories.llm_usage_repository import LlmUsageRepositoryDep
+from app.dtos.llm_usage_dto import LlmUsageStageSummaryDTO, LlmUsageTotalsDTO
+
+
+class LlmUsageService:
+    """
+    Reports on the usage rows written by `LlmUsageRecorder`.
+    """
+
+    def __init__(self, llm_usage_repository: LlmUsageRepositoryDep):
+        self.llm_usage_repository = llm_usage_repository
+
+    async def get_stage_summaries(
+        self, since_hours: float | None = None
+    ) -> List[LlmUsageStageSummaryDTO]:
+        since = (
+            datetime.now(timezone.utc) - timedelta(hours=since_hours)
+            if since_hours is not None
+            else None
+        )
+        return await self.llm_usage_repository.summarize_stages(since)
+
+    async def get_check_usage(self, check_id: int) -> List[LlmUsageTotalsDTO]:
+        return await self.llm_usage_repository.get_totals(check_id=check_id)
+
+    async def get_regulation_usage(self, regulation_id: int) -> List[LlmUsageTotalsDTO]:
+        return await self.llm_usage_repository.get_totals(regulation_id=regulation_id)
+
+
+LlmUsageServiceDep = Annotated[LlmUsageService, Depends(LlmUsageService)]
@@ -0,0 +1,75 @@
+"""
+Worker process for queued background jobs.
+
+Usage:
+    uv run python -m app.worker [--job-type extract_regulation] [--concurrency N]
+
+Run any number of workers next to the API; jobs are claimed with
+`FOR UPDATE SKIP LOCKED`, so each job runs on one worker at a time.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from app.config.app_config import get_app_config
+from app.database.schemas.enums.job_type import JobType
+from app.lifespan import singletons_context
+from app.worker.worker import Worker
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run queued background jobs.")
+    parser.add_argument(
+        "--job-type",
+        dest="job_types",
+        action="append",
+        type=JobType,
+        choices=list(JobType),
+        help="Job type to run; repeat for several. Defaults to all job types.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Concurrent jobs per job type, overriding job_queue.concurrency.",
+    )
+    return parser.parse_args()
+
+
+def check_shared_rou_index() -> None:
+    """
+    Refuse to run on the embedded ChromaDB index.
+
+    Workers write ROU vectors that the API searches. The embedded index is
+    not safe for several processes sharing its directory, and each process
+    keeps its own stale view of it.
+    """
+    app_config = get_app_config()
+    if app_config.rou_index.backend == "chroma" and app_config.chroma.mode == "persistent":
+        raise SystemExit(
+            "Workers need a ROU index shared with the API: set chroma.mode to http "
+            "(CHROMA__MODE=http, with a `chroma run` server) or rou_index.backend to pgvector."
+        )
+
+
+async def main() -> None:
+    args = parse_args()
+    check_shared_rou_index()
+    config = get_app_config().job_queue
+    if args.concurrency:
+        config = config.model_copy(
+            update={"concurrency": {job_type: args.concurrency for job_type in JobType}}
+        )
+
+    worker = Worker(job_types=args.job_types or list(JobType), config=config)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    async with singletons_context():
+        await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
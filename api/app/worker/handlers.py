@@ -0,0 +1,66 @@
+from typing import Any, Awaitable, Callable, NamedTuple
+from sqlalchemy.orm import selectinload
+
+from app.database.repositories.check_repository import check_repository_context
+from app.database.schemas.check import Check
+from app.database.schemas.enums.extraction_status import ExtractionStatus
+from app.database.schemas.enums.job_type import JobType
+from app.database.schemas.enums.status import Status
+from app.dtos.check_dto import CheckDTO, CheckUpdateDTO
+from app.dtos.job_dto import EvaluateFeatureJobPayload, ExtractRegulationJobPayload
+from app.dtos.regulation_dto import RegulationProgressUpdateDTO
+from app.services.feature.feat_eval.feature_eval_service import evaluate_feature
+from app.services.feature.feature_service import feature_service_context
+from app.services.regulation.regulation_service import regulation_service_context
+from app.services.regulation.rou_service import rou_service_context
+
+
+class JobHandler(NamedTuple):
+    # runs one attempt of a job; raising fails the attempt
+    run: Callable[[dict[str, Any]], Awaitable[None]]
+    # called once the job failed on its last attempt
+    on_failure: Callable[[dict[str, Any]], Awaitable[None]]
+
+
+async def extract_regulation(payload: dict[str, Any]) -> None:
+    job = ExtractRegulationJobPayload.model_validate(payload)
+    async with regulation_service_context() as regulation_service:
+        regulation = await regulation_service.get_regulation_by_id(job.regulation_id)
+
+    async with rou_service_context() as rou_service:
+        await rou_service.extract_from_regulation(regulation)
+
+
+async def fail_regulation_extraction(payload: dict[str, Any]) -> None:
+    job = ExtractRegulationJobPayload.model_validate(payload)
+    async with regulation_service_context() as regulation_service:
+        await regulation_service.update_extraction_progress(
+            job.regulation_id, RegulationProgressUpdateDTO(extraction_status=ExtractionStatus.FAILED)
+        )
+
+
+async def evaluate_check(payload: dict[str, Any]) -> None:
+    job = EvaluateFeatureJobPayload.model_validate(payload)
+    async with check_repository_context() as check_repository:
+        check = await check_repository.get_one_by_id(
+            job.check_id, options=[selectinload(Check.eval_result)]
+        )
+    if not check:
+        raise LookupError(f"Check with id {job.check_id} not found.")
+
+    async with feature_service_context() as feature_service:
+        feature = await feature_service.get_feature_by_id(check.feature_id)
+
+    await evaluate_feature(feature, CheckDTO.model_validate(check))
+
+
+async def fail_check(payload: dict[str, Any]) -> None:
+    job = EvaluateFeatureJobPayload.model_validate(payload)
+    async with check_repository_context() as check_repository:
+        await check_repository.update_by_id(job.check_id, CheckUpdateDTO(status=Status.FAILED))
+
+
+JOB_HANDLERS: dict[JobType, JobHandler] = {
+    JobType.EXTRACT_REGULATION: JobHandler(run=extract_regulation, on_failure=fail_regulation_extraction),
+    JobType.EVALUATE_FEATURE: JobHandler(run=evaluate_check, on_failure=fail_check),
+}
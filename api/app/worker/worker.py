@@ -0,0 +1,140 @@
+import asyncio
+import os
+import socket
+import traceback
+from typing import List
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config.models.job_queue_config import JobQueueConfig
+from app.database.repositories.job_repository import job_repository_context
+from app.database.schemas.enums.job_status import JobStatus
+from app.database.schemas.enums.job_type import JobType
+from app.database.schemas.job import Job
+from app.worker.handlers import JOB_HANDLERS
+
+
+class Worker:
+    """
+    Claims and runs queued jobs.
+
+    Each job type is polled independently and runs at most `concurrency[job_type]`
+    jobs at a time. While a job runs its lock is extended every third of the
+    visibility timeout; if the process dies the lock expires and another worker
+    picks the job up again.
+    """
+
+    def __init__(self, job_types: List[JobType], config: JobQueueConfig):
+        self.job_types = job_types
+        self.config = config
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        """Stop claiming jobs; jobs already running are finished."""
+        print(f"Worker {self.worker_id} stopping")
+        self._stopping.set()
+
+    async def run(self) -> None:
+        print(f"Worker {self.worker_id} polling {', '.join(self.job_types)}")
+        await asyncio.gather(*(self._poll(job_type) for job_type in self.job_types))
+
+    async def _poll(self, job_type: JobType) -> None:
+        concurrency = self.config.concurrency.get(job_type, 1)
+        running: set[asyncio.Task[None]] = set()
+        stopping = asyncio.create_task(self._stopping.wait())
+
+        while not self._stopping.is_set():
+            free = concurrency - len(running)
+            async with job_repository_context() as job_repository:
+                for job in await job_repository.fail_abandoned(job_type):
+                    print(f"Job {job.id} ({job.job_type}) abandoned on its last attempt")
+                    await self._on_failure(job)
+
+                jobs = (
+                    await job_repository.claim(
+                        job_type, self.worker_id, free, self.config.visibility_timeout_seconds
+                    )
+                    if free > 0
+                    else []
+                )
+
+            for job in jobs:
+                task = asyncio.create_task(self._run_job(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+
+            # wake up when a slot frees up, on shutdown, or to poll again
+            await asyncio.wait(
+                {stopping, *running},
+                timeout=self.config.poll_interval_seconds,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+        stopping.cancel()
+        if running:
+            print(f"Waiting for {len(running)} running {job_type} jobs")
+            await asyncio.gather(*running)
+
+    async def _run_job(self, job: Job) -> None:
+        handler = JOB_HANDLERS[job.job_type]
+        print(f"Job {job.id} ({job.job_type}) started, attempt {job.attempts}/{job.max_attempts}")
+
+        run = asyncio.create_task(handler.run(job.payload))
+        heartbeat = asyncio.create_task(self._heartbeat(job, run))
+        try:
+            # a handler may raise anything; its error fails the attempt
+            [outcome] = await asyncio.gather(run, return_exceptions=True)
+        finally:
+            heartbeat.cancel()
+
+        if isinstance(outcome, asyncio.CancelledError):
+            # the heartbeat only cancels the job over a lost lock
+            print(f"Job {job.id} ({job.job_type}) cancelled, its lock was lost to another worker")
+        elif isinstance(outcome, BaseException):
+            traceback.print_exception(outcome)
+            async with job_repository_context() as job_repository:
+                status = await job_repository.fail(
+                    job,
+                    self.worker_id,
+                    f"{type(outcome).__name__}: {outcome}",
+                    self.config.retry_backoff_seconds,
+                )
+            if status is None:
+                print(f"Job {job.id} ({job.job_type}) failed after its lock was lost, not recorded")
+                return
+            print(f"Job {job.id} ({job.job_type}) failed, {status}")
+            if status == JobStatus.FAILED:
+                await self._on_failure(job)
+        else:
+            async with job_repository_context() as job_repository:
+                held = await job_repository.complete(job.id, self.worker_id)
+            if held:
+                print(f"Job {job.id} ({job.job_type}) completed")
+            else:
+                print(f"Job {job.id} ({job.job_type}) finished after its lock was lost, not recorded")
+
+    async def _heartbeat(self, job: Job, run: asyncio.Task[None]) -> None:
+        """Extend the job's lock while it runs; cancel the job once another worker holds it."""
+        interval = self.config.visibility_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with job_repository_context() as job_repository:
+                    held = await job_repository.heartbeat(
+                        job.id, self.worker_id, self.config.visibility_timeout_seconds
+                    )
+            except (SQLAlchemyError, OSError):
+                # the lock still has two intervals left; try again at the next one
+                traceback.print_exc()
+                continue
+            if not held:
+                run.cancel()
+                return
+
+    async def _on_failure(self, job: Job) -> None:
+        [outcome] = await asyncio.gather(
+            JOB_HANDLERS[job.job_type].on_failure(job.payload), return_exceptions=True
+        )
+        if isinstance(outcome, BaseException):
+            traceback.print_exception(outcome)
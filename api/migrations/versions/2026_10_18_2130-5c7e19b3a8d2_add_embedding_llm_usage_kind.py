@@ -0,0 +1,34 @@
+"""add embedding llm usage kind
+
+Revision ID: 5c7e19b3a8d2
+Revises: d8a3c61f4e07
+Create Date: 2026-10-18 21:30:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c7e19b3a8d2'
+down_revision: Union[str, None] = 'd8a3c61f4e07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TYPE llmusagekind ADD VALUE IF NOT EXISTS 'EMBEDDING'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # enum values cannot be dropped; recreate the type without it
+    op.execute("DELETE FROM llm_usage WHERE kind = 'EMBEDDING'")
+    op.execute("ALTER TYPE llmusagekind RENAME TO llmusagekind_old")
+    op.execute("CREATE TYPE llmusagekind AS ENUM ('AGENT', 'MODEL')")
+    op.execute(
+        "ALTER TABLE llm_usage ALTER COLUMN kind TYPE llmusagekind USING kind::text::llmusagekind"
+    )
+    op.execute("DROP TYPE llmusagekind_old")
@@ -0,0 +1,201 @@
+import asyncio
+import os
+import threading
+import time
+from typing import List, Tuple
+
+import chromadb
+import numpy as np
+import pytest
+
+from app.clients import chroma_rou_vector_store, chromadb_client
+from app.clients.chroma_rou_vector_store import ChromaRouVectorStore
+from app.clients.embedding_provider import EmbeddingProvider
+from app.config.app_config import get_app_config
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+
+class _UnusedEmbeddingProvider(EmbeddingProvider):
+    model = "executor-test"
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        raise AssertionError("no embedding expected")
+
+
+class _SlowCollection:
+    """Blocks like a persistent Chroma query and records how many queries overlap."""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.threads: set[str] = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def query(self, query_embeddings, n_results, where, include):
+        with self._lock:
+            self.threads.add(threading.current_thread().name)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.in_flight -= 1
+        return {"ids": [["1"]], "distances": [[0.5]]}
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = _SlowCollection(seconds=0.2)
+    monkeypatch.setattr(chroma_rou_vector_store, "get_rou_collection", lambda model: collection)
+    return collection
+
+
+def test_persistent_search_does_not_block_the_event_loop(collection):
+    app_config = get_app_config()
+    chroma_config = app_config.chroma.model_copy(update={"mode": "persistent", "query_threads": 4})
+    store = ChromaRouVectorStore(chroma_config, app_config.rou_index, _UnusedEmbeddingProvider())
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def run() -> float:
+        ticker = asyncio.create_task(tick())
+        started = time.perf_counter()
+        results = await asyncio.gather(*(store.search([1.0], 1) for _ in range(4)))
+        elapsed = time.perf_counter() - started
+        ticker.cancel()
+        assert all(hits[0].rou_id == 1 for hits in results)
+        return elapsed
+
+    try:
+        elapsed = asyncio.run(run())
+    finally:
+        store.close()
+
+    # four 0.2s queries overlap instead of running back to back on the loop
+    assert collection.max_in_flight == 4
+    assert elapsed < 0.6
+    assert ticks >= 10
+    assert all(name.startswith("chroma-query") for name in collection.threads)
+
+
+class _SlowEmbeddingProvider(EmbeddingProvider):
+    """Answers like the OpenAI embeddings API with a fixed latency."""
+
+    model = "executor-test"
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.rng = np.random.default_rng(1)
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        await asyncio.sleep(self.seconds)
+        return self.rng.normal(size=(len(texts), 64)).tolist(), len(texts)
+
+
+@pytest.fixture
+def persistent_index(tmp_path, monkeypatch):
+    """The embedded index in a temporary directory, holding 2000 random 64-d ROU vectors."""
+    app_config = get_app_config()
+    chroma_config = app_config.chroma.model_copy(
+        update={"mode": "persistent", "persist_path": str(tmp_path)}
+    )
+    monkeypatch.setattr(app_config, "chroma", chroma_config)
+    chromadb_client.get_chromadb_client.cache_clear()
+    chromadb_client.get_rou_collection.cache_clear()
+    vectors = np.random.default_rng(0).normal(size=(2000, 64)).tolist()
+    chromadb_client.get_rou_collection(_UnusedEmbeddingProvider.model).add(
+        ids=[str(i) for i in range(len(vectors))], embeddings=vectors
+    )
+    yield tmp_path
+    chromadb_client.get_chromadb_client.cache_clear()
+    chromadb_client.get_rou_collection.cache_clear()
+
+
+@requires_benchmarks
+def test_benchmark_lookups_on_the_shared_collection_against_a_client_per_lookup(
+    persistent_index,
+):
+    """QueryRousTool's vector lookup: 50 top-10 searches among 2000 ROUs."""
+    app_config = get_app_config()
+    store = ChromaRouVectorStore(app_config.chroma, app_config.rou_index, _UnusedEmbeddingProvider())
+    name = chromadb_client.get_rou_collection_name(store.embedding_provider.model)
+    queries = np.random.default_rng(1).normal(size=(50, 64)).tolist()
+
+    def lookup_with_a_new_client(embedding: List[float]):
+        # what every request and tool call did before the client was shared
+        client = chromadb.PersistentClient(path=str(persistent_index))
+        client.get_or_create_collection(name)
+        return client.get_collection(name).query(
+            query_embeddings=[embedding], n_results=10, include=["distances"]
+        )
+
+    async def run() -> Tuple[List[float], List[float]]:
+        per_lookup, shared = [], []
+        for query in queries:
+            started = time.perf_counter()
+            lookup_with_a_new_client(query)
+            per_lookup.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            await store.search(query, 10)
+            shared.append(time.perf_counter() - started)
+        return per_lookup, shared
+
+    try:
+        per_lookup, shared = asyncio.run(run())
+    finally:
+        store.close()
+
+    for label, latencies in (("client per lookup", per_lookup), ("shared", shared)):
+        p50, p95 = np.percentile(latencies, [50, 95])
+        print(f"{label}: p50 {p50 * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms")
+    assert np.median(shared) < np.median(per_lookup)
+
+
+@requires_benchmarks
+def test_benchmark_concurrent_searches_with_a_slow_embedding_api(persistent_index):
+    """1 and 10 concurrent searches, with 200ms to embed each query."""
+    app_config = get_app_config()
+    store = ChromaRouVectorStore(
+        app_config.chroma, app_config.rou_index, _SlowEmbeddingProvider(seconds=0.2)
+    )
+    collection = chromadb_client.get_rou_collection(store.embedding_provider.model)
+    rng = np.random.default_rng(2)
+
+    async def blocking_search(query: str):
+        # what QueryRousTool did before: chroma embedded the query with a
+        # synchronous request and searched, both on the event loop
+        time.sleep(0.2)
+        return collection.query(
+            query_embeddings=rng.normal(size=(1, 64)).tolist(), n_results=10, include=["distances"]
+        )
+
+    async def elapsed(search, concurrency: int) -> float:
+        started = time.perf_counter()
+        await asyncio.gather(*(search(f"query {concurrency}.{i}") for i in range(concurrency)))
+        return time.perf_counter() - started
+
+    async def run():
+        return {
+            (label, concurrency): await elapsed(search, concurrency)
+            for label, search in (("blocking", blocking_search), ("async", store.query))
+            for concurrency in (1, 10)
+        }
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        store.close()
+
+    for (label, concurrency), seconds in results.items():
+        print(f"{label}, {concurrency} concurrent: {seconds * 1000:.0f}ms")
+    # blocking searches queue up behind each other's embedding requests
+    assert results["blocking", 10] > 9 * 0.2
+    assert results["async", 10] < 2 * results["async", 1]
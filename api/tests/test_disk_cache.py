@@ -0,0 +1,65 @@
+import os
+import time
+
+from app.services.cache.disk_cache import DiskCache
+
+
+def _age(cache: DiskCache, key: str, seconds: float, modified: bool = False) -> None:
+    """Move an entry's last access, and optionally its write time, into the past."""
+    path = cache._find(key)
+    stat = path.stat()
+    past = time.time() - seconds
+    os.utime(path, (past, past if modified else stat.st_mtime))
+
+
+def test_eviction_frees_down_to_the_low_watermark_least_recently_used_first(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, low_watermark=0.6)
+    for age, key in zip((40, 30, 20, 10), "abcd"):
+        cache.set(key, b"x" * 200)
+        _age(cache, key, age)
+    # a hit makes the oldest entry the most recently used
+    assert cache.get("a") == b"x" * 200
+
+    cache.set("e", b"x" * 200)
+    assert cache.stats().entries == 5
+
+    cache.set("f", b"x" * 200)
+
+    assert [key for key in "abcdef" if cache.get(key) is not None] == ["a", "e", "f"]
+    assert cache.stats().size_bytes == 600
+
+
+def test_writes_below_the_limit_do_not_scan(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, low_watermark=0.5)
+    scans = []
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or [])
+    for key in "abcde":
+        cache.set(key, b"x" * 200)
+
+    assert scans == []
+    assert cache.stats().size_bytes == 1000
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, ttl_seconds=60)
+    cache.set("old", b"old")
+    cache.set("new", b"new")
+    _age(cache, "old", 120, modified=True)
+
+    assert cache.get("old") is None
+    assert cache.get("new") == b"new"
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+
+def test_running_size_is_restored_from_disk(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=1000, compress=True)
+    cache.set("a", b"a" * 500)
+    cache.set("b", b"b" * 500)
+
+    reopened = DiskCache(str(tmp_path), max_bytes=1000)
+
+    assert reopened.stats().entries == 2
+    assert reopened.stats().size_bytes == cache.stats().size_bytes
+    # entries compressed before `compress` was turned off are still read
+    assert reopened.get("a") == b"a" * 500
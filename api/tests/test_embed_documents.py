@@ -0,0 +1,175 @@
+import asyncio
+import os
+import random
+import time
+from typing import List, Tuple
+
+import pytest
+
+from app.clients.chroma_rou_vector_store import ChromaRouVectorStore
+from app.clients.embedding_provider import EmbeddingProvider
+from app.clients.openai_rate_limiter import estimate_tokens
+from app.clients.rou_vector_store import RouIndexingError, batch_by_tokens
+from app.config.app_config import get_app_config
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+
+class _FakeEmbeddingProvider(EmbeddingProvider):
+    """Embeds a text as [its number]; batches holding `fail_once` fail on their first call."""
+
+    model = "fake"
+
+    def __init__(self, fail_once: str | None = None):
+        self.fail_once = fail_once
+        self.batches: List[List[str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        self.batches.append(texts)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            # later batches finish first
+            await asyncio.sleep(0.001 * (100 - len(self.batches)))
+            if self.fail_once in texts:
+                self.fail_once = None
+                raise ConnectionError("connection reset")
+            return [[float(text.split()[-1])] for text in texts], 0
+        finally:
+            self.in_flight -= 1
+
+
+def _store(provider: EmbeddingProvider, **index_config) -> ChromaRouVectorStore:
+    app_config = get_app_config()
+    return ChromaRouVectorStore(
+        app_config.chroma, app_config.rou_index.model_copy(update=index_config), provider
+    )
+
+
+def test_batches_respect_token_budget_and_input_count():
+    texts = ["word " * 40] * 5 + ["word " * 400] + ["word"] * 3
+    budget = estimate_tokens("word " * 40) * 2
+
+    batches = batch_by_tokens(texts, token_budget=budget, max_inputs=2)
+
+    assert batches == [range(0, 2), range(2, 4), range(4, 5), range(5, 6), range(6, 8), range(8, 9)]
+
+
+def test_oversized_text_gets_a_batch_of_its_own():
+    assert batch_by_tokens(["a", "b " * 1000, "c"], token_budget=10, max_inputs=10) == [
+        range(0, 1),
+        range(1, 2),
+        range(2, 3),
+    ]
+
+
+def test_concurrent_batches_keep_document_order():
+    provider = _FakeEmbeddingProvider()
+    store = _store(
+        provider, embedding_batch_max_inputs=3, embedding_concurrency=2, retry_backoff_seconds=0
+    )
+    texts = [f"rou {i}" for i in range(20)]
+
+    embeddings = asyncio.run(store.embed_documents(texts))
+
+    assert embeddings == [[float(i)] for i in range(20)]
+    assert len(provider.batches) == 7
+    assert provider.max_in_flight == 2
+
+
+def test_failed_batch_is_retried_alone():
+    provider = _FakeEmbeddingProvider(fail_once="rou 4")
+    store = _store(
+        provider, embedding_batch_max_inputs=3, max_attempts=2, retry_backoff_seconds=0
+    )
+    texts = [f"rou {i}" for i in range(9)]
+
+    embeddings = asyncio.run(store.embed_documents(texts))
+
+    assert embeddings == [[float(i)] for i in range(9)]
+    # three batches, then the failed one once more
+    assert sorted(provider.batches) == [
+        ["rou 0", "rou 1", "rou 2"],
+        ["rou 3", "rou 4", "rou 5"],
+        ["rou 3", "rou 4", "rou 5"],
+        ["rou 6", "rou 7", "rou 8"],
+    ]
+
+
+class _Collection:
+    def __init__(self, failing_id: str):
+        self.failing_id = failing_id
+        self.upserted: List[List[str]] = []
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        if self.failing_id in ids:
+            raise ConnectionError("connection reset")
+        self.upserted.append(ids)
+
+
+def test_failed_upsert_batch_is_reported_and_the_others_written():
+    store = _store(
+        _FakeEmbeddingProvider(), upsert_batch_size=2, max_attempts=2, retry_backoff_seconds=0
+    )
+    collection = _Collection(failing_id="rou 3")
+
+    async def call(method):
+        return method(collection)
+
+    store._call = call
+    ids = [f"rou {i}" for i in range(1, 6)]
+
+    with pytest.raises(RouIndexingError) as error:
+        asyncio.run(store.upsert(ids, ids, [[float(i)] for i in range(1, 6)]))
+
+    assert error.value.failed_ids == ["rou 3", "rou 4"]
+    assert "Upserting 2 vectors failed: connection reset" in str(error.value)
+    assert collection.upserted == [["rou 1", "rou 2"], ["rou 5"]]
+
+
+class _SlowEmbeddingProvider(EmbeddingProvider):
+    """Answers like the OpenAI embeddings API, with a fixed latency and a share of failed requests."""
+
+    model = "fake"
+
+    def __init__(self, seconds: float, error_rate: float = 0):
+        self.seconds = seconds
+        self.error_rate = error_rate
+        self.requests = 0
+        self.random = random.Random(0)
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        self.requests += 1
+        await asyncio.sleep(self.seconds)
+        if self.random.random() < self.error_rate:
+            raise ConnectionError("connection reset")
+        return [[1.0] * 64 for _ in texts], 0
+
+
+@requires_benchmarks
+def test_benchmark_embedding_5000_documents_in_concurrent_batches():
+    """5000 documents in 10 batches, at 300ms per request, one or four at a time."""
+    texts = [f"Operators shall verify the age of account holder {i}." for i in range(5000)]
+
+    def embed(provider: EmbeddingProvider, **index_config) -> float:
+        store = _store(provider, retry_backoff_seconds=0.01, **index_config)
+        started = time.perf_counter()
+        embeddings = asyncio.run(store.embed_documents(texts))
+        assert len(embeddings) == len(texts)
+        return time.perf_counter() - started
+
+    sequential = embed(_SlowEmbeddingProvider(0.3), embedding_concurrency=1)
+    concurrent = embed(_SlowEmbeddingProvider(0.3), embedding_concurrency=4)
+    failing = _SlowEmbeddingProvider(0.3, error_rate=0.3)
+    retried = embed(failing, embedding_concurrency=4, max_attempts=8)
+
+    print(
+        f"concurrency 1: {sequential:.2f}s, concurrency 4: {concurrent:.2f}s, "
+        f"30% error rate: {retried:.2f}s, {failing.requests - 10} retries"
+    )
+    # ten batches: ten requests in a row, against three rounds of four
+    assert concurrent < sequential / 2
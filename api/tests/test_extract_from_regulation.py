@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime
+from itertools import count
+from typing import List
+
+from app.config.models.rou_retrieval_config import RouRetrievalConfig
+from app.database.schemas.enums.rou_type import RouType
+from app.dtos.extraction_result import ExtractedRouDto
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import ExtractionEvent
+from app.services.regulation.rou_lexical_index import RouLexicalIndex
+from app.services.regulation.rou_service import RouService
+
+
+class _Repository:
+    def __init__(self):
+        self.rows = {}
+        self._ids = count(1)
+
+    async def create_many(self, rous):
+        for rou in rous:
+            rou.id, rou.created_at = next(self._ids), datetime(2026, 1, 1)
+            self.rows[rou.id] = rou
+        return rous
+
+    async def get_ids(self, source_id=None, rou_type=None):
+        return sorted(self.rows)
+
+    async def delete_many_by_ids(self, rou_ids):
+        for rou_id in rou_ids:
+            self.rows.pop(rou_id, None)
+
+
+class _VectorStore:
+    def __init__(self):
+        self.embedded: List[str] = []
+        self.vectors = {}
+
+    async def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[1.0] for _ in texts]
+
+    async def upsert(self, ids, documents, embeddings, metadatas=None):
+        self.vectors.update(zip(ids, documents))
+
+    async def delete(self, ids):
+        for rou_id in ids:
+            self.vectors.pop(rou_id, None)
+
+
+class _Extractor:
+    def __init__(self, events: List[ExtractionEvent]):
+        self.events = events
+
+    async def astream_pages(self, pages, callbacks=None):
+        for event in self.events:
+            yield event
+
+
+class _RegulationService:
+    def __init__(self):
+        self.statuses = []
+
+    async def update_extraction_progress(self, regulation_id, progress):
+        self.statuses.append(progress.extraction_status)
+
+
+def _rou(text: str) -> ExtractedRouDto:
+    return ExtractedRouDto(canonical_text=text, desc=text, obligations=[text], jurisdiction="Utah")
+
+
+def test_only_the_deduplicated_rous_are_embedded():
+    events = [
+        ExtractionEvent(kind="chunk_generated"),
+        ExtractionEvent(kind="chunk_generated"),
+        ExtractionEvent(kind="chunk_extracted", rous=[_rou("verify age"), _rou("retain logs")]),
+        ExtractionEvent(kind="chunk_extracted", rous=[_rou("verify user age")]),
+        ExtractionEvent(kind="deduplicating"),
+        ExtractionEvent(kind="completed", rous=[_rou("verify age"), _rou("retain logs")]),
+    ]
+    repository, vector_store = _Repository(), _VectorStore()
+    lexical_index = RouLexicalIndex(RouRetrievalConfig())
+    service = RouService(
+        rou_repository=repository,
+        rou_extractor=_Extractor(events),
+        supabase_storage_service=None,
+        rou_vector_store=vector_store,
+        rou_lexical_index=lexical_index,
+        regulation_service=_RegulationService(),
+    )
+    seen_by_keyword = []
+
+    async def pages(regulation):
+        return None
+
+    async def store_rous(rous, source_id, index_vectors=True):
+        stored = await RouService.store_rous(service, rous, source_id, index_vectors)
+        # provisional ROUs are searchable by keyword before the reduce completes
+        seen_by_keyword.extend(lexical_index.search("age"))
+        return stored
+
+    service._get_pages = pages
+    service.store_rous = store_rous
+    regulation = type("Regulation", (), {"id": 7, "file_object_id": None})()
+
+    final_rous = asyncio.run(service.extract_from_regulation(regulation))
+
+    assert vector_store.embedded == ["verify age", "retain logs"]
+    assert sorted(vector_store.vectors.values()) == ["retain logs", "verify age"]
+    assert sorted(repository.rows) == [rou.id for rou in final_rous] == [4, 5]
+    assert sorted(lexical_index.get(range(1, 6))) == [4, 5]
+    assert 3 in seen_by_keyword
+    assert all(rou.type == RouType.AI for rou in final_rous)
@@ -0,0 +1,177 @@
+import asyncio
+import json
+from typing import List
+
+import httpx
+from openai import AsyncOpenAI
+import pytest
+
+from app.clients.embedding_provider import OpenAIEmbeddingProvider
+from app.config.app_config import get_app_config
+from app.config.models.fake_openai_config import FakeOpenAIConfig
+from app.dtos.extraction_result import ExtractedRouDto, ExtractionResult
+from app.fake_openai.server import FixtureStore, create_app
+from app.fake_openai.stubs import stub_chat_completion, stub_from_schema, to_stream_chunks
+from app.services.regulation.pdf_reader import PdfPage
+from app.services.regulation.rou_extraction import rou_deduplicate_model, rou_extract_model
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import MapReduceRouExtractor
+from app.services.regulation.rou_extraction.rou_deduplicate_model import RouDedupModel
+from app.services.regulation.rou_extraction.rou_extract_model import RouExtractModel
+from app.services.regulation.rou_extraction.rou_prededup import RouPreDedup
+
+_BASE_URL = "http://fake-openai/v1"
+
+
+def _client(config: FakeOpenAIConfig, requests: List[httpx.Request] | None = None):
+    async def record(request: httpx.Request) -> None:
+        if requests is not None:
+            requests.append(request)
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(config)),
+        event_hooks={"request": [record]},
+    )
+
+
+def test_stub_from_schema_validates_and_is_deterministic():
+    schema = ExtractionResult.model_json_schema()
+    tagged = {
+        "type": "object",
+        "properties": {
+            "kind": {"enum": ["a", "b", "c"]},
+            "version": {"const": 2},
+            "note": {"anyOf": [{"type": "null"}, {"type": "string"}]},
+            "scores": {"type": "array", "items": {"type": "number"}, "minItems": 3},
+            "limit": {"type": "integer", "minimum": 5},
+        },
+    }
+
+    value = stub_from_schema(schema, seed=1)
+    stubbed = stub_from_schema(tagged, seed=1)
+
+    assert ExtractionResult.model_validate(value).rous
+    assert stub_from_schema(schema, seed=1) == value
+    assert stub_from_schema(schema, seed=2) != value
+    assert stubbed["kind"] in ("a", "b", "c")
+    assert stubbed["version"] == 2
+    assert isinstance(stubbed["note"], str)
+    assert len(stubbed["scores"]) == 3 and all(isinstance(s, float) for s in stubbed["scores"])
+    assert stubbed["limit"] == 5
+
+
+def test_stream_chunks_carry_the_message_then_the_finish_reason_and_usage():
+    parameters = {"type": "object", "properties": {"q": {"type": "string"}}}
+    tool = {"name": "search", "parameters": parameters}
+    completion = stub_chat_completion(
+        {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": "find it"}],
+            "tools": [{"type": "function", "function": tool}],
+        }
+    )
+
+    chunks = to_stream_chunks(completion)
+
+    message = completion["choices"][0]["message"]
+    assert [chunk["object"] for chunk in chunks] == ["chat.completion.chunk"] * 3
+    assert {chunk["id"] for chunk in chunks} == {completion["id"]}
+    assert chunks[0]["choices"][0]["delta"] == {
+        "role": "assistant",
+        "tool_calls": [{"index": 0, **message["tool_calls"][0]}],
+    }
+    assert chunks[1]["choices"][0] == {"index": 0, "delta": {}, "finish_reason": "tool_calls"}
+    assert chunks[2]["choices"] == [] and chunks[2]["usage"] == completion["usage"]
+
+
+def test_recorded_fixtures_are_replayed_streamed_or_not(tmp_path):
+    store = FixtureStore(str(tmp_path))
+    request = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": "hello"}]}
+    recorded = stub_chat_completion(request) | {"id": "chatcmpl-recorded"}
+    recorded["choices"][0]["message"]["content"] = "Recorded answer."
+    # as record mode does: the request is stored unstreamed
+    store.save("/chat/completions", request, recorded)
+
+    assert store.key("/chat/completions", request | {"stream": True}) == store.key(
+        "/chat/completions", request
+    )
+    assert store.load("/chat/completions", request) == recorded
+    assert store.load("/embeddings", request) is None
+
+    async def run():
+        config = FakeOpenAIConfig(
+            mode="replay", fixtures_dir=str(tmp_path), replay_fallback_to_stub=False
+        )
+        async with _client(config) as http_client:
+            client = AsyncOpenAI(api_key="sk-test", base_url=_BASE_URL, http_client=http_client)
+            replayed = await client.chat.completions.create(**request)
+            stream = await client.chat.completions.create(**request, stream=True)
+            streamed = "".join(
+                [chunk.choices[0].delta.content or "" async for chunk in stream if chunk.choices]
+            )
+            missing = await http_client.post(
+                f"{_BASE_URL}/chat/completions", json=request | {"model": "gpt-4o"}
+            )
+        return replayed, streamed, missing
+
+    replayed, streamed, missing = asyncio.run(run())
+
+    assert replayed.id == "chatcmpl-recorded"
+    assert replayed.choices[0].message.content == streamed == "Recorded answer."
+    assert missing.status_code == 404
+    assert json.loads(missing.content)["error"]["type"] == "fixture_not_found"
+
+
+@pytest.mark.parametrize("prededup_enabled", [False, True])
+def test_map_reduce_extraction_runs_against_the_fake_server(monkeypatch, prededup_enabled):
+    config = get_app_config()
+    monkeypatch.setattr(config.openai, "base_url", _BASE_URL)
+    monkeypatch.setattr(config.llm_cache, "enabled", False)
+    requests: List[httpx.Request] = []
+    http_client = _client(FakeOpenAIConfig(), requests)
+    for module in (rou_extract_model, rou_deduplicate_model):
+        monkeypatch.setattr(module, "get_openai_http_async_client", lambda: http_client)
+
+    extraction_config = config.rou_extraction.model_copy(
+        update={"prededup_enabled": prededup_enabled}
+    )
+    embedding_provider = OpenAIEmbeddingProvider(
+        model="text-embedding-3-small",
+        openai_model="text-embedding-3-small",
+        openai_client=AsyncOpenAI(api_key="sk-test", base_url=_BASE_URL, http_client=http_client),
+    )
+    extractor = MapReduceRouExtractor(
+        rou_extractor_model=RouExtractModel(config.openai),
+        rou_dedup_model=RouDedupModel(config.openai),
+        rou_prededup=RouPreDedup(embedding_provider, extraction_config, config.rou_index),
+        rou_extraction_config=extraction_config,
+    )
+
+    async def pages():
+        for number in range(1, 4):
+            text = f"Article {number}. " + "Operators shall verify age. " * 120
+            yield PdfPage(number=number, text=text)
+
+    async def run():
+        async with http_client:
+            return await extractor.extract_pages(pages())
+
+    rous = asyncio.run(run())
+
+    paths = [request.url.path for request in requests]
+    bodies = [json.loads(request.content) for request in requests]
+    chunk_count = sum(
+        body.get("response_format", {}).get("json_schema", {}).get("name") == "ExtractionResult"
+        for body in bodies
+    )
+    dedup_calls = sum(
+        body.get("response_format", {}).get("json_schema", {}).get("name") == "DedupResult"
+        for body in bodies
+    )
+    assert chunk_count >= 2
+    # stub embeddings are unrelated, so the pre-dedup leaves nothing for the LLM
+    assert dedup_calls == (0 if prededup_enabled else 1)
+    assert ("/v1/embeddings" in paths) == prededup_enabled
+    assert rous and all(isinstance(rou, ExtractedRouDto) for rou in rous)
+    if not prededup_enabled:
+        # the dedup stub answers with one ROU
+        assert len(rous) == 1
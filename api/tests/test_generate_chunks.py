@@ -0,0 +1,81 @@
+import asyncio
+from typing import AsyncIterator, List
+
+from app.config.app_config import get_app_config
+from app.services.regulation.pdf_reader import PdfPage
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import MapReduceRouExtractor
+
+
+def _extractor() -> MapReduceRouExtractor:
+    # chunking only uses the text splitter; the models are never called
+    return MapReduceRouExtractor(None, None, None, get_app_config().rou_extraction)
+
+
+def _pages(page_count: int, paragraphs_per_page: int = 6) -> List[PdfPage]:
+    pages = []
+    for number in range(1, page_count + 1):
+        paragraphs = [
+            f"Section {number}.{i}. The operator shall verify the age of every account holder "
+            f"and retain the records of section {number}.{i} for five years. " * 4
+            for i in range(paragraphs_per_page)
+        ]
+        pages.append(PdfPage(number=number, text="\n\n".join(paragraphs) + "\n"))
+    return pages
+
+
+async def _stream(pages: List[PdfPage], read: List[int]) -> AsyncIterator[PdfPage]:
+    for page in pages:
+        read.append(page.number)
+        yield page
+
+
+async def _chunks(extractor: MapReduceRouExtractor, pages: List[PdfPage]) -> List[str]:
+    return [chunk async for chunk in extractor.generate_chunks(_stream(pages, []))]
+
+
+def test_streamed_chunks_match_splitting_the_whole_text():
+    extractor = _extractor()
+    pages = _pages(8)
+
+    chunks = asyncio.run(_chunks(extractor, pages))
+
+    assert chunks == extractor.text_splitter.split_text("".join(page.text for page in pages))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= extractor.text_splitter._chunk_size for chunk in chunks)
+
+
+def test_sentence_across_a_page_break_stays_in_one_chunk():
+    extractor = _extractor()
+    pages = [
+        PdfPage(number=1, text="Article 1. A platform shall notify the authority within"),
+        PdfPage(number=2, text=" 72 hours of becoming aware of the breach.\n"),
+    ]
+
+    chunks = asyncio.run(_chunks(extractor, pages))
+
+    assert chunks == [
+        "Article 1. A platform shall notify the authority within 72 hours of becoming "
+        "aware of the breach."
+    ]
+
+
+def test_first_chunk_is_yielded_before_the_last_page_is_read():
+    extractor = _extractor()
+    pages = _pages(10)
+    read: List[int] = []
+
+    async def first_chunk_after() -> int:
+        async for _ in extractor.generate_chunks(_stream(pages, read)):
+            return len(read)
+        raise AssertionError("no chunk generated")
+
+    pages_read = asyncio.run(first_chunk_after())
+
+    assert pages_read < len(pages)
+
+
+def test_empty_and_blank_pages_yield_no_chunks():
+    extractor = _extractor()
+    pages = [PdfPage(number=1, text=""), PdfPage(number=2, text="\n\n")]
+
+    assert asyncio.run(_chunks(extractor, pages)) == []
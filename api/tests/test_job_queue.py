@@ -0,0 +1,262 @@
+"""
+Background job queue.
+
+The worker tests run anywhere. The repository tests need a disposable
+Postgres, as claiming relies on `FOR UPDATE SKIP LOCKED`; see
+test_pgvector_rou_vector_store.py for running them. They expect no other
+jobs in it and delete theirs afterwards.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+import os
+from typing import List
+
+import pytest
+from sqlalchemy import delete
+
+from app.config.models.job_queue_config import JobQueueConfig
+from app.database.repositories.job_repository import job_repository_context
+from app.database.repositories.session import async_db_session_context, engine
+from app.database.schemas.enums.job_status import JobStatus
+from app.database.schemas.enums.job_type import JobType
+from app.database.schemas.job import Job
+from app.worker import worker as worker_module
+from app.worker.handlers import JobHandler
+from app.worker.worker import Worker
+
+requires_postgres = pytest.mark.skipif(
+    "TEST_DATABASE_URL" not in os.environ, reason="needs TEST_DATABASE_URL"
+)
+
+
+class _JobRepository:
+    """Records the lock updates of one job; the lock is held until `lost` is set."""
+
+    def __init__(self):
+        self.lost = False
+        self.unreachable = False
+        self.calls: List[str] = []
+
+    async def heartbeat(self, job_id, worker_id, visibility_timeout) -> bool:
+        self.calls.append("heartbeat")
+        if self.unreachable:
+            raise ConnectionRefusedError("database unreachable")
+        return not self.lost
+
+    async def complete(self, job_id, worker_id) -> bool:
+        self.calls.append("complete")
+        return not self.lost
+
+    async def fail(self, job, worker_id, error, retry_backoff):
+        self.calls.append("fail")
+        if self.lost:
+            return None
+        return JobStatus.QUEUED if job.attempts < job.max_attempts else JobStatus.FAILED
+
+
+@pytest.fixture
+def job_repository(monkeypatch):
+    repository = _JobRepository()
+
+    @asynccontextmanager
+    async def context():
+        yield repository
+
+    monkeypatch.setattr(worker_module, "job_repository_context", context)
+    return repository
+
+
+def _worker(monkeypatch, run, on_failure=None) -> Worker:
+    async def ignore(payload):
+        pass
+
+    monkeypatch.setitem(
+        worker_module.JOB_HANDLERS, JobType.EVALUATE_FEATURE, JobHandler(run, on_failure or ignore)
+    )
+    # heartbeats every 10ms
+    return Worker([JobType.EVALUATE_FEATURE], JobQueueConfig(visibility_timeout_seconds=0.03))
+
+
+def _job(attempts: int = 1, max_attempts: int = 3) -> Job:
+    return Job(
+        id=1,
+        job_type=JobType.EVALUATE_FEATURE,
+        payload={},
+        attempts=attempts,
+        max_attempts=max_attempts,
+    )
+
+
+def test_job_is_cancelled_once_another_worker_holds_its_lock(monkeypatch, job_repository):
+    cancelled = []
+
+    async def run(payload):
+        await asyncio.sleep(0.05)
+        job_repository.lost = True
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    asyncio.run(_worker(monkeypatch, run)._run_job(_job()))
+
+    assert cancelled == [True]
+    # neither completed nor failed over the other worker's attempt
+    assert set(job_repository.calls) == {"heartbeat"}
+
+
+def test_job_keeps_running_while_heartbeats_fail(monkeypatch, job_repository):
+    async def run(payload):
+        job_repository.unreachable = True
+        await asyncio.sleep(0.05)
+        job_repository.unreachable = False
+
+    asyncio.run(_worker(monkeypatch, run)._run_job(_job()))
+
+    assert job_repository.calls.count("heartbeat") >= 2
+    assert job_repository.calls[-1] == "complete"
+
+
+def test_failure_after_the_lock_was_lost_is_not_recorded(monkeypatch, job_repository):
+    failures = []
+
+    async def run(payload):
+        job_repository.lost = True
+        raise RuntimeError("upstream error")
+
+    async def on_failure(payload):
+        failures.append(payload)
+
+    asyncio.run(_worker(monkeypatch, run, on_failure)._run_job(_job(attempts=3, max_attempts=3)))
+
+    assert job_repository.calls == ["fail"]
+    assert failures == []
+
+
+def test_failure_on_the_last_attempt_runs_the_failure_handler(monkeypatch, job_repository):
+    failures = []
+
+    async def run(payload):
+        raise RuntimeError("upstream error")
+
+    async def on_failure(payload):
+        failures.append(payload)
+
+    asyncio.run(_worker(monkeypatch, run, on_failure)._run_job(_job(attempts=3, max_attempts=3)))
+
+    assert job_repository.calls == ["fail"]
+    assert failures == [{}]
+
+
+async def _enqueue(count: int, max_attempts: int = 3) -> List[int]:
+    async with job_repository_context() as job_repository:
+        jobs = await job_repository.enqueue_many(
+            JobType.EVALUATE_FEATURE, [{"n": i} for i in range(count)], max_attempts
+        )
+    return [job.id for job in jobs]
+
+
+async def _delete_jobs(job_ids: List[int]) -> None:
+    async with async_db_session_context() as session:
+        await session.execute(delete(Job).where(Job.id.in_(job_ids)))
+        await session.commit()
+    # the pooled connections belong to the event loop of the test
+    await engine.dispose()
+
+
+async def _claim(worker_id: str, limit: int, visibility_timeout: float = 60) -> List[Job]:
+    async with job_repository_context() as job_repository:
+        return await job_repository.claim(
+            JobType.EVALUATE_FEATURE, worker_id, limit, visibility_timeout
+        )
+
+
+async def _get(job_id: int) -> Job:
+    async with job_repository_context() as job_repository:
+        return await job_repository.get_one_by_id(job_id)
+
+
+@requires_postgres
+def test_concurrent_claims_never_hand_out_a_job_twice(database):
+    async def run():
+        job_ids = await _enqueue(40)
+        try:
+            claimed = {f"worker-{i}": [] for i in range(4)}
+            while True:
+                rounds = await asyncio.gather(*(_claim(worker_id, 7) for worker_id in claimed))
+                if not any(rounds):
+                    break
+                for worker_id, jobs in zip(claimed, rounds):
+                    claimed[worker_id].extend(jobs)
+            return job_ids, claimed
+        finally:
+            await _delete_jobs(job_ids)
+
+    job_ids, claimed = asyncio.run(run())
+
+    claimed_ids = [job.id for jobs in claimed.values() for job in jobs]
+    assert sorted(claimed_ids) == sorted(job_ids)
+    assert all(
+        job.locked_by == worker_id and job.attempts == 1 and job.status == JobStatus.RUNNING
+        for worker_id, jobs in claimed.items()
+        for job in jobs
+    )
+    # skipped rather than waited on: more than one worker got jobs
+    assert sum(bool(jobs) for jobs in claimed.values()) > 1
+
+
+@requires_postgres
+def test_job_with_an_expired_lock_moves_to_another_worker(database):
+    async def run():
+        [job_id] = await _enqueue(1)
+        try:
+            [first] = await _claim("worker-a", 1, visibility_timeout=0.2)
+            still_locked = await _claim("worker-b", 1)
+            await asyncio.sleep(0.3)
+            [second] = await _claim("worker-b", 1)
+
+            async with job_repository_context() as job_repository:
+                stale = (
+                    await job_repository.heartbeat(job_id, "worker-a", 60),
+                    await job_repository.complete(job_id, "worker-a"),
+                    await job_repository.fail(first, "worker-a", "late failure", 30),
+                )
+                completed = await job_repository.complete(job_id, "worker-b")
+            return first, still_locked, second, stale, completed, await _get(job_id)
+        finally:
+            await _delete_jobs([job_id])
+
+    first, still_locked, second, stale, completed, job = asyncio.run(run())
+
+    assert first.locked_by == "worker-a" and first.attempts == 1
+    assert still_locked == []
+    assert second.id == first.id
+    assert second.locked_by == "worker-b" and second.attempts == 2
+    # the first worker's lock is gone: none of its updates apply
+    assert stale == (False, False, None)
+    assert completed
+    assert job.status == JobStatus.COMPLETED and job.last_error is None
+
+
+@requires_postgres
+def test_expired_lock_on_the_last_attempt_fails_the_job(database):
+    async def run():
+        [job_id] = await _enqueue(1, max_attempts=1)
+        try:
+            await _claim("worker-a", 1, visibility_timeout=0.2)
+            await asyncio.sleep(0.3)
+            reclaimed = await _claim("worker-b", 1)
+            async with job_repository_context() as job_repository:
+                abandoned = await job_repository.fail_abandoned(JobType.EVALUATE_FEATURE)
+            return job_id, reclaimed, abandoned, await _get(job_id)
+        finally:
+            await _delete_jobs([job_id])
+
+    job_id, reclaimed, abandoned, job = asyncio.run(run())
+
+    assert reclaimed == []
+    assert [j.id for j in abandoned] == [job_id]
+    assert job.status == JobStatus.FAILED
+    assert job.last_error == "Visibility timeout expired"
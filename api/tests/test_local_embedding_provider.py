@@ -0,0 +1,92 @@
+import asyncio
+from io import BytesIO
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.clients.embedding_provider import LocalEmbeddingProvider
+from app.services.regulation.pdf_reader import iter_pdf_pages
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+class _FakeMiniLM:
+    """Embeds a text as [its length], recording the batches and their threads."""
+
+    def __init__(self):
+        self.batches: List[List[str]] = []
+        self.threads: set[str] = set()
+
+    def __call__(self, texts: List[str]) -> List[np.ndarray]:
+        self.batches.append(texts)
+        self.threads.add(threading.current_thread().name)
+        return [np.array([float(len(text))]) for text in texts]
+
+
+def test_texts_are_embedded_in_batches_off_the_event_loop():
+    provider = LocalEmbeddingProvider(batch_size=3, threads=2)
+    provider._function = _FakeMiniLM()
+    texts = ["a" * length for length in range(1, 9)]
+
+    try:
+        embeddings = asyncio.run(provider.embed(texts))
+    finally:
+        provider.close()
+
+    assert embeddings == [[float(length)] for length in range(1, 9)]
+    assert sorted(map(len, provider._function.batches)) == [2, 3, 3]
+    assert all(name.startswith("local-embed") for name in provider._function.threads)
+
+
+@requires_benchmarks
+def test_benchmark_local_embedding_throughput_and_self_hits():
+    """
+    all-MiniLM-L6-v2 on up to 1000 obligation sentences of the PDFs under data/.
+
+    Each sentence is searched by its first 12 words. Downloads the model on the
+    first run; compare it with OpenAI on real ROUs with
+    `python -m app.rou_index compare-embeddings`.
+    """
+    sentences = list(
+        dict.fromkeys(
+            " ".join(sentence.split())
+            for path in sorted(_DATA_DIR.glob("*.pdf"))
+            for page in iter_pdf_pages(BytesIO(path.read_bytes()))
+            for sentence in re.findall(r"[^.]*\b(?:shall|must)\b[^.]*\.", page.text)
+            if len(sentence.split()) > 15
+        )
+    )[:1000]
+    queries = [" ".join(sentence.split()[:12]) for sentence in sentences]
+    provider = LocalEmbeddingProvider(batch_size=32, threads=2)
+
+    async def run():
+        await provider.embed(["warm up"])
+        started = time.perf_counter()
+        documents = await provider.embed(sentences)
+        seconds = time.perf_counter() - started
+        return np.array(documents), np.array(await provider.embed(queries)), seconds
+
+    try:
+        documents, query_vectors, seconds = asyncio.run(run())
+    finally:
+        provider.close()
+
+    documents /= np.linalg.norm(documents, axis=1, keepdims=True)
+    query_vectors /= np.linalg.norm(query_vectors, axis=1, keepdims=True)
+    hits = np.argsort(-(query_vectors @ documents.T), axis=1)[:, :10]
+    self_hit_rate = np.mean([i in row for i, row in enumerate(hits)])
+    print(
+        f"{len(sentences)} sentences at {len(sentences) / seconds:.0f} embeddings/s; "
+        f"self-hit rate@10 {self_hit_rate:.2f}"
+    )
+    assert self_hit_rate >= 0.8
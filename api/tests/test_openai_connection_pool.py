@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import uvicorn
+
+from app.clients.embedding_provider import OpenAIEmbeddingProvider
+from app.clients.openai_client import (
+    get_async_openai_client_cached,
+    get_openai_connection_stats,
+    get_openai_http_async_client,
+)
+from app.config.app_config import get_app_config
+from app.config.models.fake_openai_config import FakeOpenAIConfig
+from app.dtos.extraction_result import ExtractedRouDto
+from app.fake_openai.server import create_app
+from app.services.cache.llm_response_cache import get_llm_response_cache
+from app.services.regulation.rou_extraction.rou_deduplicate_model import get_rou_dedup_model
+from app.services.regulation.rou_extraction.rou_extract_model import get_rou_extract_model
+
+_CACHED_CLIENTS = (
+    get_openai_http_async_client,
+    get_async_openai_client_cached,
+    get_llm_response_cache,
+    get_rou_extract_model,
+    get_rou_dedup_model,
+)
+
+
+@pytest.fixture
+def base_url(monkeypatch):
+    # the fake OpenAI server over real TCP (keep-alive, as the OpenAI API), so
+    # the connections the pool opens can be counted
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(FakeOpenAIConfig()), host="127.0.0.1", port=0, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}/v1"
+
+    config = get_app_config()
+    monkeypatch.setattr(config.openai, "base_url", base_url)
+    # every call must reach the server
+    monkeypatch.setattr(config.llm_cache, "enabled", False)
+    # the shared clients are bound to the event loop of the test
+    for getter in _CACHED_CLIENTS:
+        getter.cache_clear()
+    yield base_url
+    for getter in _CACHED_CLIENTS:
+        getter.cache_clear()
+    server.should_exit = True
+    thread.join()
+
+
+def _rou(text: str) -> ExtractedRouDto:
+    return ExtractedRouDto(canonical_text=text, desc=text, obligations=[text], jurisdiction="Utah")
+
+
+def test_agents_and_clients_share_one_connection_across_calls(base_url):
+    rounds = 4
+
+    async def run() -> None:
+        # chat models of two agent factories, and two embedding clients with
+        # different keys, all go through the process-wide pool
+        extract_model, dedup_model = get_rou_extract_model(), get_rou_dedup_model()
+        providers = [
+            OpenAIEmbeddingProvider(
+                model="text-embedding-3-small",
+                openai_model="text-embedding-3-small",
+                openai_client=get_async_openai_client_cached(api_key=api_key, base_url=base_url),
+            )
+            for api_key in ("sk-first", "sk-second")
+        ]
+        try:
+            for i in range(rounds):
+                await extract_model.extract_cached(f"Section {i}. Operators shall verify age.")
+                await dedup_model.dedup([[_rou(f"verify age {i}")], [_rou(f"verify user age {i}")]])
+                await providers[i % 2].embed([f"query {i}"])
+        finally:
+            await get_openai_http_async_client().aclose()
+
+    before = get_openai_connection_stats().stats()
+    asyncio.run(run())
+    after = get_openai_connection_stats().stats()
+
+    assert after.requests - before.requests == rounds * 3
+    assert after.new_connections - before.new_connections == 1
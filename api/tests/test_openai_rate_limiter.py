@@ -0,0 +1,129 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.clients import openai_rate_limiter
+from app.clients.openai_rate_limiter import OpenAIRateLimiter, _estimate_request_tokens
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(openai_rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def _response(status_code: int = 200, **headers: str) -> httpx.Response:
+    return httpx.Response(status_code, headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+def test_requests_beyond_the_bucket_wait_for_the_refill(clock):
+    limiter = OpenAIRateLimiter(requests_per_minute=60, tokens_per_minute=1_000_000)
+
+    assert [limiter._reserve(1) for _ in range(60)] == [0.0] * 60
+    assert limiter._reserve(1) == pytest.approx(1.0)
+    assert limiter._reserve(1) == pytest.approx(2.0)
+
+    clock.now += 2
+    assert limiter._reserve(1) == pytest.approx(1.0)
+    assert limiter.stats().queue_depth == 3
+
+
+def test_tokens_are_reserved_up_front_and_capped_at_the_bucket(clock):
+    limiter = OpenAIRateLimiter(requests_per_minute=1000, tokens_per_minute=1000)
+
+    assert limiter._reserve(600) == 0.0
+    # 200 tokens short, refilled at 1000 a minute
+    assert limiter._reserve(600) == pytest.approx(12.0)
+    # larger than the bucket: waits for a full bucket instead of forever
+    assert limiter._reserve(5000) == pytest.approx(72.0)
+
+
+def test_remaining_headers_only_lower_the_estimate(clock):
+    limiter = OpenAIRateLimiter(requests_per_minute=60, tokens_per_minute=6000)
+
+    limiter.observe(
+        _response(x_ratelimit_remaining_requests="0", x_ratelimit_remaining_tokens="9000")
+    )
+
+    assert limiter.stats().requests_available == 0
+    assert limiter.stats().tokens_available == 6000
+    assert limiter._reserve(1) == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "headers, pause",
+    [
+        ({"retry_after_ms": "250", "retry_after": "1"}, 0.25),
+        ({"retry_after": "3"}, 3.0),
+        ({}, 1.0),
+    ],
+)
+def test_429_pauses_for_the_retry_after_or_the_backoff(clock, headers, pause):
+    limiter = OpenAIRateLimiter(requests_per_minute=1000, tokens_per_minute=1_000_000)
+
+    limiter.observe(_response(429, **headers))
+
+    assert limiter._reserve(1) == pytest.approx(pause)
+    assert limiter.stats().rate_limited == 1
+
+
+def test_backoff_doubles_up_to_the_cap_and_decays_by_half(clock):
+    limiter = OpenAIRateLimiter(
+        requests_per_minute=1000, tokens_per_minute=1_000_000, max_backoff_seconds=8
+    )
+
+    pauses = []
+    for _ in range(5):
+        limiter.observe(_response(429))
+        pauses.append(limiter._reserve(1))
+        clock.now += 60
+    limiter.observe(_response(200))
+    limiter.observe(_response(429))
+
+    assert pauses == pytest.approx([1, 2, 4, 8, 8])
+    # one success halves the backoff instead of resetting it
+    assert limiter._reserve(1) == pytest.approx(4)
+
+
+def test_429_also_delays_requests_already_waiting():
+    limiter = OpenAIRateLimiter(requests_per_minute=600, tokens_per_minute=1_000_000)
+    for _ in range(600):
+        limiter._reserve(1)
+
+    async def run() -> float:
+        # reserved before the 429: its own wait is 0.1s
+        waiter = asyncio.create_task(limiter.acquire(1))
+        await asyncio.sleep(0.05)
+        rate_limited_at = time.monotonic()
+        limiter.observe(_response(429, retry_after_ms="300"))
+        await waiter
+        return time.monotonic() - rate_limited_at
+
+    assert asyncio.run(run()) >= 0.29
+    assert limiter.stats().queue_depth == 0
+
+
+def test_request_estimate_includes_the_completion_budget_of_every_choice():
+    prompt = {"model": "gpt", "messages": [{"role": "user", "content": "x" * 400}]}
+    chat = httpx.Request(
+        "POST", "http://test", json={**prompt, "max_completion_tokens": 500, "n": 2}
+    )
+    legacy = httpx.Request("POST", "http://test", json={**prompt, "max_tokens": 500})
+    plain = httpx.Request("POST", "http://test", json=prompt)
+    prompt_tokens = len(json.dumps(prompt)) // 4
+
+    assert _estimate_request_tokens(plain) == pytest.approx(prompt_tokens, abs=2)
+    assert _estimate_request_tokens(chat) == pytest.approx(prompt_tokens + 1000, abs=10)
+    assert _estimate_request_tokens(legacy) == pytest.approx(prompt_tokens + 500, abs=10)
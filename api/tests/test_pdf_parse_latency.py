@@ -0,0 +1,187 @@
+import asyncio
+from io import BytesIO
+import os
+import time
+from typing import List
+
+import httpx
+import numpy as np
+import pytest
+
+from app.config.app_config import get_app_config
+from app.main import app
+from app.services.feature.feature_service import FeatureService
+from app.services.regulation import pdf_reader
+from app.services.regulation.pdf_reader import aiter_pdf_pages
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import MapReduceRouExtractor
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+
+def make_pdf(page_texts: List[str]) -> bytes:
+    """A minimal PDF with one line of Helvetica text per page."""
+    page_ids = [4 + 2 * i for i in range(len(page_texts))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, page_texts):
+        stream = b"BT /F1 10 Tf 20 700 Td (%s) Tj ET" % text.encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
+
+
+class _FeatureService:
+    async def get_all_features(self):
+        return []
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    config = get_app_config().pdf_reader
+    monkeypatch.setattr(config, "max_workers", 2)
+    monkeypatch.setattr(config, "pages_per_task", 50)
+    pdf_reader.get_pdf_executor.cache_clear()
+    pdf_reader.get_pdf_parse_limiter.cache_clear()
+    yield
+    pdf_reader.get_pdf_executor().shutdown(cancel_futures=True)
+    pdf_reader.get_pdf_executor.cache_clear()
+    pdf_reader.get_pdf_parse_limiter.cache_clear()
+
+
+def test_pages_are_parsed_in_the_process_pool(process_pool):
+    texts = [f"Article {number} requires age verification" for number in range(1, 121)]
+
+    async def run():
+        pdf_reader.get_pdf_parse_limiter().start()
+        return [page async for page in aiter_pdf_pages(BytesIO(make_pdf(texts)), use_cache=False)]
+
+    pages = asyncio.run(run())
+
+    assert [page.number for page in pages] == list(range(1, 121))
+    assert [page.text.strip() for page in pages] == texts
+
+
+def test_each_worker_decodes_a_pdf_once(tmp_path, monkeypatch):
+    path = tmp_path / "regulation.pdf"
+    path.write_bytes(make_pdf([f"page {number}" for number in range(10)]))
+    decodes = []
+    decode = pdf_reader.PyPDF2.PdfReader
+
+    def counting_decode(*args):
+        decodes.append(args)
+        return decode(*args)
+
+    pdf_reader._open_pdf.cache_clear()
+    monkeypatch.setattr(pdf_reader.PyPDF2, "PdfReader", counting_decode)
+
+    pages = [
+        page.text.strip()
+        for start in range(0, 10, 3)
+        for page in pdf_reader._extract_page_range(str(path), start, min(start + 3, 10))
+    ]
+
+    assert pages == [f"page {number}" for number in range(10)]
+    assert pdf_reader._count_pages(str(path)) == 10
+    assert len(decodes) == 1
+    pdf_reader._open_pdf.cache_clear()
+
+
+def test_get_features_stays_fast_while_a_pdf_is_parsed(process_pool):
+    """The request's benchmark: p99 latency of GET /features during a large parse."""
+    data = make_pdf([f"Section {number}. " + "The provider shall " * 60 for number in range(1500)])
+    app.dependency_overrides[FeatureService] = _FeatureService
+
+    async def run():
+        pdf_reader.get_pdf_parse_limiter().start()
+
+        async def consume() -> int:
+            return len([page async for page in aiter_pdf_pages(BytesIO(data), use_cache=False)])
+
+        latencies = []
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            parse = asyncio.create_task(consume())
+            started = time.perf_counter()
+            while not parse.done():
+                request_started = time.perf_counter()
+                response = await client.get("/features/")
+                latencies.append(time.perf_counter() - request_started)
+                assert response.status_code == 200
+                await asyncio.sleep(0.005)
+            return await parse, time.perf_counter() - started, latencies
+
+    try:
+        page_count, parse_seconds, latencies = asyncio.run(run())
+    finally:
+        app.dependency_overrides.pop(FeatureService)
+
+    p99 = float(np.percentile(latencies, 99))
+    print(f"parsed {page_count} pages in {parse_seconds:.2f}s; GET /features p99 {p99 * 1000:.1f}ms")
+    assert page_count == 1500
+    assert len(latencies) >= 20
+    # parsing on the event loop would stall every request for the whole parse
+    assert p99 < min(0.25, parse_seconds / 4)
+
+
+class _MapModel:
+    """Records when the first chunk reaches the map step."""
+
+    def __init__(self):
+        self.first_chunk_at: float | None = None
+
+    async def extract_cached(self, chunk: str):
+        if self.first_chunk_at is None:
+            self.first_chunk_at = time.perf_counter()
+        return [], False
+
+
+@requires_benchmarks
+def test_benchmark_first_chunk_is_extracted_while_the_pdf_is_parsed(process_pool):
+    """Time until the first chunk reaches the LLM, against the time to parse the whole PDF."""
+    data = make_pdf([f"Section {number}. " + "The provider shall " * 60 for number in range(1500)])
+    map_model = _MapModel()
+    config = get_app_config().rou_extraction.model_copy(update={"prededup_enabled": False})
+    extractor = MapReduceRouExtractor(map_model, None, None, config)
+    parsed: List[float] = []
+
+    async def pages():
+        async for page in aiter_pdf_pages(BytesIO(data), use_cache=False):
+            parsed.append(time.perf_counter())
+            yield page
+
+    async def run() -> float:
+        pdf_reader.get_pdf_parse_limiter().start()
+        started = time.perf_counter()
+        await extractor.extract_pages(pages())
+        return started
+
+    started = asyncio.run(run())
+
+    first_chunk, parse_seconds = map_model.first_chunk_at - started, parsed[-1] - started
+    print(f"first chunk after {first_chunk:.2f}s; {len(parsed)} pages parsed in {parse_seconds:.2f}s")
+    assert len(parsed) == 1500
+    # the map step starts after the first page range instead of after the last page;
+    # decoding the PDF in the worker comes before either
+    assert first_chunk < parse_seconds / 2
@@ -0,0 +1,113 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import threading
+from typing import List
+
+import pytest
+
+from app.config.app_config import get_app_config
+from app.services.regulation import pdf_reader
+from app.services.regulation.pdf_reader import PdfPage, aiter_pdf_pages
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import MapReduceRouExtractor
+
+PAGE_COUNT = 12
+PAGES_PER_TASK = 3
+
+
+def _page_text(number: int) -> str:
+    return f"Article {number}. The provider shall keep a log of every moderation decision. " * 40
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    """Parse in threads with fake page ranges; the pool workers of a spawned process can't be patched."""
+    config = get_app_config().pdf_reader
+    monkeypatch.setattr(config, "pages_per_task", PAGES_PER_TASK)
+    monkeypatch.setattr(config, "split_large_pdfs", True)
+    monkeypatch.setattr(config, "max_workers", 2)
+
+    executor = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(pdf_reader, "get_pdf_executor", lambda: executor)
+    monkeypatch.setattr(pdf_reader, "_count_pages", lambda path: PAGE_COUNT)
+    pdf_reader.get_pdf_parse_limiter.cache_clear()
+    yield
+    pdf_reader.get_pdf_parse_limiter.cache_clear()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _parsing(awaitable):
+    # the limiter binds to the loop of the test, as it does to the app's in the lifespan
+    pdf_reader.get_pdf_parse_limiter().start()
+    return await awaitable
+
+
+class _RecordingMapModel:
+    def __init__(self):
+        self.started = threading.Event()
+
+    async def extract_cached(self, text: str):
+        self.started.set()
+        return [], False
+
+
+def test_chunks_are_extracted_while_later_pages_are_parsed(thread_pool, monkeypatch):
+    map_model = _RecordingMapModel()
+    overlapped: List[bool] = []
+
+    def extract_page_range(path: str, start: int, stop: int) -> List[PdfPage]:
+        if start == PAGE_COUNT - PAGES_PER_TASK:
+            # the last range only finishes once extraction has begun, or gives up
+            overlapped.append(map_model.started.wait(timeout=10))
+        return [PdfPage(number=i + 1, text=_page_text(i + 1)) for i in range(start, stop)]
+
+    monkeypatch.setattr(pdf_reader, "_extract_page_range", extract_page_range)
+    config = get_app_config().rou_extraction.model_copy(update={"prededup_enabled": False})
+    extractor = MapReduceRouExtractor(map_model, None, None, config)
+
+    rous = asyncio.run(
+        _parsing(extractor.extract_pages(aiter_pdf_pages(BytesIO(b"%PDF"), use_cache=False)))
+    )
+
+    assert rous == []
+    assert overlapped == [True]
+
+
+def test_paused_consumer_does_not_hold_a_parse_permit(thread_pool, monkeypatch):
+    monkeypatch.setattr(get_app_config().pdf_reader, "max_concurrent_parses", 1)
+    monkeypatch.setattr(
+        pdf_reader,
+        "_extract_page_range",
+        lambda path, start, stop: [
+            PdfPage(number=i + 1, text=_page_text(i + 1)) for i in range(start, stop)
+        ],
+    )
+
+    async def run() -> int:
+        paused = aiter_pdf_pages(BytesIO(b"%PDF-paused"), use_cache=False)
+        await anext(paused)
+        # with the permit held across the yield this would never finish
+        pages = [
+            page
+            async for page in aiter_pdf_pages(BytesIO(b"%PDF-other"), use_cache=False)
+        ]
+        await paused.aclose()
+        return len(pages)
+
+    assert asyncio.run(_parsing(asyncio.wait_for(run(), timeout=10))) == PAGE_COUNT
+
+
+def test_pages_are_yielded_in_order(thread_pool, monkeypatch):
+    def extract_page_range(path: str, start: int, stop: int) -> List[PdfPage]:
+        # later ranges finish first
+        threading.Event().wait(0.01 * (PAGE_COUNT - start))
+        return [PdfPage(number=i + 1, text=_page_text(i + 1)) for i in range(start, stop)]
+
+    monkeypatch.setattr(pdf_reader, "_extract_page_range", extract_page_range)
+
+    async def run() -> List[int]:
+        return [
+            page.number async for page in aiter_pdf_pages(BytesIO(b"%PDF"), use_cache=False)
+        ]
+
+    assert asyncio.run(_parsing(run())) == list(range(1, PAGE_COUNT + 1))
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from typing import List
+
+from app.clients.rou_vector_store import VectorHit
+from app.config.models.rou_retrieval_config import RouRetrievalConfig
+from app.database.schemas.enums.rou_type import RouType
+from app.services.regulation.regulation_service import RegulationService
+from app.services.regulation.rou_lexical_index import RouLexicalIndex
+
+
+class _CountingRepository:
+    """Records every repository method called; only `get_by_filter` returns rows."""
+
+    def __init__(self, rows: List[SimpleNamespace] = ()):
+        self.rows = {row.id: row for row in rows}
+        self.calls: List[str] = []
+
+    def __getattr__(self, name):
+        async def call(*args, **kwargs):
+            self.calls.append(name)
+            if name == "get_by_filter":
+                return [self.rows[rou_id] for rou_id in kwargs["id"] if rou_id in self.rows]
+            raise AssertionError(f"unexpected repository call {name}")
+
+        return call
+
+
+class _FakeVectorStore:
+    def __init__(self, rou_ids: List[int]):
+        self.rou_ids = rou_ids
+
+    async def query(self, query, n_results, jurisdictions=None, regulation_ids=None):
+        return [VectorHit(rou_id, 0.1 * rank) for rank, rou_id in enumerate(self.rou_ids)]
+
+
+def _rou(rou_id: int, text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=rou_id,
+        type=RouType.AI,
+        canonical_text=text,
+        desc=text,
+        obligations=[text],
+        jurisdiction="Utah",
+        source_id=1,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+def _service(vector_ids: List[int], lexical_index: RouLexicalIndex, repository) -> RegulationService:
+    return RegulationService(
+        rou_extractor=None,
+        rou_repository=repository,
+        rou_vector_store=_FakeVectorStore(vector_ids),
+        rou_lexical_index=lexical_index,
+        retrieval_config=RouRetrievalConfig(),
+        regulation_repository=repository,
+    )
+
+
+def test_search_is_served_from_memory_without_postgres():
+    lexical_index = RouLexicalIndex(RouRetrievalConfig())
+    lexical_index.add([_rou(1, "verify age"), _rou(2, "retain logs"), _rou(3, "verify SB976")])
+    repository = _CountingRepository()
+
+    hits = asyncio.run(
+        _service([1, 2], lexical_index, repository).query_relevant_rous("verify SB976")
+    )
+
+    assert repository.calls == []
+    assert {hit.id for hit in hits} == {1, 2, 3}
+    assert hits[0].id == 1
+
+
+def test_hits_missing_from_the_index_are_loaded_once():
+    lexical_index = RouLexicalIndex(RouRetrievalConfig())
+    lexical_index.add([_rou(1, "verify age")])
+    repository = _CountingRepository([_rou(2, "retain logs")])
+    service = _service([2, 1], lexical_index, repository)
+
+    first = asyncio.run(service.query_relevant_rous("age"))
+    second = asyncio.run(service.query_relevant_rous("age"))
+
+    # the loaded row is indexed, so the second search needs no round trip
+    assert repository.calls == ["get_by_filter"]
+    assert [hit.id for hit in first] == [hit.id for hit in second]
+    assert {hit.id for hit in first} == {1, 2}
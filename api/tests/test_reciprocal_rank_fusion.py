@@ -0,0 +1,25 @@
+from app.services.regulation.regulation_service import reciprocal_rank_fusion
+
+
+def test_items_found_by_both_retrievers_come_first():
+    vector = [1, 2, 3, 4]
+    lexical = [5, 4, 6]
+
+    assert reciprocal_rank_fusion([vector, lexical]) == [4, 1, 5, 2, 3, 6]
+
+
+def test_ties_keep_first_seen_order():
+    # same ranks in both lists, so 1 and 2 tie, as do 3 and 4
+    assert reciprocal_rank_fusion([[1, 3], [2, 4]]) == [1, 2, 3, 4]
+
+
+def test_small_k_favours_top_ranks_over_agreement():
+    rankings = [[1, 2, 6, 3], [4, 5, 7, 3]]
+
+    assert reciprocal_rank_fusion(rankings, k=60)[0] == 3
+    assert reciprocal_rank_fusion(rankings, k=1) == [1, 4, 3, 2, 5, 6, 7]
+
+
+def test_empty_rankings():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], [7]]) == [7]
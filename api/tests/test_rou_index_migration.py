@@ -0,0 +1,230 @@
+import asyncio
+from datetime import datetime, timezone
+from itertools import count
+from typing import Dict, List
+
+import pytest
+
+from app.clients.rou_vector_store import VectorHit
+from app.config.app_config import get_app_config
+from app.database.schemas.enums.rou_index_version_status import RouIndexVersionStatus
+from app.database.schemas.enums.rou_type import RouType
+from app.database.schemas.rou import ROU
+from app.database.schemas.rou_index_version import RouIndexVersion
+from app.dtos.rou_index_dto import RouIndexReconcileResultDTO
+from app.services.regulation import rou_index_migration_service
+from app.services.regulation.rou_index_migration_service import RouIndexMigrationService
+
+
+class _VersionRepository:
+    def __init__(self):
+        self.versions: Dict[int, RouIndexVersion] = {}
+        self._ids = count(1)
+
+    async def create(self, version: RouIndexVersion) -> RouIndexVersion:
+        version.id = next(self._ids)
+        version.created_at = version.updated_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self.versions[version.id] = version
+        return version
+
+    async def get_one_by_id(self, id: int) -> RouIndexVersion | None:
+        return self.versions.get(id)
+
+    async def get_active(self, backend: str) -> RouIndexVersion | None:
+        active = [v for v in self.versions.values() if v.status == RouIndexVersionStatus.ACTIVE]
+        return active[0] if active else None
+
+    async def save_checkpoint(self, id: int, last_rou_id: int, embedded: int) -> None:
+        self.versions[id].last_rou_id = last_rou_id
+        self.versions[id].embedded += embedded
+
+    async def set_status(self, id: int, status: RouIndexVersionStatus) -> None:
+        self.versions[id].status = status
+
+    async def activate(self, id: int, backend: str, catch_up_after: datetime) -> None:
+        for version in self.versions.values():
+            if version.status == RouIndexVersionStatus.ACTIVE:
+                version.status = RouIndexVersionStatus.RETIRED
+        self.versions[id].status = RouIndexVersionStatus.ACTIVE
+        self.versions[id].catch_up_after = catch_up_after
+
+    async def set_caught_up(self, id: int) -> None:
+        self.versions[id].catch_up_after = None
+
+    async def reload(self, version: RouIndexVersion) -> RouIndexVersion:
+        return version
+
+
+class _RouRepository:
+    def __init__(self, rous: List[ROU]):
+        self.rous = rous
+
+    async def get_page(self, after_id: int = 0, limit: int = 1000) -> List[ROU]:
+        return [rou for rou in self.rous if rou.id > after_id][:limit]
+
+    async def get_ids(self) -> List[int]:
+        return [rou.id for rou in self.rous]
+
+    async def get_many_by_ids(self, ids: List[int]) -> List[ROU]:
+        return [rou for rou in self.rous if rou.id in ids]
+
+
+class _Store:
+    def __init__(self, hits: Dict[str, List[int]] | None = None, fail_on_page: int | None = None):
+        self.hits = hits or {}
+        self.fail_on_page = fail_on_page
+        self.indexed: List[str] = []
+        self._pages = 0
+
+    async def index(self, ids, documents, metadatas) -> None:
+        self._pages += 1
+        if self._pages == self.fail_on_page:
+            raise ConnectionError("embedding API unavailable")
+        self.indexed.extend(ids)
+
+    async def query(self, query_text: str, n_results: int) -> List[VectorHit]:
+        return [VectorHit(rou_id, 0.0) for rou_id in self.hits.get(query_text, [])][:n_results]
+
+
+class _ActiveStore:
+    """Stores of the versions, told apart by their embedding provider."""
+
+    def __init__(self, stores: Dict[str, _Store]):
+        self.stores = stores
+        self.refreshes = 0
+
+    def get_store(self, embedding_config) -> _Store:
+        return self.stores[embedding_config.provider]
+
+    async def refresh(self) -> None:
+        self.refreshes += 1
+
+
+def _rou(rou_id: int) -> ROU:
+    return ROU(
+        id=rou_id,
+        type=RouType.AI,
+        canonical_text=f"rou {rou_id}",
+        desc=f"query {rou_id}",
+        obligations=[],
+        jurisdiction="Utah",
+        source_id=1,
+    )
+
+
+def _service(rous: List[ROU], stores: Dict[str, _Store]):
+    versions = _VersionRepository()
+    service = RouIndexMigrationService(
+        rou_repository=_RouRepository(rous),
+        rou_index_version_repository=versions,
+        active_rou_vector_store=_ActiveStore(stores),
+    )
+    return service, versions
+
+
+def _version(versions: _VersionRepository, provider: str, status: RouIndexVersionStatus):
+    return asyncio.run(
+        versions.create(
+            RouIndexVersion(
+                backend=get_app_config().rou_index.backend,
+                provider=provider,
+                openai_model="text-embedding-3-small",
+                openai_dimensions=None,
+                model=provider,
+                status=status,
+                last_rou_id=0,
+                embedded=0,
+            )
+        )
+    )
+
+
+def test_build_resumes_after_the_last_checkpoint():
+    candidate_store = _Store(fail_on_page=3)
+    service, versions = _service([_rou(i) for i in range(1, 8)], {"local": candidate_store})
+    version = _version(versions, "local", RouIndexVersionStatus.BUILDING)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(service.build(version.id, batch_size=2))
+    assert (version.last_rou_id, version.embedded) == (4, 4)
+    assert version.status == RouIndexVersionStatus.BUILDING
+
+    result = asyncio.run(service.build(version.id, batch_size=2))
+
+    # the failed page is the first one embedded again
+    assert candidate_store.indexed == ["1", "2", "3", "4", "5", "6", "7"]
+    assert (result.last_rou_id, result.embedded) == (7, 7)
+    assert result.status == RouIndexVersionStatus.READY
+
+
+def test_report_compares_recall_at_k_of_both_versions():
+    active_store = _Store(
+        hits={"query 1": [1, 2], "query 2": [1, 3], "query 3": [3, 1], "query 4": [4, 2]}
+    )
+    candidate_store = _Store(
+        hits={"query 1": [2, 1], "query 2": [2, 1], "query 3": [1, 2], "query 4": []}
+    )
+    service, versions = _service(
+        [_rou(i) for i in range(1, 5)], {"openai": active_store, "local": candidate_store}
+    )
+    _version(versions, "openai", RouIndexVersionStatus.ACTIVE)
+    candidate = _version(versions, "local", RouIndexVersionStatus.READY)
+
+    report = asyncio.run(service.report(candidate.id, sample_size=10, k=2))
+
+    assert report.sample_size == 4
+    # the active version ranks 1, 3 and 4 first; the candidate has 1 second and 2 first
+    assert report.active.recall_at_k == 0.75
+    assert report.candidate.recall_at_k == 0.5
+    # shared hits: 2 of 2, 1 of 2, 1 of 2 and none
+    assert report.overlap == 0.5
+    assert sorted(
+        (example.rou_id, example.active_rank, example.candidate_rank)
+        for example in report.examples
+    ) == [(2, None, 1), (3, 1, None), (4, 1, None)]
+
+
+class _RouIndexService:
+    """Stands in for the reconcile of the version being switched to."""
+
+    reconciles = 0
+    fail_after_switch = False
+
+    def __init__(self, rou_repository, rou_vector_store):
+        pass
+
+    async def reconcile(self, index_missing: bool = False) -> RouIndexReconcileResultDTO:
+        _RouIndexService.reconciles += 1
+        if _RouIndexService.fail_after_switch and _RouIndexService.reconciles == 2:
+            raise KeyboardInterrupt
+        return RouIndexReconcileResultDTO(rous=1, vectors=1, orphans=0, missing=0)
+
+
+def test_interrupted_switch_resumes_with_the_catch_up(monkeypatch):
+    monkeypatch.setattr(rou_index_migration_service, "RouIndexService", _RouIndexService)
+    monkeypatch.setattr(rou_index_migration_service, "_SWITCH_GRACE_SECONDS", 0)
+    monkeypatch.setattr(get_app_config().rou_index, "active_refresh_interval_seconds", 0)
+    monkeypatch.setattr(_RouIndexService, "reconciles", 0)
+    monkeypatch.setattr(_RouIndexService, "fail_after_switch", True)
+    service, versions = _service([_rou(1)], {"openai": _Store(), "local": _Store()})
+    active = _version(versions, "openai", RouIndexVersionStatus.ACTIVE)
+    candidate = _version(versions, "local", RouIndexVersionStatus.READY)
+
+    with pytest.raises(KeyboardInterrupt):
+        asyncio.run(service.switch(candidate.id))
+
+    assert candidate.status == RouIndexVersionStatus.ACTIVE
+    assert active.status == RouIndexVersionStatus.RETIRED
+    assert candidate.catch_up_after is not None
+
+    monkeypatch.setattr(_RouIndexService, "fail_after_switch", False)
+    result = asyncio.run(service.switch(candidate.id))
+
+    # only the catch-up after the switch is run again
+    assert _RouIndexService.reconciles == 3
+    assert result.before_switch is None
+    assert result.after_switch.rous == 1
+    assert result.version.catch_up_after is None
+    assert service.active_rou_vector_store.refreshes == 1
+    with pytest.raises(ValueError):
+        asyncio.run(service.switch(candidate.id))
@@ -0,0 +1,60 @@
+import asyncio
+from typing import List, Set
+
+from app.services.regulation.rou_index_service import RouIndexService
+
+
+class _Corpus:
+    """Rows and vectors of a ROU corpus where a ROU is stored during the first read."""
+
+    def __init__(self, rou_ids: Set[int], vector_ids: Set[int], stored_during_read: int):
+        self.rou_ids = rou_ids
+        self.vector_ids = vector_ids
+        self.stored_during_read = stored_during_read
+        self.deleted_vectors: List[str] = []
+        self._reads = 0
+
+    def read(self) -> None:
+        self._reads += 1
+        if self._reads == 1:
+            # as `store_rous` does: the row commits, then the vector is written
+            self.rou_ids.add(self.stored_during_read)
+            self.vector_ids.add(self.stored_during_read)
+
+
+class _Repository:
+    def __init__(self, corpus: _Corpus):
+        self.corpus = corpus
+
+    async def get_ids(self) -> List[int]:
+        ids = sorted(self.corpus.rou_ids)
+        self.corpus.read()
+        return ids
+
+
+class _VectorStore:
+    def __init__(self, corpus: _Corpus):
+        self.corpus = corpus
+
+    async def list_ids(self) -> List[str]:
+        ids = [str(rou_id) for rou_id in sorted(self.corpus.vector_ids)]
+        self.corpus.read()
+        return ids
+
+    async def delete(self, ids: List[str]) -> None:
+        self.corpus.deleted_vectors.extend(ids)
+        self.corpus.vector_ids -= {int(rou_id) for rou_id in ids}
+
+
+def test_rou_stored_during_reconcile_keeps_its_vector():
+    # 3 is a real orphan: its row is gone
+    corpus = _Corpus(rou_ids={1, 2}, vector_ids={1, 2, 3}, stored_during_read=4)
+    service = RouIndexService(_Repository(corpus), _VectorStore(corpus))
+
+    result = asyncio.run(service.reconcile())
+
+    assert corpus.deleted_vectors == ["3"]
+    assert corpus.vector_ids == {1, 2, 4}
+    assert result.orphans == 1
+    # only seen in Postgres, so counted as missing until the next run
+    assert result.missing == 1
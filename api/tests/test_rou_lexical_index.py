@@ -0,0 +1,87 @@
+from datetime import datetime
+import os
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.config.models.rou_retrieval_config import RouRetrievalConfig
+from app.database.schemas.enums.rou_type import RouType
+from app.services.regulation.rou_lexical_index import RouLexicalIndex, tokenize
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+_TOPICS = [
+    "parental consent",
+    "age verification",
+    "data retention",
+    "content moderation",
+    "incident reporting",
+    "targeted advertising",
+    "account deletion",
+    "push notifications",
+    "default privacy settings",
+    "transparency reports",
+]
+
+
+def _rou(rou_id: int, topic: str, statute: str) -> SimpleNamespace:
+    text = f"Operators shall meet the {topic} obligations of {statute}."
+    return SimpleNamespace(
+        id=rou_id,
+        type=RouType.AI,
+        canonical_text=text,
+        desc=f"{topic.capitalize()} under {statute}",
+        obligations=[f"Comply with {topic} rules"],
+        jurisdiction="Utah",
+        source_id=1,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+def test_tokens_mixing_letters_and_digits_also_yield_their_parts():
+    assert tokenize("SB976, Article 16") == ["sb976", "sb", "976", "article", "16"]
+    assert set(tokenize("sb-976")) <= set(tokenize("SB976"))
+
+
+@requires_benchmarks
+def test_benchmark_statute_queries():
+    """5000 ROUs citing 600 statutes: recall of topic queries and precision of statute queries."""
+    rng = random.Random(0)
+    # half are written without a space, as "SB123", and queried with one
+    statutes = [f"SB{n}" if n % 2 else f"SB {n}" for n in range(100, 700)]
+    cited = [(rng.choice(_TOPICS), rng.choice(statutes)) for _ in range(5000)]
+    rous = [_rou(rou_id, topic, statute) for rou_id, (topic, statute) in enumerate(cited, 1)]
+    index = RouLexicalIndex(RouRetrievalConfig())
+
+    started = time.perf_counter()
+    index.add(rous)
+    build_seconds = time.perf_counter() - started
+
+    targets = rng.sample(rous, 200)
+    found, latencies = 0, []
+    for rou in targets:
+        topic, statute = cited[rou.id - 1]
+        query = f"{topic} requirements in SB {statute.removeprefix('SB').strip()}"
+        started = time.perf_counter()
+        found += rou.id in index.search(query, 30)
+        latencies.append(time.perf_counter() - started)
+
+    precisions = []
+    for statute in rng.sample(statutes, 50):
+        hits = index.search(f"{statute} obligations", 10)
+        # about eight ROUs cite each statute, which caps what the top 10 can hold
+        citing = min(len(hits), sum(cited_statute == statute for _, cited_statute in cited))
+        precisions.append(sum(cited[rou_id - 1][1] == statute for rou_id in hits) / citing)
+
+    print(
+        f"built in {build_seconds * 1000:.0f}ms; target in the top 30 for {found} of "
+        f"{len(targets)} topic queries; {statistics.mean(precisions):.0%} of the ROUs citing "
+        f"a statute in the top 10 for it; p50 search {statistics.median(latencies) * 1000:.1f}ms"
+    )
+    assert found >= 0.95 * len(targets)
+    assert statistics.mean(precisions) >= 0.95
@@ -0,0 +1,116 @@
+import asyncio
+import math
+from typing import Dict, List, Tuple
+
+from app.clients.embedding_provider import EmbeddingProvider
+from app.config.app_config import get_app_config
+from app.dtos.extraction_result import ExtractedRouDto
+from app.services.regulation.rou_extraction.rou_prededup import RouPreDedup
+
+
+def _similar_to_first_axis(cosine: float, axis: int) -> List[float]:
+    """Unit vector with cosine similarity `cosine` to the first axis, tilted towards `axis`."""
+    vector = [cosine, 0.0, 0.0, 0.0]
+    vector[axis] = math.sqrt(1 - cosine**2)
+    return vector
+
+
+class _FakeEmbeddingProvider(EmbeddingProvider):
+    model = "fake"
+
+    def __init__(self, vectors: Dict[str, List[float]]):
+        self.vectors = vectors
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        return [self.vectors[text] for text in texts], 0
+
+
+def _rou(text: str, jurisdiction: str = "Utah", obligation: str | None = None) -> ExtractedRouDto:
+    return ExtractedRouDto(
+        canonical_text=text,
+        desc=text,
+        obligations=[obligation or text],
+        jurisdiction=jurisdiction,
+    )
+
+
+def _prededup(vectors: Dict[str, List[float]]) -> RouPreDedup:
+    app_config = get_app_config()
+    rou_extraction_config = app_config.rou_extraction.model_copy(
+        update={"prededup_merge_threshold": 0.95, "prededup_ambiguous_threshold": 0.85}
+    )
+    return RouPreDedup(_FakeEmbeddingProvider(vectors), rou_extraction_config, app_config.rou_index)
+
+
+def test_thresholds_split_merged_ambiguous_and_unique():
+    prededup = _prededup(
+        {
+            "verify age": [1.0, 0.0, 0.0, 0.0],
+            # above the merge threshold
+            "verify user age": _similar_to_first_axis(0.97, axis=1),
+            # between the thresholds, also to "verify user age" (0.97 * 0.9)
+            "verify age with id": _similar_to_first_axis(0.9, axis=2),
+            "retain logs": [0.0, 0.0, 0.0, 1.0],
+        }
+    )
+    chunk_rous = [
+        [_rou("verify age"), _rou("retain logs")],
+        [_rou("verify user age", obligation="ask for birth date"), _rou("verify age with id")],
+    ]
+
+    result = asyncio.run(prededup.run(chunk_rous))
+
+    merged = _rou("verify age").model_copy(
+        update={"obligations": ["verify age", "ask for birth date"]}
+    )
+    assert result.unique == [_rou("retain logs")]
+    assert result.ambiguous == [[merged, _rou("verify age with id")]]
+    assert result.rous_lists == [[merged, _rou("retain logs")], [_rou("verify age with id")]]
+
+
+def test_similar_rous_of_other_jurisdictions_are_left_to_the_llm():
+    prededup = _prededup(
+        {
+            "verify age": [1.0, 0.0, 0.0, 0.0],
+            "verify user age": _similar_to_first_axis(0.99, axis=1),
+        }
+    )
+
+    result = asyncio.run(
+        prededup.run([[_rou("verify age", "Utah")], [_rou("verify user age", "California")]])
+    )
+
+    assert result.unique == []
+    assert result.ambiguous == [[_rou("verify age", "Utah"), _rou("verify user age", "California")]]
+
+
+def test_normalized_text_duplicates_merge_without_embeddings():
+    # no vectors: embedding a single surviving ROU would fail the lookup
+    prededup = _prededup({})
+
+    result = asyncio.run(
+        prededup.run([[_rou("Verify age.", obligation="a")], [_rou("verify  AGE", obligation="b")]])
+    )
+
+    merged = _rou("Verify age.", obligation="a").model_copy(update={"obligations": ["a", "b"]})
+    assert result.unique == [merged]
+    assert result.ambiguous == []
+
+
+def test_zero_vector_is_kept_apart_without_nan(recwarn):
+    prededup = _prededup(
+        {
+            "verify age": [1.0, 0.0, 0.0, 0.0],
+            "verify user age": _similar_to_first_axis(0.97, axis=1),
+            "": [0.0, 0.0, 0.0, 0.0],
+        }
+    )
+
+    result = asyncio.run(
+        prededup.run([[_rou("verify age"), _rou("")], [_rou("verify user age", obligation="b")]])
+    )
+
+    merged = _rou("verify age").model_copy(update={"obligations": ["verify age", "b"]})
+    assert result.unique == [merged, _rou("")]
+    assert result.ambiguous == []
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
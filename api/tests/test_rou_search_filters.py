@@ -0,0 +1,138 @@
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from app.clients.chroma_rou_vector_store import ChromaRouVectorStore, rou_where
+from app.clients.chromadb_client import get_chromadb_client, get_rou_collection
+from app.clients.embedding_provider import EmbeddingProvider
+from app.clients.rou_vector_store import rou_metadata
+from app.config.app_config import get_app_config
+from app.database.schemas.enums.rou_type import RouType
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+
+class _UnusedEmbeddingProvider(EmbeddingProvider):
+    # vectors are passed in precomputed
+    model = "filter-test"
+
+    async def _embed(self, texts: List[str]) -> Tuple[List[List[float]], int]:
+        raise AssertionError("no embedding expected")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(get_app_config().chroma, "mode", "persistent")
+    monkeypatch.setattr(get_app_config().chroma, "persist_path", str(tmp_path))
+    get_chromadb_client.cache_clear()
+    get_rou_collection.cache_clear()
+    app_config = get_app_config()
+    store = ChromaRouVectorStore(app_config.chroma, app_config.rou_index, _UnusedEmbeddingProvider())
+    yield store
+    store.close()
+    get_rou_collection.cache_clear()
+    get_chromadb_client.cache_clear()
+
+
+def _rou(rou_id: int, jurisdiction: str, source_id: int):
+    return SimpleNamespace(
+        id=rou_id, jurisdiction=jurisdiction, source_id=source_id, type=RouType.AI
+    )
+
+
+def test_where_clause_normalizes_and_combines_filters():
+    assert rou_where() is None
+    assert rou_where(jurisdictions=["Utah", "utah.", "California"]) == {
+        "jurisdiction": {"$in": ["california", "utah"]}
+    }
+    assert rou_where(jurisdictions=["EU"], regulation_ids=[3, 1, 3]) == {
+        "$and": [{"jurisdiction": {"$in": ["eu"]}}, {"source_id": {"$in": [1, 3]}}]
+    }
+
+
+def test_search_returns_only_rous_matching_the_filters(store):
+    rous = [
+        _rou(1, "Utah", 10),
+        _rou(2, "California", 10),
+        _rou(3, "UTAH ", 11),
+        _rou(4, "EU", 12),
+    ]
+    # the closest vectors to the query belong to the ROUs filtered out
+    embeddings = [[0.6, 0.8, 0.0], [1.0, 0.0, 0.0], [0.0, 0.8, 0.6], [0.99, 0.1, 0.0]]
+
+    async def run():
+        await store.upsert(
+            [str(rou.id) for rou in rous],
+            [f"rou {rou.id}" for rou in rous],
+            embeddings,
+            [rou_metadata(rou) for rou in rous],
+        )
+        by_jurisdiction = await store.search([1.0, 0.0, 0.0], 10, jurisdictions=["utah"])
+        by_both = await store.search(
+            [1.0, 0.0, 0.0], 10, jurisdictions=["Utah", "EU"], regulation_ids=[11, 12]
+        )
+        unfiltered = await store.search([1.0, 0.0, 0.0], 2)
+        return by_jurisdiction, by_both, unfiltered
+
+    by_jurisdiction, by_both, unfiltered = asyncio.run(run())
+
+    assert [hit.rou_id for hit in by_jurisdiction] == [1, 3]
+    assert [hit.rou_id for hit in by_both] == [4, 3]
+    assert [hit.rou_id for hit in unfiltered] == [2, 4]
+
+
+@requires_benchmarks
+def test_benchmark_filtered_against_unfiltered_search(store):
+    """3000 ROUs of 60 regulations in 30 jurisdictions; 50 top-10 searches for one jurisdiction."""
+    rng = np.random.default_rng(0)
+    rous = [_rou(i, f"State {i % 60 % 30}", i % 60) for i in range(3000)]
+    vectors = rng.normal(size=(len(rous), 64)).tolist()
+    queries = [(rng.normal(size=64).tolist(), int(rng.integers(60))) for _ in range(50)]
+
+    async def run():
+        await store.upsert(
+            [str(rou.id) for rou in rous],
+            [""] * len(rous),
+            vectors,
+            [rou_metadata(rou) for rou in rous],
+        )
+        results = {"unfiltered": [], "jurisdiction": [], "jurisdiction and regulation": []}
+        for embedding, regulation_id in queries:
+            jurisdiction = f"State {regulation_id % 30}"
+            for label, filters in (
+                ("unfiltered", {}),
+                ("jurisdiction", {"jurisdictions": [jurisdiction]}),
+                (
+                    "jurisdiction and regulation",
+                    {"jurisdictions": [jurisdiction], "regulation_ids": [regulation_id]},
+                ),
+            ):
+                started = time.perf_counter()
+                hits = await store.search(embedding, 10, **filters)
+                elapsed = time.perf_counter() - started
+                off_jurisdiction = sum(rous[hit.rou_id].jurisdiction != jurisdiction for hit in hits)
+                results[label].append((elapsed, off_jurisdiction, len(hits)))
+        return results
+
+    results = asyncio.run(run())
+
+    for label, searches in results.items():
+        latencies, off_jurisdiction, hits = zip(*searches)
+        print(
+            f"{label}: p50 {np.median(latencies) * 1000:.1f}ms, "
+            f"{sum(off_jurisdiction)} of {sum(hits)} hits off-jurisdiction"
+        )
+    unfiltered_off = sum(off for _, off, _ in results["unfiltered"])
+    assert unfiltered_off > 0.9 * 50 * 10
+    assert all(
+        off == 0 and hits == 10
+        for label in ("jurisdiction", "jurisdiction and regulation")
+        for _, off, hits in results[label]
+    )
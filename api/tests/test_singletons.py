@@ -0,0 +1,79 @@
+import os
+import statistics
+import time
+
+import pytest
+
+from app.config.app_config import get_app_config
+from app.services.feature.feat_eval.feat_eval_agent import get_feat_eval_graph
+from app.services.feature.feat_eval.learning_agent import get_learning_graph
+from app.services.feature.feat_eval.term_mapping_agent import get_term_mapping_graph
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import (
+    MapReduceRouExtractor,
+    get_map_reduce_rou_extractor,
+)
+from app.services.regulation.rou_extraction.rou_deduplicate_model import get_rou_dedup_model
+from app.services.regulation.rou_extraction.rou_extract_model import get_rou_extract_model
+from app.services.regulation.rou_extraction.rou_prededup import get_rou_prededup
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+
+@pytest.mark.parametrize(
+    "getter",
+    [
+        get_feat_eval_graph,
+        get_term_mapping_graph,
+        get_learning_graph,
+        get_map_reduce_rou_extractor,
+    ],
+)
+def test_graphs_are_built_once_per_process(getter):
+    assert getter() is getter()
+
+
+def test_extractor_reuses_the_shared_models():
+    extractor = get_map_reduce_rou_extractor()
+
+    assert extractor.map_model is get_rou_extract_model()
+    assert extractor.reduce_model is get_rou_dedup_model()
+    assert extractor.prededup is get_rou_prededup()
+
+
+def _build_per_request() -> None:
+    # what every request and evaluation built before the graphs were shared
+    MapReduceRouExtractor(
+        get_rou_extract_model.__wrapped__(),
+        get_rou_dedup_model.__wrapped__(),
+        get_rou_prededup.__wrapped__(),
+        get_app_config().rou_extraction,
+    )
+    get_feat_eval_graph.__wrapped__()
+    get_term_mapping_graph.__wrapped__()
+
+
+def _get_shared() -> None:
+    get_map_reduce_rou_extractor()
+    get_feat_eval_graph()
+    get_term_mapping_graph()
+
+
+def _median_seconds(build, rounds: int = 50) -> float:
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        build()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations)
+
+
+@requires_benchmarks
+def test_benchmark_per_request_construction_of_the_extractor_and_agents():
+    _get_shared()
+
+    per_request, shared = _median_seconds(_build_per_request), _median_seconds(_get_shared)
+
+    print(f"per request {per_request * 1000:.1f}ms, shared {shared * 1000:.3f}ms")
+    assert shared < per_request / 100
@@ -0,0 +1,179 @@
+import asyncio
+from io import BytesIO
+import os
+from pathlib import Path
+import re
+import time
+from typing import List
+
+import httpx
+from openai import APIConnectionError
+import pytest
+
+from app.clients.openai_rate_limiter import estimate_tokens
+from app.config.app_config import get_app_config
+from app.dtos.extraction_result import ExtractedRouDto
+from app.services.regulation.pdf_reader import iter_pdf_pages
+from app.services.regulation.rou_extraction.map_reduce_rou_extractor import (
+    ExtractionEvent,
+    MapReduceRouExtractor,
+)
+
+requires_benchmarks = pytest.mark.skipif(
+    "RUN_BENCHMARKS" not in os.environ, reason="set RUN_BENCHMARKS to run the benchmarks"
+)
+
+_DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def _rou(text: str) -> ExtractedRouDto:
+    return ExtractedRouDto(canonical_text=text, desc=text, obligations=[text], jurisdiction="US")
+
+
+class _FakeDedupModel:
+    """Merges lists by canonical text and records how the calls were batched and overlapped."""
+
+    def __init__(self):
+        self.batch_sizes: List[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def dedup(self, batch: List[List[ExtractedRouDto]]) -> List[ExtractedRouDto]:
+        self.batch_sizes.append(len(batch))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        merged = {rou.canonical_text: rou for rous in batch for rou in rous}
+        return list(merged.values())
+
+
+def _extractor(dedup_model: _FakeDedupModel, **config) -> MapReduceRouExtractor:
+    rou_extraction_config = get_app_config().rou_extraction.model_copy(update=config)
+    return MapReduceRouExtractor(None, dedup_model, None, rou_extraction_config)
+
+
+def test_levels_shrink_by_fan_in_and_batches_run_concurrently():
+    dedup_model = _FakeDedupModel()
+    extractor = _extractor(dedup_model, reduce_fan_in=4, reduce_token_budget=10**6)
+    rous_lists = [[_rou(f"rou {i}"), _rou("shared")] for i in range(10)]
+
+    final = asyncio.run(extractor._tree_reduce(rous_lists))
+
+    # level 1: 4 + 4 + 2 lists, level 2: the 3 merged lists
+    assert dedup_model.batch_sizes == [4, 4, 2, 3]
+    assert dedup_model.max_in_flight == 3
+    assert sorted(rou.canonical_text for rou in final) == sorted(
+        ["shared", *(f"rou {i}" for i in range(10))]
+    )
+
+
+def test_token_budget_splits_batches_but_never_below_two_lists():
+    dedup_model = _FakeDedupModel()
+    extractor = _extractor(dedup_model, reduce_fan_in=8, reduce_token_budget=1)
+    rous_lists = [[_rou(f"rou {i}")] for i in range(5)]
+
+    batches = extractor._batch_for_reduce(rous_lists)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_single_or_empty_lists_skip_the_llm():
+    dedup_model = _FakeDedupModel()
+    extractor = _extractor(dedup_model)
+
+    assert asyncio.run(extractor._tree_reduce([[], [_rou("only")], []])) == [_rou("only")]
+    assert asyncio.run(extractor._tree_reduce([[], []])) == []
+    assert dedup_model.batch_sizes == []
+
+
+class _FailingMapModel:
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def extract_cached(self, text: str):
+        raise self.error
+
+
+def test_failed_chunk_is_reported_and_skipped_but_bugs_propagate():
+    connection_error = APIConnectionError(request=httpx.Request("POST", "http://test"))
+    events: List[ExtractionEvent] = []
+
+    async def extract(error: Exception):
+        in_flight = asyncio.Semaphore(1)
+        await in_flight.acquire()
+        extractor = MapReduceRouExtractor(
+            _FailingMapModel(error), None, None, get_app_config().rou_extraction
+        )
+        try:
+            return await extractor._extract_chunk("chunk", events.append, in_flight)
+        finally:
+            # the chunk's slot is freed either way
+            assert not in_flight.locked()
+
+    assert asyncio.run(extract(connection_error)) == ([], False)
+    assert [event.kind for event in events] == ["chunk_failed"]
+    with pytest.raises(KeyError):
+        asyncio.run(extract(KeyError("rous")))
+
+
+class _SentenceMapModel:
+    """One ROU per "shall"/"must" sentence, named by its first words."""
+
+    async def extract_cached(self, chunk: str):
+        sentences = re.findall(r"[^.]*\b(?:shall|must)\b[^.]*\.", chunk)
+        return [_rou(" ".join(s.lower().split()[:12])) for s in sentences], False
+
+
+class _TimedDedupModel(_FakeDedupModel):
+    """Takes as long as an LLM call would: a fixed overhead plus prompt and output tokens."""
+
+    def __init__(self):
+        super().__init__()
+        self.max_prompt_tokens = 0
+
+    async def dedup(self, batch: List[List[ExtractedRouDto]]) -> List[ExtractedRouDto]:
+        self.batch_sizes.append(len(batch))
+        merged = list({rou.canonical_text: rou for rous in batch for rou in rous}.values())
+        prompt_tokens = sum(estimate_tokens(rou.model_dump_json()) for rous in batch for rou in rous)
+        output_tokens = sum(estimate_tokens(rou.model_dump_json()) for rou in merged)
+        self.max_prompt_tokens = max(self.max_prompt_tokens, prompt_tokens)
+        # ten times the prompt and output speed of gpt-4o-mini, to keep the benchmark short
+        await asyncio.sleep(0.1 + prompt_tokens / 10**6 + output_tokens / 10**4)
+        return merged
+
+
+@requires_benchmarks
+@pytest.mark.parametrize("path", sorted(_DATA_DIR.glob("*.pdf")), ids=lambda path: path.stem)
+def test_benchmark_tree_reduce_against_a_single_dedup_call(path):
+    """Extraction latency, dedup calls and ROU count of the tree and the single-call reduce."""
+    pages = list(iter_pdf_pages(BytesIO(path.read_bytes())))
+    single_call = {"reduce_fan_in": 10**6, "reduce_token_budget": 10**9}
+
+    async def stream():
+        for page in pages:
+            yield page
+
+    def extract(**reduce_config):
+        dedup_model = _TimedDedupModel()
+        config = get_app_config().rou_extraction.model_copy(
+            update={"prededup_enabled": False, **reduce_config}
+        )
+        extractor = MapReduceRouExtractor(_SentenceMapModel(), dedup_model, None, config)
+        started = time.perf_counter()
+        rous = asyncio.run(extractor.extract_pages(stream()))
+        return rous, time.perf_counter() - started, dedup_model
+
+    single, tree = extract(**single_call), extract()
+
+    for name, (rous, seconds, dedup_model) in (("single", single), ("tree", tree)):
+        print(
+            f"{path.stem} {name}: {len(rous)} ROUs in {seconds:.2f}s, "
+            f"{len(dedup_model.batch_sizes)} dedup calls, "
+            f"largest prompt {dedup_model.max_prompt_tokens} tokens"
+        )
+    # both merge the same duplicates
+    assert sorted(rou.canonical_text for rou in tree[0]) == sorted(
+        rou.canonical_text for rou in single[0]
+    )